@@ -0,0 +1,183 @@
+"""
+Бенчмарк собственных накладных расходов API без брокера событий.
+
+Профиль локального режима: приложение запускается в процессе бенчмарка
+с EVENT_PUBLISHER_BACKEND=memory (события уходят в очереди в памяти, Kafka
+не нужна), запросы передаются напрямую в ASGI-приложение без сети и
+HTTP-сервера. Поэтому замеры включают только маршрутизацию, зависимости,
+валидацию, сервисы, обращения к PostgreSQL и сериализацию ответа.
+
+Бенчмарк регистрирует временного пользователя и проект, затем --workers
+параллельных клиентов выполняют --iterations циклов: создание задачи,
+смена статуса, чтение задачи и чтение списка задач проекта. В конце проект
+удаляется, печатаются задержки по операциям и число событий, доставленных
+подписчику.
+
+Запуск из каталога src (нужен PostgreSQL из настроек):
+    python -m benchmarks.api_overhead --iterations 500 --workers 8
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+# Настройки читаются при импорте приложения
+os.environ["EVENT_PUBLISHER_BACKEND"] = "memory"
+
+import orjson
+
+from benchmarks.utils import report, stopwatch
+from infrastructure.event_publisher_singleton import broker_event_publisher, event_routing
+from interface.main import app
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+async def call(
+    method: str,
+    path: str,
+    body: Any = None,
+    token: Optional[str] = None,
+    query: str = "",
+) -> Tuple[int, Any]:
+    """Выполнить запрос к ASGI-приложению и вернуть (статус, JSON ответа)."""
+    headers: Headers = [(b"content-type", b"application/json")]
+    if token is not None:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_body = orjson.dumps(body) if body is not None else b""
+    received = False
+    finished = asyncio.Event()
+    response: Dict[str, Any] = {"status": 0, "body": b""}
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": request_body, "more_body": False}
+        # Клиент «отключается» только после ответа, как при обычном соединении
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    finished.set()
+    return response["status"], orjson.loads(response["body"]) if response["body"] else None
+
+
+def expect(status: int, expected: int, payload: Any, what: str) -> None:
+    if status != expected:
+        raise RuntimeError(f"{what} failed with {status}: {payload}")
+
+
+async def client(
+    token: str, project_id: str, iterations: int, samples: Dict[str, List[float]]
+) -> None:
+    for i in range(iterations):
+        with stopwatch(samples["create task"]):
+            status, task = await call(
+                "POST",
+                "/api/secured/tasks/",
+                {"project_id": project_id, "title": f"Benchmark task {i}"},
+                token,
+            )
+        expect(status, 201, task, "create task")
+        with stopwatch(samples["change status"]):
+            status, payload = await call(
+                "PATCH", f"/api/secured/tasks/{task['id']}/status", {"status": "in_progress"}, token
+            )
+        expect(status, 200, payload, "change status")
+        with stopwatch(samples["get task"]):
+            status, payload = await call("GET", f"/api/secured/tasks/{task['id']}", token=token)
+        expect(status, 200, payload, "get task")
+        with stopwatch(samples["list tasks"]):
+            status, payload = await call(
+                "GET", "/api/secured/tasks/", token=token, query=f"project_id={project_id}&limit=20"
+            )
+        expect(status, 200, payload, "list tasks")
+
+
+async def run(args: argparse.Namespace) -> None:
+    delivered = 0
+
+    def count(event: Dict[str, Any]) -> None:
+        nonlocal delivered
+        delivered += 1
+
+    for topic in event_routing.topics("task_events"):
+        broker_event_publisher.subscribe(topic, count, "benchmark")
+    async with app.router.lifespan_context(app):
+        email = f"bench-{uuid4().hex[:12]}@example.com"
+        password = uuid4().hex
+        status, payload = await call(
+            "POST",
+            "/api/public/auth/signup",
+            {"username": email.split("@")[0], "email": email, "password": password},
+        )
+        expect(status, 201, payload, "signup")
+        status, tokens = await call(
+            "POST", "/api/public/auth/login", {"email": email, "password": password}
+        )
+        expect(status, 200, tokens, "login")
+        token = tokens["access_token"]
+        status, project = await call(
+            "POST", "/api/secured/projects/", {"name": f"Benchmark {email}"}, token
+        )
+        expect(status, 201, project, "create project")
+
+        samples: Dict[str, List[float]] = {
+            name: [] for name in ("create task", "change status", "get task", "list tasks")
+        }
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    client(token, project["id"], args.iterations, samples)
+                    for _ in range(args.workers)
+                )
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            await broker_event_publisher.flush()
+            await call("DELETE", f"/api/secured/projects/{project['id']}", token=token)
+
+    requests = sum(len(values) for values in samples.values())
+    print(
+        f"{requests} request(s) in {elapsed:.2f}s with {args.workers} worker(s): "
+        f"{requests / elapsed:,.0f} req/s, {delivered} event(s) delivered in memory"
+    )
+    for name, values in samples.items():
+        report(name, values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Бенчмарк EventConsumerRunner на брокере в памяти.
+
+Записывает --events событий задач в --projects проектах в InMemoryBroker
+с --partitions партициями, затем запускает --consumers потребителей одной
+группы и замеряет, за сколько они обработают все события. Обработчик
+имитирует запись в хранилище: ждет --handler-ms на пачку и --event-us на
+событие. Печатается пропускная способность, размеры пачек, время пачки и
+проверка порядка: события одного проекта должны прийти в порядке записи.
+Kafka не нужна.
+
+Запуск из каталога src:
+    python -m benchmarks.event_consumer --events 200000 --partitions 12 --consumers 3
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+from uuid import uuid4
+
+from benchmarks.utils import report
+from core.entites.core_events import TaskStatus, TaskStatusChangedEvent
+from infrastructure.repositories.event_codec import JsonEventCodec
+from infrastructure.repositories.in_memory_broker import InMemoryBroker
+from infrastructure.workers.event_consumer_runner import ConsumedEvent, EventConsumerRunner
+
+TOPIC = "task_events"
+GROUP = "bench_consumers"
+
+
+async def run(args: argparse.Namespace) -> None:
+    broker = InMemoryBroker(partitions=args.partitions)
+    project_ids = [uuid4() for _ in range(args.projects)]
+    statuses = list(TaskStatus)
+    for _ in range(args.events):
+        old, new = random.sample(statuses, 2)
+        broker.send_event(
+            TaskStatusChangedEvent(uuid4(), random.choice(project_ids), old, new), TOPIC
+        )
+
+    last_timestamp: Dict[str, str] = {}
+    out_of_order = 0
+    handled = 0
+    batch_sizes: List[float] = []
+    batch_ms: List[float] = []
+    done = asyncio.Event()
+
+    async def handler(events: List[ConsumedEvent]) -> None:
+        nonlocal out_of_order, handled
+        started = time.perf_counter()
+        for consumed in events:
+            project_id = consumed.event["project_id"]
+            if last_timestamp.get(project_id, "") > consumed.event["timestamp"]:
+                out_of_order += 1
+            last_timestamp[project_id] = consumed.event["timestamp"]
+        await asyncio.sleep(args.handler_ms / 1000 + len(events) * args.event_us / 1_000_000)
+        handled += len(events)
+        batch_sizes.append(len(events))
+        batch_ms.append((time.perf_counter() - started) * 1000)
+        if handled >= args.events:
+            done.set()
+
+    runners = [
+        EventConsumerRunner(
+            f"bench_{i}",
+            broker.consumer,
+            [TOPIC],
+            handler,
+            JsonEventCodec(),
+            group_id=GROUP,
+            max_batch_size=args.batch_size,
+            poll_timeout_ms=100,
+            commit_interval_seconds=0.2,
+        )
+        for i in range(args.consumers)
+    ]
+    started = time.perf_counter()
+    for runner in runners:
+        await runner.start()
+    await done.wait()
+    elapsed = time.perf_counter() - started
+    for runner in runners:
+        await runner.stop()
+
+    print(f"{handled} event(s) in {elapsed:.2f}s: {handled / elapsed:,.0f} events/s")
+    print(
+        f"batches={len(batch_sizes)} mean size={sum(batch_sizes) / len(batch_sizes):.1f} "
+        f"out of order={out_of_order} group lag after stop={broker.lag(GROUP, TOPIC)}"
+    )
+    report("handler batch", batch_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--partitions", type=int, default=12)
+    parser.add_argument("--consumers", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--handler-ms", type=float, default=2.0)
+    parser.add_argument("--event-us", type=float, default=5.0)
+    random.seed(0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
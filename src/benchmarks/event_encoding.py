@@ -0,0 +1,103 @@
+"""
+Бенчмарк кодировок событий: JSON (orjson) против msgpack по схемам.
+
+Строит смесь событий задач и проектов в той же пропорции, что и в рабочем
+потоке (в основном смены статуса и обновления задач), и для каждой кодировки
+печатает средний размер события в байтах, а также время и пропускную
+способность кодирования и декодирования. Декодирование msgpack приводит
+событие к тому же виду, что и orjson.loads, поэтому сравнение честное для
+потребителей. Брокер и БД не нужны.
+
+Запуск из каталога src:
+    python -m benchmarks.event_encoding --events 100000 --rounds 5
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, List
+from uuid import uuid4
+
+from benchmarks.utils import report, stopwatch
+from core.entites.core_events import (
+    ProjectUpdatedEvent,
+    TaskCreatedEvent,
+    TaskDeletedEvent,
+    TaskStatus,
+    TaskStatusChangedEvent,
+    TaskUpdatedEvent,
+)
+from infrastructure.repositories.event_codec import JsonEventCodec, MsgpackEventCodec
+from infrastructure.repositories.schema_registry import FileSchemaRegistry
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "event_schemas"
+STATUSES = list(TaskStatus)
+
+
+def make_events(count: int, projects: int) -> List[Any]:
+    project_ids = [uuid4() for _ in range(projects)]
+    events = []
+    for _ in range(count):
+        project_id = random.choice(project_ids)
+        kind = random.random()
+        if kind < 0.5:
+            old, new = random.sample(STATUSES, 2)
+            events.append(TaskStatusChangedEvent(uuid4(), project_id, old, new))
+        elif kind < 0.8:
+            events.append(
+                TaskUpdatedEvent(
+                    uuid4(),
+                    project_id,
+                    f"Task {random.randrange(10**6)}",
+                    random.choice(STATUSES),
+                )
+            )
+        elif kind < 0.9:
+            events.append(
+                TaskCreatedEvent(
+                    uuid4(), project_id, f"Task {random.randrange(10**6)}", TaskStatus.TODO
+                )
+            )
+        elif kind < 0.98:
+            events.append(TaskDeletedEvent(uuid4(), project_id))
+        else:
+            events.append(ProjectUpdatedEvent(project_id, f"Project {random.randrange(10**4)}"))
+    return events
+
+
+def measure(name: str, events: List[Any], encode: Callable, decode: Callable, rounds: int) -> None:
+    encode_ms: List[float] = []
+    decode_ms: List[float] = []
+    for _ in range(rounds):
+        with stopwatch(encode_ms):
+            encoded = [encode(event) for event in events]
+        with stopwatch(decode_ms):
+            for data in encoded:
+                decode(data)
+    total_bytes = sum(len(data) for data in encoded)
+    print(f"{name}: {total_bytes / len(events):.1f} bytes/event")
+    report(f"{name} encode", encode_ms)
+    report(f"{name} decode", decode_ms)
+    for operation, samples in (("encode", encode_ms), ("decode", decode_ms)):
+        best = min(samples) / 1000
+        print(f"{name} {operation}: {len(events) / best:,.0f} events/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    events = make_events(args.events, args.projects)
+    registry = FileSchemaRegistry(SCHEMA_DIR)
+    started = time.perf_counter()
+    for codec in (JsonEventCodec(), MsgpackEventCodec(registry)):
+        measure(codec.name, events, codec.encode, codec.decode, args.rounds)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Бенчмарк list_tasks на обычной и секционированной по HASH(project_id) таблице.
+
+Создает две временные таблицы с той же структурой, что и tasks: обычную
+(PK по id, индекс по project_id) и секционированную (PK (project_id, id)),
+заполняет их одинаковыми данными — по умолчанию 50 000 000 задач в 10 000
+проектах — и замеряет запросы, которые выполняет list_tasks: страница задач
+проекта с сортировкой по created_at, с фильтром по статусу и без него.
+В конце печатаются размеры таблиц и индексов.
+
+Таблицы не связаны с projects, поэтому бенчмарк не трогает рабочие данные.
+
+Запуск из каталога src:
+    python -m benchmarks.list_tasks_partitioning --tasks 50000000 --projects 10000
+"""
+import argparse
+import asyncio
+import random
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.utils import report, stopwatch
+from infrastructure.postgres_db import database
+
+PLAIN_TABLE = "bench_tasks_plain"
+PARTITIONED_TABLE = "bench_tasks_partitioned"
+
+COLUMNS_SQL = """
+    id uuid NOT NULL,
+    project_id uuid NOT NULL,
+    title varchar NOT NULL,
+    description varchar,
+    status task_status_enum NOT NULL,
+    assignee_id uuid,
+    created_at timestamp without time zone NOT NULL,
+    updated_at timestamp without time zone NOT NULL
+"""
+
+STATUSES = ["TODO", "IN_PROGRESS", "DONE", "CLOSED"]
+
+
+def create_statements(partitions: int) -> list:
+    statements = [
+        f"CREATE UNLOGGED TABLE {PLAIN_TABLE} ({COLUMNS_SQL}, PRIMARY KEY (id))",
+        f"CREATE INDEX ON {PLAIN_TABLE} (project_id)",
+        f"""
+        CREATE UNLOGGED TABLE {PARTITIONED_TABLE} ({COLUMNS_SQL}, PRIMARY KEY (project_id, id))
+        PARTITION BY HASH (project_id)
+        """,
+    ]
+    for remainder in range(partitions):
+        statements.append(
+            f"CREATE UNLOGGED TABLE {PARTITIONED_TABLE}_p{remainder:02d} "
+            f"PARTITION OF {PARTITIONED_TABLE} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    statements.append(f"CREATE INDEX ON {PARTITIONED_TABLE} (id)")
+    return statements
+
+
+def seed_sql(table: str) -> str:
+    # Проекты выбираются по номеру строки, поэтому обе таблицы получают одинаковое распределение
+    return f"""
+    INSERT INTO {table} (id, project_id, title, description, status, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        (CAST(:projects AS uuid[]))[1 + (i % cardinality(CAST(:projects AS uuid[])))],
+        'bench task ' || i,
+        NULL,
+        CAST((ARRAY['TODO', 'IN_PROGRESS', 'DONE', 'CLOSED'])[1 + (i % 4)] AS task_status_enum),
+        now() - (i % 100000) * interval '1 minute',
+        now()
+    FROM generate_series(:start, :stop) AS i
+    """
+
+
+def list_sql(table: str, with_status: bool) -> str:
+    status_filter = "AND status = CAST(:status AS task_status_enum)" if with_status else ""
+    return f"""
+    SELECT id, project_id, title, description, status, assignee_id, created_at, updated_at
+    FROM {table}
+    WHERE project_id = :project_id {status_filter}
+    ORDER BY created_at
+    LIMIT :limit
+    """
+
+
+async def drop_tables() -> None:
+    async with database.session_factory() as session:
+        await session.execute(text(f"DROP TABLE IF EXISTS {PLAIN_TABLE}"))
+        await session.execute(text(f"DROP TABLE IF EXISTS {PARTITIONED_TABLE}"))
+        await session.commit()
+
+
+async def seed(args: argparse.Namespace, project_ids: list) -> None:
+    projects = [str(p) for p in project_ids]
+    async with database.session_factory() as session:
+        for statement in create_statements(args.partitions):
+            await session.execute(text(statement))
+        await session.commit()
+        for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+            insert = text(seed_sql(table))
+            for start in range(0, args.tasks, args.chunk):
+                stop = min(start + args.chunk, args.tasks) - 1
+                await session.execute(
+                    insert, {"projects": projects, "start": start, "stop": stop}
+                )
+                await session.commit()
+                print(f"{table}: seeded {stop + 1}/{args.tasks}")
+            await session.execute(text(f"ANALYZE {table}"))
+            await session.commit()
+
+
+async def measure(table: str, project_ids: list, args: argparse.Namespace) -> None:
+    async with database.session_factory() as session:
+        for with_status in (False, True):
+            statement = text(list_sql(table, with_status))
+            samples = []
+            for _ in range(args.queries):
+                params = {"project_id": random.choice(project_ids), "limit": args.limit}
+                if with_status:
+                    params["status"] = random.choice(STATUSES)
+                with stopwatch(samples):
+                    result = await session.execute(statement, params)
+                    result.all()
+            label = "status+order" if with_status else "order"
+            report(f"{table} list_tasks({label})", samples)
+
+
+async def report_sizes() -> None:
+    async with database.session_factory() as session:
+        for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+            # Для секционированной таблицы размеры суммируются по всем секциям
+            row = (
+                await session.execute(
+                    text(
+                        """
+                        SELECT
+                            pg_size_pretty(sum(pg_table_size(relid))),
+                            pg_size_pretty(sum(pg_indexes_size(relid)))
+                        FROM pg_partition_tree(CAST(:table AS regclass))
+                        """
+                    ),
+                    {"table": table},
+                )
+            ).one()
+            print(f"{table:<40} table={row[0]:>10} indexes={row[1]:>10}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    project_ids = [uuid4() for _ in range(args.projects)]
+    await drop_tables()
+    try:
+        await seed(args, project_ids)
+        for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+            await measure(table, project_ids, args)
+        await report_sizes()
+    finally:
+        if not args.keep:
+            await drop_tables()
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50_000_000)
+    parser.add_argument("--projects", type=int, default=10_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="не удалять таблицы после замера")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Бенчмарк автодополнения названий проектов.
+
+Создает заданное число проектов (по умолчанию 1 000 000) и имитирует набор
+названия по буквам: для каждого выбранного названия выполняется search_projects
+на каждый префикс. Цель — p99 ниже 10 мс.
+
+Запуск из каталога src:
+    python -m benchmarks.project_typeahead --projects 1000000 --names 200
+"""
+import argparse
+import asyncio
+import random
+
+from sqlalchemy import text
+
+from benchmarks.utils import report, stopwatch
+from infrastructure.postgres_db import database
+from infrastructure.repositories.project_repository import ProjectRepository
+
+BENCH_PREFIX = "bench-typeahead"
+
+SEED_SQL = text(
+    """
+    INSERT INTO projects (id, name, description, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        w[1 + floor(random() * n)::int] || ' ' || w[1 + floor(random() * n)::int]
+            || ' ' || :prefix || '-' || (:offset + i),
+        NULL,
+        now(),
+        now()
+    FROM generate_series(1, :rows) AS i,
+         (SELECT CAST(:words AS text[]) AS w, cardinality(CAST(:words AS text[])) AS n) AS vocabulary
+    """
+)
+
+WORDS = [
+    "alpha", "apollo", "atlas", "aurora", "billing", "borealis", "cobalt",
+    "comet", "core", "delta", "echo", "falcon", "gemini", "helios", "horizon",
+    "infra", "jupiter", "kepler", "lunar", "mercury", "nebula", "nova", "orion",
+    "payments", "phoenix", "platform", "pulsar", "quantum", "saturn", "sirius",
+    "solar", "titan", "vega", "vertex", "zenith", "маркетинг", "продажи",
+    "склад", "логистика", "аналитика",
+]
+
+
+async def seed(projects: int, chunk: int) -> None:
+    async with database.session_factory() as session:
+        for offset in range(0, projects, chunk):
+            rows = min(chunk, projects - offset)
+            await session.execute(
+                SEED_SQL,
+                {"rows": rows, "offset": offset, "prefix": BENCH_PREFIX, "words": WORDS},
+            )
+            await session.commit()
+            print(f"seeded {offset + rows}/{projects}")
+        await session.execute(text("ANALYZE projects"))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with database.session_factory() as session:
+        await session.execute(
+            text("DELETE FROM projects WHERE name LIKE :pattern"),
+            {"pattern": f"% {BENCH_PREFIX}-%"},
+        )
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    await seed(args.projects, args.chunk)
+    try:
+        by_length = {}
+        async with database.session_factory() as session:
+            repo = ProjectRepository(session)
+            for _ in range(args.names):
+                name = f"{random.choice(WORDS)} {random.choice(WORDS)}"
+                for length in range(1, len(name) + 1):
+                    samples = by_length.setdefault(min(length, 6), [])
+                    with stopwatch(samples):
+                        await repo.search_projects(name[:length].lower(), args.limit)
+        for length, samples in sorted(by_length.items()):
+            label = f"{length}+ chars" if length == 6 else f"{length} chars"
+            report(f"typeahead {label} ({args.projects} projects)", samples)
+        report("typeahead all keystrokes", [s for v in by_length.values() for s in v])
+    finally:
+        if not args.keep:
+            await cleanup()
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=100_000)
+    parser.add_argument("--names", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="не удалять данные после замера")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Микробенчмарк накладных расходов Python на подготовку горячих запросов.
+
+Сравнивает три способа для запросов get_task, get_project, get_by_id,
+get_refresh_token_by_jti и list_tasks:
+  * ad hoc  — select(...).where(...) строится на каждый вызов (как было раньше);
+  * lambda  — lambda_stmt, кэшируемый по месту в коде;
+  * prebuilt — запрос из модуля репозитория, параметры передаются bindparam.
+
+Для каждого варианта замеряется путь до отправки в драйвер: построение
+конструкции, вычисление ключа кэша и поиск в кэше компиляции. Базе данных
+не требуется.
+
+Запуск из каталога src:
+    python -m benchmarks.statement_overhead --iterations 20000
+"""
+import argparse
+import time
+from uuid import uuid4
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.util import LRUCache
+
+from core.entites.core_entities import TaskStatus
+from infrastructure.models.auth_models import RefreshTokenModel, UserModel
+from infrastructure.models.project_task_model import Project as ProjectModel
+from infrastructure.models.project_task_model import Task as TaskModel
+from infrastructure.repositories import auth_repository, project_repository, task_repository
+
+DIALECT = PGDialect_asyncpg()
+
+
+def compile_cached(stmt, cache: LRUCache) -> None:
+    """Тот же путь, что проходит Connection.execute до обращения к драйверу."""
+    stmt._compile_w_cache(
+        DIALECT, compiled_cache=cache, column_keys=[], for_executemany=False
+    )
+
+
+def measure(factory, iterations: int) -> float:
+    cache = LRUCache(500)
+    compile_cached(factory(), cache)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        compile_cached(factory(), cache)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def cases():
+    task_id, project_id, user_id, jti = uuid4(), uuid4(), uuid4(), uuid4()
+    return {
+        "get_task": (
+            lambda: select(TaskModel).where(TaskModel.id == task_id),
+            lambda: lambda_stmt(lambda: select(TaskModel).where(TaskModel.id == task_id)),
+            lambda: task_repository._GET_TASK,
+        ),
+        "get_project": (
+            lambda: select(ProjectModel).where(
+                ProjectModel.id == project_id, ProjectModel.deleted_at.is_(None)
+            ),
+            lambda: lambda_stmt(
+                lambda: select(ProjectModel).where(
+                    ProjectModel.id == project_id, ProjectModel.deleted_at.is_(None)
+                )
+            ),
+            lambda: project_repository._GET_PROJECT,
+        ),
+        "get_by_id": (
+            lambda: select(UserModel).where(UserModel.id == user_id),
+            lambda: lambda_stmt(lambda: select(UserModel).where(UserModel.id == user_id)),
+            lambda: auth_repository._GET_USER_BY_ID,
+        ),
+        "get_refresh_token_by_jti": (
+            lambda: select(RefreshTokenModel).where(RefreshTokenModel.jti == jti),
+            lambda: lambda_stmt(
+                lambda: select(RefreshTokenModel).where(RefreshTokenModel.jti == jti)
+            ),
+            lambda: auth_repository._GET_REFRESH_TOKEN_BY_JTI,
+        ),
+        "list_tasks(status, order, limit)": (
+            lambda: select(TaskModel)
+            .where(TaskModel.project_id == project_id)
+            .where(TaskModel.status == TaskStatus.TODO)
+            .order_by(TaskModel.created_at)
+            .limit(50),
+            lambda: lambda_stmt(
+                lambda: select(TaskModel)
+                .where(TaskModel.project_id == project_id)
+                .where(TaskModel.status == TaskStatus.TODO)
+                .order_by(TaskModel.created_at)
+                .limit(50)
+            ),
+            lambda: task_repository._list_tasks_statement(True, "created_at", True, False),
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'query':<34} {'ad hoc':>10} {'lambda':>10} {'prebuilt':>10} {'saved':>10}")
+    for name, (ad_hoc, lambda_based, prebuilt) in cases().items():
+        ad_hoc_us = measure(ad_hoc, args.iterations)
+        lambda_us = measure(lambda_based, args.iterations)
+        prebuilt_us = measure(prebuilt, args.iterations)
+        print(
+            f"{name:<34} {ad_hoc_us:8.1f}us {lambda_us:8.1f}us "
+            f"{prebuilt_us:8.1f}us {ad_hoc_us - prebuilt_us:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
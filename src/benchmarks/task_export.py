@@ -0,0 +1,111 @@
+"""
+Бенчмарк потоковой выгрузки задач проекта.
+
+Создает проект с заданным числом задач (по умолчанию 1 000 000) и выгружает
+его в CSV и Parquet тем же путем, что и GET /tasks/export: серверный курсор
+в снимке REPEATABLE READ и кодирование пачками. Байты отбрасываются, поэтому
+замер показывает скорость чтения и кодирования без сети. Печатается пропускная
+способность в строках в секунду и размер результата.
+
+Запуск из каталога src:
+    python -m benchmarks.task_export --tasks 1000000 --chunk-size 10000
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from core.entites.core_entities import TaskExportFormat
+from core.services.task_export_service import TaskExportService
+from infrastructure.postgres_db import database
+from infrastructure.repositories.task_export_reader import TaskExportReader
+
+SEED_SQL = text(
+    """
+    INSERT INTO tasks (id, project_id, title, description, status, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        :project_id,
+        'bench export task ' || i,
+        'description of bench export task ' || i,
+        CAST((ARRAY['TODO', 'IN_PROGRESS', 'DONE', 'CLOSED'])[1 + (i % 4)] AS task_status_enum),
+        now() - (i % 100000) * interval '1 minute',
+        now()
+    FROM generate_series(:start, :stop) AS i
+    """
+)
+
+
+async def seed(project_id, tasks: int, chunk: int) -> None:
+    async with database.session_factory() as session:
+        await session.execute(
+            text(
+                "INSERT INTO projects (id, name, created_at, updated_at) "
+                "VALUES (:project_id, :name, now(), now())"
+            ),
+            {"project_id": project_id, "name": f"bench-export-{project_id}"},
+        )
+        for start in range(0, tasks, chunk):
+            stop = min(start + chunk, tasks) - 1
+            await session.execute(
+                SEED_SQL, {"project_id": project_id, "start": start, "stop": stop}
+            )
+            await session.commit()
+            print(f"seeded {stop + 1}/{tasks}")
+        await session.execute(text("ANALYZE tasks"))
+        await session.commit()
+
+
+async def cleanup(project_id) -> None:
+    async with database.session_factory() as session:
+        for table in ("task_status_history", "tasks", "tasks_archive"):
+            await session.execute(
+                text(f"DELETE FROM {table} WHERE project_id = :project_id"),
+                {"project_id": project_id},
+            )
+        await session.execute(
+            text("DELETE FROM projects WHERE id = :project_id"), {"project_id": project_id}
+        )
+        await session.commit()
+
+
+async def measure(project_id, export_format: TaskExportFormat, args: argparse.Namespace) -> None:
+    service = TaskExportService(TaskExportReader(database), chunk_size=args.chunk_size)
+    for attempt in range(1, args.repeat + 1):
+        size = 0
+        started = time.perf_counter()
+        async for data in await service.export_tasks(project_id, export_format):
+            size += len(data)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{export_format.value:<8} run {attempt}: {args.tasks / elapsed:12,.0f} rows/s "
+            f"{elapsed:8.2f}s {size / 1024 / 1024:10.1f} MiB"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    project_id = uuid4()
+    await seed(project_id, args.tasks, args.seed_chunk)
+    try:
+        for export_format in TaskExportFormat:
+            await measure(project_id, export_format, args)
+    finally:
+        if not args.keep:
+            await cleanup(project_id)
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed-chunk", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="не удалять данные после замера")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
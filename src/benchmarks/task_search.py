@@ -0,0 +1,123 @@
+"""
+Бенчмарк полнотекстового поиска задач.
+
+Создает временный проект с заданным числом задач (по умолчанию 1 000 000),
+собранных из случайных слов словаря, и замеряет задержку search_tasks
+для первой и последующих страниц.
+
+Запуск из каталога src:
+    python -m benchmarks.task_search --tasks 1000000 --queries 200
+"""
+import argparse
+import asyncio
+import random
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.utils import report, stopwatch
+from infrastructure.postgres_db import database
+from infrastructure.repositories.task_repository import TaskRepository
+
+WORDS = [
+    "api", "auth", "backend", "billing", "bug", "cache", "client", "config",
+    "crash", "dashboard", "database", "deploy", "docs", "email", "export",
+    "frontend", "import", "index", "invoice", "kafka", "latency", "login",
+    "memory", "migration", "mobile", "monitoring", "notification", "payment",
+    "performance", "profile", "queue", "refactor", "release", "report",
+    "search", "security", "session", "settings", "signup", "timeout",
+    "token", "upload", "user", "webhook", "worker", "ошибка", "задача",
+    "отчет", "релиз", "платеж",
+]
+
+SEED_SQL = text(
+    """
+    INSERT INTO tasks (id, project_id, title, description, status, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        :project_id,
+        w[1 + floor(random() * n)::int] || ' ' || w[1 + floor(random() * n)::int]
+            || ' ' || w[1 + floor(random() * n)::int],
+        w[1 + floor(random() * n)::int] || ' ' || w[1 + floor(random() * n)::int]
+            || ' ' || w[1 + floor(random() * n)::int] || ' ' || w[1 + floor(random() * n)::int]
+            || ' ' || w[1 + floor(random() * n)::int] || ' ' || w[1 + floor(random() * n)::int],
+        'TODO',
+        now(),
+        now()
+    FROM generate_series(1, :rows),
+         (SELECT CAST(:words AS text[]) AS w, cardinality(CAST(:words AS text[])) AS n) AS vocabulary
+    """
+)
+
+
+async def seed(project_id, tasks: int, chunk: int) -> None:
+    async with database.session_factory() as session:
+        await session.execute(
+            text(
+                "INSERT INTO projects (id, name, created_at, updated_at) "
+                "VALUES (:id, :name, now(), now())"
+            ),
+            {"id": project_id, "name": f"bench-search-{project_id}"},
+        )
+        await session.commit()
+        for offset in range(0, tasks, chunk):
+            rows = min(chunk, tasks - offset)
+            await session.execute(
+                SEED_SQL, {"project_id": project_id, "rows": rows, "words": WORDS}
+            )
+            await session.commit()
+            print(f"seeded {offset + rows}/{tasks}")
+        await session.execute(text("ANALYZE tasks"))
+        await session.commit()
+
+
+async def cleanup(project_id) -> None:
+    async with database.session_factory() as session:
+        await session.execute(text("DELETE FROM tasks WHERE project_id = :p"), {"p": project_id})
+        await session.execute(text("DELETE FROM projects WHERE id = :p"), {"p": project_id})
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    project_id = uuid4()
+    await seed(project_id, args.tasks, args.chunk)
+    try:
+        first_page, next_pages = [], []
+        async with database.session_factory() as session:
+            repo = TaskRepository(session)
+            for _ in range(args.queries):
+                query = " ".join(random.sample(WORDS, args.terms))
+                with stopwatch(first_page):
+                    hits = await repo.search_tasks(
+                        query, limit=args.limit, project_ids=[project_id]
+                    )
+                for _ in range(args.pages - 1):
+                    if len(hits) < args.limit:
+                        break
+                    after = (hits[-1].rank, hits[-1].task.id)
+                    with stopwatch(next_pages):
+                        hits = await repo.search_tasks(
+                            query, limit=args.limit, project_ids=[project_id], after=after
+                        )
+        report(f"search first page ({args.tasks} tasks)", first_page)
+        report(f"search next pages ({args.tasks} tasks)", next_pages)
+    finally:
+        if not args.keep:
+            await cleanup(project_id)
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--terms", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="не удалять данные после замера")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
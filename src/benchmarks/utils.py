@@ -0,0 +1,37 @@
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Перцентиль по методу ближайшего ранга."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name: str, samples_ms: List[float]) -> None:
+    """Напечатать сводку по замерам в миллисекундах."""
+    if not samples_ms:
+        print(f"{name:<40} no samples")
+        return
+    print(
+        f"{name:<40} n={len(samples_ms):<6} "
+        f"mean={statistics.fmean(samples_ms):8.3f}ms "
+        f"p50={percentile(samples_ms, 50):8.3f}ms "
+        f"p95={percentile(samples_ms, 95):8.3f}ms "
+        f"p99={percentile(samples_ms, 99):8.3f}ms"
+    )
+
+
+@contextmanager
+def stopwatch(samples_ms: List[float]) -> Iterator[None]:
+    """Замерить время блока и добавить его в samples_ms."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples_ms.append((time.perf_counter() - started) * 1000)
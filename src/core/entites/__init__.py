@@ -1,5 +1,28 @@
 from core.entites.base_entity import BaseEntity
-from core.entites.core_entities import Project, Task, TaskStatus
+from core.entites.core_entities import (
+    DurationStats,
+    HistogramBucket,
+    Project,
+    ProjectAnalytics,
+    ProjectMember,
+    ProjectPurgeProgress,
+    ProjectPurgeState,
+    ProjectRole,
+    ProjectSuggestion,
+    ProjectTaskStats,
+    Task,
+    TaskBulkLoadResult,
+    TaskExportFormat,
+    TaskImportFormat,
+    TaskImportResult,
+    TaskImportRowError,
+    TaskSearchHit,
+    TaskSearchPage,
+    TaskStatus,
+    TaskStatusTransition,
+    TaskTimelineColumns,
+    ThroughputBucket,
+)
 from core.entites.core_events import (
     ProjectCreatedEvent,
     TaskCreatedEvent,
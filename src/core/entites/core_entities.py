@@ -2,7 +2,7 @@ from uuid import uuid4, UUID
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from core.entites.base_entity import BaseEntity
 
 
@@ -21,6 +21,8 @@ class Project(BaseEntity):
 
     name: str
     description: Optional[str] = None
+    deleted_at: Optional[datetime] = None
+    task_stats: Optional["ProjectTaskStats"] = None
 
 
 @dataclass(kw_only=True)
@@ -32,3 +34,202 @@ class Task(BaseEntity):
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
     assignee_id: Optional[UUID] = None
+    # Номер версии для оптимистичной блокировки; растет при каждом изменении
+    version: int = 1
+
+
+@dataclass(kw_only=True)
+class TaskStatusTransition:
+    """Переход задачи между статусами; old_status пуст для только что созданной задачи."""
+
+    task_id: UUID
+    project_id: UUID
+    old_status: Optional[TaskStatus]
+    new_status: TaskStatus
+    changed_at: datetime
+
+
+@dataclass(kw_only=True)
+class ProjectSuggestion:
+    """Подсказка автодополнения названия проекта."""
+
+    id: UUID
+    name: str
+    score: float
+
+
+@dataclass(kw_only=True)
+class TaskSearchHit:
+    """Результат полнотекстового поиска: задача и её релевантность."""
+
+    task: Task
+    rank: float
+
+
+@dataclass(kw_only=True)
+class TaskSearchPage:
+    """Страница результатов поиска с курсором на следующую страницу."""
+
+    items: List[TaskSearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class ProjectTaskStats:
+    """Количество задач проекта по статусам."""
+
+    project_id: UUID
+    counts: Dict[TaskStatus, int] = field(
+        default_factory=lambda: {status: 0 for status in TaskStatus}
+    )
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class ProjectPurgeState(str, Enum):
+    """Enum для состояний фонового удаления проекта."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(kw_only=True)
+class ProjectPurgeProgress:
+    """Прогресс фонового удаления задач проекта."""
+
+    project_id: UUID
+    state: ProjectPurgeState = ProjectPurgeState.PENDING
+    deleted_tasks: int = 0
+    batches: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    # Участники проекта на момент постановки удаления: после вычистки записи
+    # project_members удаляются каскадом, а прогресс им по-прежнему доступен
+    member_ids: FrozenSet[UUID] = frozenset()
+
+
+class ProjectRole(str, Enum):
+    """Enum для ролей участника проекта."""
+
+    OWNER = "owner"
+    MEMBER = "member"
+
+
+@dataclass(kw_only=True)
+class ProjectMember:
+    """Участник проекта."""
+
+    project_id: UUID
+    user_id: UUID
+    role: ProjectRole = ProjectRole.MEMBER
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass(kw_only=True)
+class TaskTimelineColumns:
+    """
+    Столбцы с временными метками задач проекта для расчета аналитики.
+
+    Значения хранятся списками по столбцам, а не объектами Task: так их можно
+    сразу превратить в массивы NumPy. Время — секунды от эпохи (UTC),
+    NaN — событие не наступало. status_codes — индекс статуса в list(TaskStatus).
+    """
+
+    status_codes: List[int] = field(default_factory=list)
+    created_at: List[float] = field(default_factory=list)
+    started_at: List[float] = field(default_factory=list)
+    completed_at: List[float] = field(default_factory=list)
+
+
+@dataclass(kw_only=True)
+class DurationStats:
+    """Распределение длительностей в часах."""
+
+    count: int = 0
+    mean_hours: Optional[float] = None
+    p50_hours: Optional[float] = None
+    p85_hours: Optional[float] = None
+    p95_hours: Optional[float] = None
+    max_hours: Optional[float] = None
+
+
+@dataclass(kw_only=True)
+class HistogramBucket:
+    """Корзина гистограммы длительностей; upper_hours пуст у последней корзины."""
+
+    lower_hours: float
+    upper_hours: Optional[float]
+    count: int
+
+
+@dataclass(kw_only=True)
+class ThroughputBucket:
+    """Количество завершенных задач за неделю, начинающуюся в week_start (понедельник, UTC)."""
+
+    week_start: datetime
+    completed: int
+
+
+@dataclass(kw_only=True)
+class ProjectAnalytics:
+    """Аналитика потока задач проекта."""
+
+    project_id: UUID
+    generated_at: datetime
+    task_count: int
+    wip: Dict[TaskStatus, int]
+    lead_time: DurationStats
+    cycle_time: DurationStats
+    cycle_time_histogram: List[HistogramBucket]
+    weekly_throughput: List[ThroughputBucket]
+
+
+class TaskExportFormat(str, Enum):
+    """Формат выгрузки задач проекта."""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class TaskImportFormat(str, Enum):
+    """Формат загружаемого файла задач."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+@dataclass(kw_only=True)
+class TaskImportRowError:
+    """Ошибка строки импорта; line — номер строки файла, начиная с 1."""
+
+    line: int
+    message: str
+
+
+@dataclass(kw_only=True)
+class TaskBulkLoadResult:
+    """Результат загрузки проверенных строк в tasks."""
+
+    staged: int
+    # (id, title, status) вставленных задач для публикации событий
+    inserted: List[Tuple[UUID, str, TaskStatus]] = field(default_factory=list)
+    # (строка, id) строк, чей id уже занят задачей другого проекта
+    conflicts: List[Tuple[int, UUID]] = field(default_factory=list)
+
+
+@dataclass(kw_only=True)
+class TaskImportResult:
+    """Итог импорта задач в проект."""
+
+    project_id: UUID
+    received: int
+    imported: int
+    duplicates: int
+    error_count: int
+    errors: List[TaskImportRowError] = field(default_factory=list)
+    events_failed: int = 0
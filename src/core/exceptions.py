@@ -40,6 +40,18 @@ class InvalidRequestError(Exception):
     pass
 
 
+class ConflictError(Exception):
+    """Ресурс был изменен конкурентно."""
+
+    pass
+
+
+class PreconditionFailedError(Exception):
+    """Условие запроса (If-Match) не выполнено: ресурс изменился."""
+
+    pass
+
+
 class PermissionDeniedError(Exception):
     """Недостаточно прав для выполнения операции."""
 
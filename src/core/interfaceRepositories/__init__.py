@@ -1,3 +1,7 @@
 from core.interfaceRepositories.project_irepository import IProjectRepository
 from core.interfaceRepositories.task_irepository import ITaskRepository
 from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from core.interfaceRepositories.project_purge_ischeduler import IProjectPurgeScheduler
+from core.interfaceRepositories.task_export_ireader import ITaskExportReader
+from core.interfaceRepositories.task_bulk_iloader import ITaskBulkLoader
+from core.interfaceRepositories.unit_of_work_i import IUnitOfWork
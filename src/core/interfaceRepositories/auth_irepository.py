@@ -15,6 +15,14 @@ class IUserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, user_ids: List[UUID]) -> List[User]:
+        """Получить пользователей по списку ID одним запросом.
+        :param user_ids: ID пользователей.
+        :return: Найденные пользователи в произвольном порядке.
+        """
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         """Получить пользователя по email.
@@ -1,13 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
 
 class IEventPublisher(ABC):
     """Интерфейс издателя событий в Kafka."""
 
     @abstractmethod
-    async def publish_event(self, event: Any, topic: str) -> None:
-        """Опубликовать событие в Kafka."""
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
+        """Опубликовать событие в Kafka.
+        key — ключ партиции; без него ключ выбирается по типу события
+        (по умолчанию project_id), чтобы события проекта не переупорядочивались.
+        """
         pass
 
     @abstractmethod
@@ -15,6 +18,11 @@ class IEventPublisher(ABC):
         """Запустить издателя (подключиться к брокеру)."""
         pass
 
+    @abstractmethod
+    async def flush(self) -> None:
+        """Дождаться доставки уже опубликованных событий."""
+        pass
+
     @abstractmethod
     async def stop(self) -> None:
         """Остановить издателя (отключиться от брокера)."""
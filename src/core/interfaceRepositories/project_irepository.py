@@ -1,16 +1,26 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from core.entites.core_entities import Project
+from core.entites.core_entities import (
+    Project,
+    ProjectMember,
+    ProjectRole,
+    ProjectSuggestion,
+    ProjectTaskStats,
+)
 
 
 class IProjectRepository(ABC):
     """Интерфейс репозитория проектов."""
 
     @abstractmethod
-    async def create_project(self, project: Project) -> Project:
+    async def create_project(
+        self, project: Project, owner_id: Optional[UUID] = None
+    ) -> Project:
         """Создать проект.
         :param project: Объект проекта.
+        :param owner_id: ID пользователя, который становится владельцем проекта.
         :return: Созданный объект проекта."""
         pass
 
@@ -22,22 +32,57 @@ class IProjectRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_projects_by_ids(self, project_ids: List[UUID]) -> List[Project]:
+        """Получить проекты по списку ID одним запросом.
+        :param project_ids: ID проектов.
+        :return: Найденные проекты в произвольном порядке.
+        """
+        pass
+
+    @abstractmethod
+    async def get_project_timestamp(self, project_id: UUID) -> Optional[datetime]:
+        """Время последнего изменения проекта без чтения остальных полей.
+        :param project_id: ID проекта.
+        :return: updated_at или None, если проект не найден.
+        """
+        pass
+
     @abstractmethod
     async def update_project(
-        self, project_id: UUID, update_data: Dict[str, Any]
+        self,
+        project_id: UUID,
+        update_data: Dict[str, Any],
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Project]:
         """Обновить проект по ID с частичными данными.
         :param project_id: ID проекта.
         :param update_data: Словарь с обновляемыми данными.
-        :return: Объект проекта или None, если не найден.
+        :param expected_updated_at: Обновить, только если проект не менялся с этого момента.
+        :return: Объект проекта или None, если не найден или условие не выполнено.
         """
         pass
 
     @abstractmethod
-    async def delete_project(self, project_id: UUID) -> None:
+    async def delete_project(self, project_id: UUID) -> bool:
         """Удалить проект по ID.
         :param project_id: ID проекта.
-        :return: None.
+        :return: True, если проект удален, иначе False.
+        """
+        pass
+
+    @abstractmethod
+    async def mark_project_deleted(self, project_id: UUID) -> bool:
+        """Пометить проект удаленным (мягкое удаление).
+        :param project_id: ID проекта.
+        :return: True, если проект был помечен, иначе False.
+        """
+        pass
+
+    @abstractmethod
+    async def list_deleted_project_ids(self) -> List[UUID]:
+        """Список ID проектов, помеченных удаленными, но еще не вычищенных.
+        :return: Список ID проектов.
         """
         pass
 
@@ -52,6 +97,65 @@ class IProjectRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_member_projects(
+        self, user_id: UUID, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Project]:
+        """Список проектов, в которых состоит пользователь, с пагинацией по ключу.
+        :param user_id: ID пользователя.
+        :param limit: Максимальное количество проектов.
+        :param after: ID последнего проекта предыдущей страницы.
+        :return: Список проектов в порядке возрастания ID.
+        """
+        pass
+
+    @abstractmethod
+    async def get_member_roles(self, user_id: UUID) -> Dict[UUID, ProjectRole]:
+        """Роли пользователя во всех его проектах.
+        :param user_id: ID пользователя.
+        :return: Словарь {ID проекта: роль}.
+        """
+        pass
+
+    @abstractmethod
+    async def list_members(self, project_id: UUID) -> List[ProjectMember]:
+        """Участники проекта.
+        :param project_id: ID проекта.
+        :return: Список участников.
+        """
+        pass
+
+    @abstractmethod
+    async def add_member(
+        self, project_id: UUID, user_id: UUID, role: ProjectRole
+    ) -> ProjectMember:
+        """Добавить участника в проект или изменить его роль.
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        :param role: Роль участника.
+        :return: Участник проекта.
+        """
+        pass
+
+    @abstractmethod
+    async def remove_member(self, project_id: UUID, user_id: UUID) -> bool:
+        """Исключить участника из проекта.
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        :return: True, если участник был исключен, иначе False.
+        """
+        pass
+
+    @abstractmethod
+    async def get_task_stats(
+        self, project_ids: List[UUID]
+    ) -> Dict[UUID, ProjectTaskStats]:
+        """Получить счетчики задач по статусам для списка проектов.
+        :param project_ids: Список ID проектов.
+        :return: Словарь {ID проекта: счетчики}; для каждого переданного ID.
+        """
+        pass
+
     @abstractmethod
     async def get_project_by_filter(self, filters: Dict[str, Any]) -> Optional[Project]:
         """
@@ -60,3 +164,16 @@ class IProjectRepository(ABC):
         :return: Объект проекта или None, если не найден.
         """
         pass
+
+    @abstractmethod
+    async def search_projects(
+        self, query: str, limit: int, user_id: Optional[UUID] = None
+    ) -> List[ProjectSuggestion]:
+        """
+        Нечеткий поиск проектов по названию для автодополнения.
+        :param query: Введенная пользователем строка (в нижнем регистре).
+        :param limit: Максимальное количество подсказок.
+        :param user_id: Искать только среди проектов этого пользователя (опционально).
+        :return: Подсказки по убыванию похожести.
+        """
+        pass
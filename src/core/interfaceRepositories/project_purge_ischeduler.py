@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+from uuid import UUID
+from core.entites.core_entities import ProjectPurgeProgress
+
+
+class IProjectPurgeScheduler(ABC):
+    """Интерфейс планировщика фонового удаления проектов."""
+
+    @abstractmethod
+    async def schedule_purge(
+        self, project_id: UUID, member_ids: Iterable[UUID] = ()
+    ) -> ProjectPurgeProgress:
+        """Поставить проект в очередь на удаление задач.
+        :param project_id: ID проекта.
+        :param member_ids: Участники проекта, которым доступен прогресс удаления.
+        :return: Текущий прогресс удаления.
+        """
+        pass
+
+    @abstractmethod
+    def get_progress(self, project_id: UUID) -> Optional[ProjectPurgeProgress]:
+        """Получить прогресс удаления проекта.
+        :param project_id: ID проекта.
+        :return: Прогресс удаления или None, если удаление не запускалось.
+        """
+        pass
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+from uuid import UUID
+from core.entites.core_entities import TaskBulkLoadResult
+
+# Порядок значений в строках, которые принимает загрузчик; status — имя TaskStatus
+TASK_IMPORT_COLUMNS: Tuple[str, ...] = (
+    "line",
+    "id",
+    "title",
+    "description",
+    "status",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+)
+
+
+class ITaskBulkLoader(ABC):
+    """Интерфейс массовой загрузки задач в проект."""
+
+    @abstractmethod
+    async def load(
+        self, project_id: UUID, batches: AsyncIterator[List[Sequence[Any]]]
+    ) -> TaskBulkLoadResult:
+        """Загрузить пачки проверенных строк (в порядке TASK_IMPORT_COLUMNS)
+        в задачи проекта одной транзакцией. Строки с id, уже существующим
+        в проекте, пропускаются; строки с id задачи другого проекта
+        не вставляются и возвращаются в conflicts.
+        :param project_id: ID проекта.
+        :param batches: Асинхронный итератор пачек строк.
+        :return: Количество принятых строк, вставленные задачи и конфликты id.
+        """
+        pass
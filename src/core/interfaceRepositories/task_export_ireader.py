@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+from uuid import UUID
+
+# Колонки выгрузки в порядке значений в строках, которые возвращает читатель
+TASK_EXPORT_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "project_id",
+    "title",
+    "description",
+    "status",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+    "version",
+)
+
+
+class ITaskExportReader(ABC):
+    """Интерфейс потокового чтения задач проекта для выгрузки."""
+
+    @abstractmethod
+    def iter_project_tasks(
+        self, project_id: UUID, chunk_size: int
+    ) -> AsyncIterator[List[Sequence[Any]]]:
+        """Все задачи проекта (горячие и архивные) пачками по chunk_size строк.
+        Строки содержат значения в порядке TASK_EXPORT_COLUMNS и читаются из
+        одного согласованного снимка данных.
+        """
+        pass
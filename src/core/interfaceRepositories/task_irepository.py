@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from core.entites.core_entities import Task, TaskStatus
+from core.entites.core_entities import (
+    Task,
+    TaskSearchHit,
+    TaskStatus,
+    TaskStatusTransition,
+    TaskTimelineColumns,
+)
 
 
 class ITaskRepository(ABC):
@@ -13,22 +20,93 @@ class ITaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_task(self, task_id: UUID) -> Optional[Task]:
-        """Получить задачу по ID."""
+    async def get_task(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Task]:
+        """Получить задачу по ID.
+        project_id (ключ секционирования) позволяет читать только одну секцию.
+        """
+        pass
+
+    @abstractmethod
+    async def get_tasks_by_ids(self, task_ids: List[UUID]) -> List[Task]:
+        """Получить задачи (горячие и архивные) по списку ID одним запросом.
+        Возвращаются только найденные задачи, в произвольном порядке.
+        """
+        pass
+
+    @abstractmethod
+    async def is_task_archived(self, task_id: UUID, project_id: Optional[UUID] = None) -> bool:
+        """Находится ли задача в архиве (архивные задачи только для чтения)."""
+        pass
+
+    @abstractmethod
+    async def get_task_timestamp(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Tuple[UUID, datetime]]:
+        """ID проекта и время последнего изменения задачи без чтения остальных полей.
+        :return: (project_id, updated_at) или None, если задача не найдена.
+        """
         pass
 
     @abstractmethod
     async def update_task(
-        self, task_id: UUID, update_data: Dict[str, Any]
+        self,
+        task_id: UUID,
+        update_data: Dict[str, Any],
+        project_id: Optional[UUID] = None,
+        expected_version: Optional[int] = None,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Task]:
-        """Обновить задачу по ID с частичными данными."""
+        """Обновить задачу по ID с частичными данными.
+        С expected_version или expected_updated_at обновление выполняется,
+        только если задача не менялась.
+        """
+        pass
+
+    @abstractmethod
+    async def change_task_status(
+        self,
+        task_id: UUID,
+        new_status: TaskStatus,
+        expected_status: Optional[TaskStatus] = None,
+        project_id: Optional[UUID] = None,
+    ) -> Optional[Tuple[TaskStatus, Task]]:
+        """Сменить статус задачи одним условным обновлением.
+        :return: (прежний статус, задача) или None, если ничего не изменено.
+        """
         pass
 
     @abstractmethod
-    async def delete_task(self, task_id: UUID) -> None:
+    async def delete_task(self, task_id: UUID, project_id: Optional[UUID] = None) -> None:
         """Удалить задачу по ID."""
         pass
 
+    @abstractmethod
+    async def delete_tasks_batch(self, project_id: UUID, batch_size: int) -> int:
+        """Удалить пачку задач проекта в отдельной транзакции.
+        :param project_id: ID проекта.
+        :param batch_size: Максимальное количество удаляемых задач.
+        :return: Количество удаленных задач.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_status_history_batch(self, project_id: UUID, batch_size: int) -> int:
+        """Удалить пачку записей журнала статусов проекта в отдельной транзакции.
+        :param project_id: ID проекта.
+        :param batch_size: Максимальное количество удаляемых записей.
+        :return: Количество удаленных записей.
+        """
+        pass
+
+    @abstractmethod
+    async def archive_closed_tasks(self, closed_before: datetime, batch_size: int) -> int:
+        """Перенести пачку закрытых задач, не менявшихся с closed_before, в архив.
+        :return: Количество перенесенных задач.
+        """
+        pass
+
     @abstractmethod
     async def list_tasks(
         self,
@@ -38,5 +116,40 @@ class ITaskRepository(ABC):
         offset: Optional[int] = None,
         order_by: Optional[str] = None,
     ) -> List[Task]:
-        """Список задач по проекту (с фильтрацией и пагинацией)."""
+        """Список задач по проекту (с фильтрацией и пагинацией).
+        Без фильтра по статусу и при status=CLOSED в выборку входит архив.
+        """
+        pass
+
+    @abstractmethod
+    async def list_status_transitions(
+        self,
+        project_id: UUID,
+        since: datetime,
+        until: datetime,
+        limit: Optional[int] = None,
+    ) -> List[TaskStatusTransition]:
+        """Переходы статусов задач проекта за период [since, until) в порядке времени."""
+        pass
+
+    @abstractmethod
+    async def get_task_timeline_columns(self, project_id: UUID) -> TaskTimelineColumns:
+        """Временные метки создания, начала работы и завершения всех задач проекта по столбцам."""
+        pass
+
+    @abstractmethod
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        project_ids: Optional[List[UUID]] = None,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[TaskSearchHit]:
+        """Полнотекстовый поиск задач по заголовку и описанию.
+        :param query: Поисковый запрос (синтаксис websearch).
+        :param limit: Размер страницы.
+        :param project_ids: Ограничить поиск проектами (опционально).
+        :param after: Ключ (rank, id) последнего результата предыдущей страницы.
+        :return: Результаты по убыванию релевантности.
+        """
         pass
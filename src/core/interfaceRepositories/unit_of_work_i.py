@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager
+
+
+class IUnitOfWork(ABC):
+    """
+    Интерфейс единицы работы.
+
+    Изменения репозиториев и опубликованные через outbox события внутри
+    transaction() фиксируются одной транзакцией при выходе из блока
+    и откатываются целиком при исключении.
+    """
+
+    @abstractmethod
+    def transaction(self) -> AsyncContextManager[None]:
+        """Начать транзакцию; вложенные блоки входят во внешний."""
+        pass
@@ -6,6 +6,7 @@ from core.interfaceRepositories.auth_irepository import (
     IUserRepository,
     IRefreshTokenRepository,
 )
+from core.services.batch_loader import BatchLoader
 from core.exceptions import (
     DuplicateEntryError,
     NotFoundError,
@@ -33,15 +34,18 @@ class AuthService:
         self,
         user_repository: IUserRepository,
         refresh_token_repository: IRefreshTokenRepository,
+        user_loader: Optional[BatchLoader[UUID, User]] = None,
     ):
         """
         Инициализация AuthService.
 
         :param user_repository: Репозиторий для работы с пользователями.
         :param refresh_token_repository: Репозиторий для хранения Refresh Token.
+        :param user_loader: Пакетная загрузка пользователей по ID (опционально).
         """
         self._user_repo: IUserRepository = user_repository
         self._refresh_token_repo: IRefreshTokenRepository = refresh_token_repository
+        self._user_loader: Optional[BatchLoader[UUID, User]] = user_loader
         self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
         self._jwt_algorithm = settings.algorithm
@@ -75,7 +79,10 @@ class AuthService:
         """
         Получить пользователя по ID.
         """
-        user = await self._user_repo.get_by_id(user_id)
+        if self._user_loader is not None:
+            user = await self._user_loader.load(user_id)
+        else:
+            user = await self._user_repo.get_by_id(user_id)
         if not user:
             raise NotFoundError(f"User with ID {user_id} not found")
         return user
@@ -325,7 +332,8 @@ class AuthService:
         """
         to_encode = claims.copy()
         expire_at = datetime.now(timezone.utc) + expires_delta
-
+        # verify_access_token и refresh проверяют exp: без него токен не проходит проверку
+        to_encode["exp"] = expire_at
 
         encoded_jwt = jwt.encode(
             to_encode, self._jwt_secret_key, algorithm=self._jwt_algorithm
@@ -0,0 +1,104 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+class BatchLoader(Generic[Key, Value]):
+    """
+    Пакетная загрузка сущностей по ключу в духе DataLoader.
+
+    Ключи, запрошенные в одном проходе event loop (в том числе разными
+    конкурентными запросами), собираются и загружаются одним вызовом
+    load_batch; повторяющиеся ключи загружаются один раз. Результаты между
+    пакетами не хранятся — это не кэш.
+
+    Используется только из потока event loop, поэтому блокировки не нужны.
+    """
+
+    def __init__(
+        self,
+        load_batch: Callable[[List[Key]], Awaitable[List[Value]]],
+        key: Callable[[Value], Key],
+        max_batch_size: int = 500,
+        clone: Optional[Callable[[Value], Value]] = None,
+    ):
+        """
+        :param load_batch: Загрузка сущностей по списку ключей; отсутствующие
+            сущности просто не возвращаются, порядок не важен.
+        :param key: Ключ загруженной сущности.
+        :param max_batch_size: Максимум ключей в одном вызове load_batch.
+        :param clone: Копирование результата для каждого вызывающего, чтобы
+            изменения объекта одним запросом не были видны другим.
+        """
+        self._load_batch = load_batch
+        self._key = key
+        self._max_batch_size = max_batch_size
+        self._clone = clone
+        self._pending: Dict[Key, "asyncio.Future[Optional[Value]]"] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def load(self, key: Key) -> Optional[Value]:
+        """Сущность по ключу или None, если она не найдена."""
+        return await self._resolve(self._enqueue(key))
+
+    async def load_many(self, keys: List[Key]) -> List[Optional[Value]]:
+        """Сущности по ключам в порядке ключей; None для ненайденных."""
+        # Все ключи ставятся в очередь сразу, чтобы попасть в один пакет
+        futures = [self._enqueue(key) for key in keys]
+        return list(await asyncio.gather(*(self._resolve(future) for future in futures)))
+
+    def _enqueue(self, key: Key) -> "asyncio.Future[Optional[Value]]":
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Пакет отправляется после того, как отработают уже готовые корутины
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+        return future
+
+    async def _resolve(self, future: "asyncio.Future[Optional[Value]]") -> Optional[Value]:
+        # Отмена одного вызывающего не должна отменять загрузку для остальных
+        value = await asyncio.shield(future)
+        if value is not None and self._clone is not None:
+            return self._clone(value)
+        return value
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self._max_batch_size):
+            batch = {key: pending[key] for key in keys[start : start + self._max_batch_size]}
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[Key, "asyncio.Future[Optional[Value]]"]) -> None:
+        try:
+            values = await self._load_batch(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Без ожидающих future не должен логировать ошибку
+                    future.exception()
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+            return
+        found = {self._key(value): value for value in values}
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
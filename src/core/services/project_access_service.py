@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+from core.entites.core_entities import ProjectRole
+from core.interfaceRepositories.project_irepository import IProjectRepository
+from core.exceptions import PermissionDeniedError
+
+
+class ProjectAccessService:
+    """
+    Проверка доступа текущего пользователя к проектам.
+
+    Создается на каждый запрос. Роли пользователя во всех его проектах
+    загружаются одним запросом при первой проверке, дальнейшие проверки
+    в пределах запроса обходятся без обращений к БД.
+    """
+
+    def __init__(
+        self,
+        project_repo: IProjectRepository,
+        user_id: UUID,
+        is_superuser: bool = False,
+    ):
+        """
+        Инициализация сервиса.
+
+        :param project_repo: Репозиторий проектов.
+        :param user_id: ID текущего пользователя.
+        :param is_superuser: Суперпользователь имеет доступ ко всем проектам.
+        """
+        self._project_repo: IProjectRepository = project_repo
+        self.user_id: UUID = user_id
+        self.is_superuser: bool = is_superuser
+        self._roles: Optional[Dict[UUID, ProjectRole]] = None
+
+    async def get_roles(self) -> Dict[UUID, ProjectRole]:
+        """Роли пользователя по проектам (загружаются один раз за запрос)."""
+        if self._roles is None:
+            self._roles = await self._project_repo.get_member_roles(self.user_id)
+        return self._roles
+
+    async def member_project_ids(self) -> Optional[List[UUID]]:
+        """ID проектов пользователя; None для суперпользователя (без ограничений)."""
+        if self.is_superuser:
+            return None
+        return list(await self.get_roles())
+
+    async def ensure_member(self, project_id: UUID) -> None:
+        """
+        Проверить, что пользователь — участник проекта.
+
+        :raises PermissionDeniedError: Если пользователь не участник.
+        """
+        if self.is_superuser:
+            return
+        if project_id not in await self.get_roles():
+            raise PermissionDeniedError(f"No access to project {project_id}.")
+
+    async def ensure_owner(self, project_id: UUID) -> None:
+        """
+        Проверить, что пользователь — владелец проекта.
+
+        :raises PermissionDeniedError: Если пользователь не владелец.
+        """
+        if self.is_superuser:
+            return
+        if (await self.get_roles()).get(project_id) != ProjectRole.OWNER:
+            raise PermissionDeniedError(f"Only owners can manage project {project_id}.")
+
+    def remember(self, project_id: UUID, role: Optional[ProjectRole]) -> None:
+        """Обновить загруженные роли после изменения участия в этом же запросе."""
+        if self._roles is None:
+            return
+        if role is None:
+            self._roles.pop(project_id, None)
+        else:
+            self._roles[project_id] = role
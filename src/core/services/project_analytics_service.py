@@ -0,0 +1,252 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from core.entites.core_entities import (
+    DurationStats,
+    HistogramBucket,
+    ProjectAnalytics,
+    TaskStatus,
+    TaskTimelineColumns,
+    ThroughputBucket,
+)
+from core.exceptions import InvalidRequestError
+from core.interfaceRepositories.task_irepository import ITaskRepository
+from core.services.project_access_service import ProjectAccessService
+
+# Порядок статусов совпадает с порядком значений task_status_enum в БД
+STATUS_ORDER: List[TaskStatus] = list(TaskStatus)
+
+SECONDS_PER_HOUR = 3600.0
+SECONDS_PER_WEEK = 7 * 24 * 3600
+# 1970-01-01 — четверг; первый понедельник эпохи наступает через 4 дня
+EPOCH_MONDAY_OFFSET = 4 * 24 * 3600
+EPOCH = datetime(1970, 1, 1)
+
+# Границы корзин гистограммы времени цикла в часах: час, полдня, сутки, ... месяц
+CYCLE_TIME_EDGES_HOURS = np.array(
+    [0.0, 1.0, 4.0, 8.0, 24.0, 48.0, 72.0, 168.0, 336.0, 720.0, np.inf]
+)
+PERCENTILES = (50, 85, 95)
+
+
+def _duration_stats(hours: np.ndarray) -> DurationStats:
+    if hours.size == 0:
+        return DurationStats()
+    p50, p85, p95 = np.percentile(hours, PERCENTILES)
+    return DurationStats(
+        count=int(hours.size),
+        mean_hours=float(hours.mean()),
+        p50_hours=float(p50),
+        p85_hours=float(p85),
+        p95_hours=float(p95),
+        max_hours=float(hours.max()),
+    )
+
+
+def _durations_hours(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Длительности в часах; пары с NaN и отрицательные интервалы отбрасываются."""
+    hours = (end - start) / SECONDS_PER_HOUR
+    # Сравнение с NaN дает False, поэтому незавершенные задачи отсекаются здесь же
+    return hours[hours >= 0]
+
+
+def _cycle_time_histogram(hours: np.ndarray) -> List[HistogramBucket]:
+    buckets = len(CYCLE_TIME_EDGES_HOURS) - 1
+    positions = np.searchsorted(CYCLE_TIME_EDGES_HOURS, hours, side="right") - 1
+    counts = np.bincount(positions, minlength=buckets)
+    return [
+        HistogramBucket(
+            lower_hours=float(CYCLE_TIME_EDGES_HOURS[i]),
+            upper_hours=(
+                None
+                if np.isinf(CYCLE_TIME_EDGES_HOURS[i + 1])
+                else float(CYCLE_TIME_EDGES_HOURS[i + 1])
+            ),
+            count=int(counts[i]),
+        )
+        for i in range(buckets)
+    ]
+
+
+def _weekly_throughput(
+    completed_at: np.ndarray, now: datetime, weeks: int
+) -> List[ThroughputBucket]:
+    now_seconds = now.replace(tzinfo=timezone.utc).timestamp()
+    current_week = int((now_seconds - EPOCH_MONDAY_OFFSET) // SECONDS_PER_WEEK)
+    first_week = current_week - weeks + 1
+
+    completed = completed_at[~np.isnan(completed_at)]
+    week_index = (
+        np.floor((completed - EPOCH_MONDAY_OFFSET) / SECONDS_PER_WEEK).astype(np.int64)
+        - first_week
+    )
+    week_index = week_index[(week_index >= 0) & (week_index < weeks)]
+    counts = np.bincount(week_index, minlength=weeks)
+    return [
+        ThroughputBucket(
+            week_start=EPOCH
+            + timedelta(seconds=(first_week + i) * SECONDS_PER_WEEK + EPOCH_MONDAY_OFFSET),
+            completed=int(counts[i]),
+        )
+        for i in range(weeks)
+    ]
+
+
+def compute_project_analytics(
+    project_id: UUID,
+    columns: TaskTimelineColumns,
+    now: datetime,
+    weeks: int,
+) -> ProjectAnalytics:
+    """
+    Рассчитать аналитику проекта по столбцам временных меток.
+
+    Все вычисления векторные, без циклов по задачам. Функция чистая и не
+    обращается к event loop, поэтому выполняется в пуле потоков.
+
+    :param project_id: ID проекта.
+    :param columns: Столбцы из ITaskRepository.get_task_timeline_columns.
+    :param now: Текущее время (UTC, naive) — конец окна пропускной способности.
+    :param weeks: Количество недель в окне пропускной способности.
+    """
+    status_codes = np.asarray(columns.status_codes, dtype=np.int64)
+    created_at = np.asarray(columns.created_at, dtype=np.float64)
+    started_at = np.asarray(columns.started_at, dtype=np.float64)
+    completed_at = np.asarray(columns.completed_at, dtype=np.float64)
+
+    status_counts = np.bincount(status_codes, minlength=len(STATUS_ORDER))
+    cycle_time = _durations_hours(started_at, completed_at)
+
+    return ProjectAnalytics(
+        project_id=project_id,
+        generated_at=now,
+        task_count=int(status_codes.size),
+        wip={status: int(status_counts[i]) for i, status in enumerate(STATUS_ORDER)},
+        lead_time=_duration_stats(_durations_hours(created_at, completed_at)),
+        cycle_time=_duration_stats(cycle_time),
+        cycle_time_histogram=_cycle_time_histogram(cycle_time),
+        weekly_throughput=_weekly_throughput(completed_at, now, weeks),
+    )
+
+
+class ProjectAnalyticsCache:
+    """
+    Кэш рассчитанной аналитики по проектам.
+
+    Запись проекта сбрасывается любым событием с его project_id. Поколение
+    проекта увеличивается при сбросе: расчет, начатый до события, не попадет
+    в кэш после него. ttl_seconds ограничивает устаревание на случай событий,
+    опубликованных другими экземплярами сервиса.
+    Используется только из потока event loop, поэтому блокировки не нужны.
+    """
+
+    def __init__(self, max_projects: int = 1024, ttl_seconds: float = 300.0):
+        self._max_projects = max_projects
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[UUID, Dict[int, Tuple[float, ProjectAnalytics]]]" = (
+            OrderedDict()
+        )
+        self._generations: Dict[UUID, int] = {}
+
+    def generation(self, project_id: UUID) -> int:
+        """Текущее поколение проекта; передается в put после расчета."""
+        return self._generations.get(project_id, 0)
+
+    def get(self, project_id: UUID, weeks: int) -> Optional[ProjectAnalytics]:
+        entry = self._entries.get(project_id, {}).get(weeks)
+        if entry is None:
+            return None
+        stored_at, analytics = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[project_id][weeks]
+            return None
+        self._entries.move_to_end(project_id)
+        return analytics
+
+    def put(
+        self, project_id: UUID, weeks: int, analytics: ProjectAnalytics, generation: int
+    ) -> None:
+        if generation != self.generation(project_id):
+            return
+        self._entries.setdefault(project_id, {})[weeks] = (time.monotonic(), analytics)
+        self._entries.move_to_end(project_id)
+        while len(self._entries) > self._max_projects:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._entries.pop(project_id, None)
+        self._generations[project_id] = self.generation(project_id) + 1
+
+    def on_event(self, event: Any, topic: str) -> None:
+        """Слушатель опубликованных событий: сбрасывает аналитику проекта события."""
+        project_id = getattr(event, "project_id", None)
+        if project_id is not None:
+            self.invalidate(project_id)
+
+    def on_message(self, event: Dict[str, Any]) -> None:
+        """Обработчик событий из брокера: сбрасывает аналитику проекта,
+        измененного другим экземпляром сервиса."""
+        if event.get("project_id") is not None:
+            self.invalidate(UUID(event["project_id"]))
+
+
+class ProjectAnalyticsService:
+    """Сервис аналитики потока задач проекта: время цикла, пропускная способность, WIP."""
+
+    def __init__(
+        self,
+        task_repo: ITaskRepository,
+        cache: ProjectAnalyticsCache,
+        executor: Optional[Executor] = None,
+        access: Optional[ProjectAccessService] = None,
+    ):
+        """Инициализация сервиса с зависимостями.
+        Без executor расчет выполняется в пуле потоков event loop по умолчанию.
+        """
+        self._task_repo: ITaskRepository = task_repo
+        self._cache: ProjectAnalyticsCache = cache
+        self._executor: Optional[Executor] = executor
+        self._access: Optional[ProjectAccessService] = access
+
+    async def get_analytics(self, project_id: UUID, weeks: int = 12) -> ProjectAnalytics:
+        """
+        Аналитика проекта.
+
+        Столбцы временных меток читаются одним запросом, расчет выполняется
+        в пуле потоков, чтобы не блокировать event loop. Результат кэшируется
+        до следующего события по задачам проекта.
+
+        :param project_id: ID проекта.
+        :param weeks: Количество недель в окне пропускной способности.
+        :raises InvalidRequestError: Если weeks меньше 1.
+        :raises PermissionDeniedError: Если пользователь не участник проекта.
+        """
+        if weeks < 1:
+            raise InvalidRequestError("weeks must be positive.")
+        if self._access is not None:
+            await self._access.ensure_member(project_id)
+
+        cached = self._cache.get(project_id, weeks)
+        if cached is not None:
+            return cached
+
+        generation = self._cache.generation(project_id)
+        columns = await self._task_repo.get_task_timeline_columns(project_id)
+        loop = asyncio.get_running_loop()
+        analytics = await loop.run_in_executor(
+            self._executor,
+            compute_project_analytics,
+            project_id,
+            columns,
+            datetime.utcnow(),
+            weeks,
+        )
+        self._cache.put(project_id, weeks, analytics, generation)
+        return analytics
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime
+from typing import Callable, Optional
+from uuid import UUID
+from core.entites.core_entities import ProjectPurgeProgress, ProjectPurgeState
+from core.entites.core_events import ProjectDeletedEvent
+from core.interfaceRepositories.project_irepository import IProjectRepository
+from core.interfaceRepositories.task_irepository import ITaskRepository
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+
+
+class ProjectPurgeService:
+    """Сервис вычистки задач удаленного проекта пачками."""
+
+    def __init__(
+        self,
+        project_repo: IProjectRepository,
+        task_repo: ITaskRepository,
+        event_publisher: IEventPublisher,
+    ):
+        """Инициализация сервиса с зависимостями."""
+        self._project_repo: IProjectRepository = project_repo
+        self._task_repo: ITaskRepository = task_repo
+        self._event_publisher: IEventPublisher = event_publisher
+
+    async def purge_project(
+        self,
+        progress: ProjectPurgeProgress,
+        batch_size: int,
+        pause_seconds: float = 0.0,
+        on_progress: Optional[Callable[[ProjectPurgeProgress], None]] = None,
+    ) -> ProjectPurgeProgress:
+        """
+        Удалить все задачи проекта пачками, затем журнал статусов и сам проект,
+        и опубликовать ProjectDeletedEvent. Событие публикуется, только если
+        строку проекта удалил этот вызов: повторная вычистка уже удаленного
+        проекта его не дублирует.
+
+        Каждая пачка удаляется в отдельной короткой транзакции, поэтому удаление
+        большого проекта не держит блокировки на всё время работы.
+
+        :param progress: Объект прогресса, который обновляется по ходу удаления.
+        :param batch_size: Размер пачки удаляемых задач.
+        :param pause_seconds: Пауза между пачками, чтобы не нагружать БД.
+        :param on_progress: Колбэк, вызываемый после каждой пачки.
+        :return: Итоговый прогресс удаления.
+        """
+        project_id: UUID = progress.project_id
+        progress.state = ProjectPurgeState.RUNNING
+        progress.started_at = progress.started_at or datetime.utcnow()
+
+        while True:
+            deleted = await self._task_repo.delete_tasks_batch(project_id, batch_size)
+            if deleted == 0:
+                break
+            progress.deleted_tasks += deleted
+            progress.batches += 1
+            if on_progress:
+                on_progress(progress)
+            await asyncio.sleep(pause_seconds)
+
+        # Журнал статусов не входит в прогресс: считаются только удаленные задачи
+        while await self._task_repo.delete_status_history_batch(project_id, batch_size):
+            await asyncio.sleep(pause_seconds)
+
+        project_deleted = await self._project_repo.delete_project(project_id)
+        if project_deleted:
+            event = ProjectDeletedEvent(project_id=project_id, timestamp=datetime.utcnow())
+            await self._event_publisher.publish_event(event, topic="task_events")
+
+        progress.state = ProjectPurgeState.COMPLETED
+        progress.error = None
+        progress.finished_at = datetime.utcnow()
+        if on_progress:
+            on_progress(progress)
+
+        return progress
@@ -1,14 +1,30 @@
-from typing import List, Optional, Dict, Any
+from contextlib import nullcontext
+from typing import AsyncContextManager, List, Optional, Dict, Any
 from uuid import UUID
-from core.entites.core_entities import Project
+from core.entites.core_entities import (
+    Project,
+    ProjectMember,
+    ProjectPurgeProgress,
+    ProjectRole,
+    ProjectSuggestion,
+    ProjectTaskStats,
+)
 from core.entites.core_events import (
     ProjectCreatedEvent,
-    ProjectDeletedEvent,
     ProjectUpdatedEvent,
 )
 from core.interfaceRepositories.project_irepository import IProjectRepository
 from core.interfaceRepositories.event_ipublisher import IEventPublisher
-from core.exceptions import NotFoundError, AlreadyExistsError, DuplicateEntryError
+from core.interfaceRepositories.project_purge_ischeduler import IProjectPurgeScheduler
+from core.interfaceRepositories.unit_of_work_i import IUnitOfWork
+from core.services.batch_loader import BatchLoader
+from core.services.project_access_service import ProjectAccessService
+from core.exceptions import (
+    AlreadyExistsError,
+    DuplicateEntryError,
+    NotFoundError,
+    PreconditionFailedError,
+)
 from datetime import datetime
 
 
@@ -16,17 +32,42 @@ class ProjectService:
     """Сервис для управления проектами."""
 
     def __init__(
-        self, project_repo: IProjectRepository, event_publisher: IEventPublisher
+        self,
+        project_repo: IProjectRepository,
+        event_publisher: IEventPublisher,
+        purge_scheduler: IProjectPurgeScheduler,
+        access: Optional[ProjectAccessService] = None,
+        project_loader: Optional[BatchLoader[UUID, Project]] = None,
+        uow: Optional[IUnitOfWork] = None,
     ):
-        """Инициализация сервиса с зависимостями."""
+        """Инициализация сервиса с зависимостями.
+        Без access (внутренние вызовы) проверки доступа не выполняются.
+        project_loader объединяет чтения проектов по ID из конкурентных запросов в пакеты.
+        С uow изменение и его событие фиксируются одной транзакцией (outbox).
+        """
         self._project_repo: IProjectRepository = project_repo
         self._event_publisher: IEventPublisher = event_publisher
+        self._purge_scheduler: IProjectPurgeScheduler = purge_scheduler
+        self._access: Optional[ProjectAccessService] = access
+        self._project_loader: Optional[BatchLoader[UUID, Project]] = project_loader
+        self._uow: Optional[IUnitOfWork] = uow
+
+    def _transaction(self) -> AsyncContextManager[None]:
+        return self._uow.transaction() if self._uow is not None else nullcontext()
+
+    async def _ensure_member(self, project_id: UUID) -> None:
+        if self._access is not None:
+            await self._access.ensure_member(project_id)
+
+    async def _ensure_owner(self, project_id: UUID) -> None:
+        if self._access is not None:
+            await self._access.ensure_owner(project_id)
 
     async def create_project(
         self, name: str, description: Optional[str] = None
     ) -> Project:
         """
-        Создать новый проект.
+        Создать новый проект. Текущий пользователь становится его владельцем.
 
         :param name: Название проекта.
         :param description: Описание проекта (опционально).
@@ -41,16 +82,20 @@ class ProjectService:
 
         new_project_data = Project(name=name, description=description)
 
-        project = await self._project_repo.create_project(new_project_data)
+        owner_id = self._access.user_id if self._access else None
+        async with self._transaction():
+            project = await self._project_repo.create_project(new_project_data, owner_id)
+            if self._access is not None:
+                self._access.remember(project.id, ProjectRole.OWNER)
 
-        event = ProjectCreatedEvent(
-            project_id=project.id,
-            name=project.name,
-            timestamp=datetime.utcnow(),
-        )
+            event = ProjectCreatedEvent(
+                project_id=project.id,
+                name=project.name,
+                timestamp=datetime.utcnow(),
+            )
 
-        # Выбираем топик для публикации. Можно использовать один общий или выделить для проектов.
-        await self._event_publisher.publish_event(event, topic="task_events")
+            # Выбираем топик для публикации. Можно использовать один общий или выделить для проектов.
+            await self._event_publisher.publish_event(event, topic="task_events")
 
         return project
 
@@ -61,40 +106,114 @@ class ProjectService:
         :param project_id: ID проекта.
         :return: Объект Project или None, если не найден.
         """
-
-        project = await self._project_repo.get_project(project_id)
+        await self._ensure_member(project_id)
+        if self._project_loader is not None:
+            project = await self._project_loader.load(project_id)
+        else:
+            project = await self._project_repo.get_project(project_id)
         if not project:
             raise NotFoundError(f"Project with ID {project_id} not found.")
         return project
 
+    async def get_project_last_modified(self, project_id: UUID) -> datetime:
+        """
+        Время последнего изменения проекта для условных запросов.
+
+        :param project_id: ID проекта.
+        :return: updated_at проекта.
+        :raises NotFoundError: Если проект не найден.
+        """
+        await self._ensure_member(project_id)
+        updated_at = await self._project_repo.get_project_timestamp(project_id)
+        if updated_at is None:
+            raise NotFoundError(f"Project with ID {project_id} not found.")
+        return updated_at
+
     async def list_projects(
-        self, limit: Optional[int] = None, offset: Optional[int] = None
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include_stats: bool = False,
+        after: Optional[UUID] = None,
     ) -> List[Project]:
         """
-        Список всех проектов (с опциональной пагинацией).
+        Список проектов текущего пользователя (с опциональной пагинацией).
+
+        Обычному пользователю возвращаются только проекты, где он участник,
+        в порядке ID; следующая страница запрашивается через after — ID
+        последнего проекта. Суперпользователю и внутренним вызовам доступны все
+        проекты с пагинацией по смещению.
 
         :param limit: Максимальное количество проектов.
-        :param offset: Смещение для пагинации.
+        :param offset: Смещение для пагинации (только без фильтра по участию).
+        :param include_stats: Добавить к проектам счетчики задач по статусам.
+        :param after: ID последнего проекта предыдущей страницы.
         :return: Список объектов Project.
         """
-        # TODO: Добавить фильтрацию по пользователю (например, только проекты, где пользователь участник/владелец)
-        return await self._project_repo.list_projects(limit=limit, offset=offset)
+        if self._access is not None and not self._access.is_superuser:
+            projects = await self._project_repo.list_member_projects(
+                self._access.user_id, limit=limit, after=after
+            )
+        else:
+            projects = await self._project_repo.list_projects(limit=limit, offset=offset)
+        if include_stats and projects:
+            stats = await self._project_repo.get_task_stats(
+                [project.id for project in projects]
+            )
+            for project in projects:
+                project.task_stats = stats[project.id]
+        return projects
+
+    async def get_project_stats(self, project_id: UUID) -> ProjectTaskStats:
+        """
+        Получить количество задач проекта по статусам.
+
+        Счетчики поддерживаются в БД инкрементально, поэтому чтение не зависит от числа задач.
+
+        :param project_id: ID проекта.
+        :return: Объект ProjectTaskStats.
+        """
+        await self.get_project(project_id)  # проверяет и доступ, и существование
+        stats = await self._project_repo.get_task_stats([project_id])
+        return stats[project_id]
+
+    async def search_projects(self, query: str, limit: int = 10) -> List[ProjectSuggestion]:
+        """
+        Подсказки названий проектов для автодополнения (вызывается на каждое нажатие клавиши).
+
+        :param query: Введенная пользователем строка.
+        :param limit: Максимальное количество подсказок.
+        :return: Список ProjectSuggestion по убыванию похожести.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        user_id = None
+        if self._access is not None and not self._access.is_superuser:
+            user_id = self._access.user_id
+        return await self._project_repo.search_projects(query, limit, user_id)
 
     async def update_project(
-        self, project_id: UUID, update_data: Dict[str, Any]
+        self,
+        project_id: UUID,
+        update_data: Dict[str, Any],
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Project]:
         """
         Обновить проект по ID с частичными данными.
 
         :param project_id: ID проекта.
         :param update_data: Словарь с данными для обновления (например, {"name": "New Name"}).
+        :param expected_updated_at: Время изменения проекта, которое видел клиент (If-Match).
         :return: Обновленный объект Project или None, если проект не найден.
+        :raises PreconditionFailedError: Если проект изменился после чтения клиентом.
         """
         # Опционально: можно получить текущее состояние, если нужно сравнить или применить сложную логику
         # current_project = await self._project_repo.get_project(project_id)
         # if not current_project:
         #     return None
         # TODO: Если нужно публиковать ProjectUpdatedEvent, создать его здесь
+        await self._ensure_member(project_id)
         if update_data.get("id") is not None:
             raise DuplicateEntryError("ID cannot be updated.")
         if update_data.get("name") is not None:
@@ -106,32 +225,105 @@ class ProjectService:
                     f"Project with name '{update_data['name']}' already exists."
                 )
 
-        updated_project = await self._project_repo.update_project(
-            project_id, update_data
-        )
+        async with self._transaction():
+            updated_project = await self._project_repo.update_project(
+                project_id, update_data, expected_updated_at
+            )
+            if not updated_project:
+                if expected_updated_at is not None and await self._project_repo.get_project(
+                    project_id
+                ):
+                    raise PreconditionFailedError(
+                        f"Project {project_id} was modified after it was read."
+                    )
+                raise NotFoundError(f"Project with ID {project_id} not found.")
 
-        event = ProjectUpdatedEvent(
-            project_id=updated_project.id,
-            name=updated_project.name,
-        )
-        await self._event_publisher.publish_event(event, topic="task_events")
+            event = ProjectUpdatedEvent(
+                project_id=updated_project.id,
+                name=updated_project.name,
+            )
+            await self._event_publisher.publish_event(event, topic="task_events")
 
         return updated_project
 
-    async def delete_project(self, project_id: UUID) -> None:
+    async def delete_project(self, project_id: UUID) -> ProjectPurgeProgress:
         """
         Удалить проект по ID.
 
+        Проект сразу помечается удаленным и пропадает из выдачи, а его задачи
+        вычищаются фоновым воркером пачками. ProjectDeletedEvent публикуется
+        воркером после полного удаления.
+
         :param project_id: ID проекта.
+        :return: Прогресс фонового удаления.
         """
-        # TODO: Возможно, добавить проверку, что нет связанных задач
-        project = await self._project_repo.get_project(project_id)
-        if not project:
+        await self._ensure_owner(project_id)
+        members = await self._project_repo.list_members(project_id)
+        if not await self._project_repo.mark_project_deleted(project_id):
             raise NotFoundError(f"Project with ID {project_id} not found.")
 
-        await self._project_repo.delete_project(project_id)
+        return await self._purge_scheduler.schedule_purge(
+            project_id, (member.user_id for member in members)
+        )
+
+    async def get_deletion_progress(self, project_id: UUID) -> ProjectPurgeProgress:
+        """
+        Получить прогресс фонового удаления проекта.
 
-        event = ProjectDeletedEvent(project_id=project_id, timestamp=datetime.utcnow())
-        await self._event_publisher.publish_event(event, topic="task_events")
+        Доступ проверяется по участникам, сохраненным при постановке удаления:
+        после вычистки проекта его участники в БД уже не хранятся.
 
-        # TODO: Возможно, потребуется дополнительная логика в потребителе для обработки удаления связанных задач и кэша
+        :param project_id: ID проекта.
+        :return: Прогресс удаления.
+        """
+        progress = self._purge_scheduler.get_progress(project_id)
+        if (
+            progress is None
+            or self._access is None
+            or self._access.user_id not in progress.member_ids
+        ):
+            await self._ensure_member(project_id)
+        if not progress:
+            raise NotFoundError(f"No deletion in progress for project {project_id}.")
+        return progress
+
+    async def list_members(self, project_id: UUID) -> List[ProjectMember]:
+        """
+        Участники проекта.
+
+        :param project_id: ID проекта.
+        :return: Список участников.
+        """
+        await self.get_project(project_id)
+        return await self._project_repo.list_members(project_id)
+
+    async def add_member(
+        self, project_id: UUID, user_id: UUID, role: ProjectRole = ProjectRole.MEMBER
+    ) -> ProjectMember:
+        """
+        Добавить участника в проект или изменить его роль. Доступно владельцам.
+
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        :param role: Роль участника.
+        :return: Участник проекта.
+        """
+        await self._ensure_owner(project_id)
+        await self.get_project(project_id)
+        member = await self._project_repo.add_member(project_id, user_id, role)
+        if self._access is not None and user_id == self._access.user_id:
+            self._access.remember(project_id, role)
+        return member
+
+    async def remove_member(self, project_id: UUID, user_id: UUID) -> None:
+        """
+        Исключить участника из проекта. Доступно владельцам.
+
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        """
+        await self._ensure_owner(project_id)
+        if not await self._project_repo.remove_member(project_id, user_id):
+            raise NotFoundError(f"User {user_id} is not a member of project {project_id}.")
+        if self._access is not None and user_id == self._access.user_id:
+            self._access.remember(project_id, None)
@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime, timedelta
+from core.interfaceRepositories.task_irepository import ITaskRepository
+
+
+class TaskArchiveService:
+    """Сервис переноса старых закрытых задач в архив."""
+
+    def __init__(self, task_repo: ITaskRepository):
+        """Инициализация сервиса с зависимостями."""
+        self._task_repo: ITaskRepository = task_repo
+
+    async def archive_closed_tasks(
+        self,
+        older_than: timedelta,
+        batch_size: int,
+        pause_seconds: float = 0.0,
+    ) -> int:
+        """
+        Перенести в архив закрытые задачи, не менявшиеся дольше older_than.
+
+        Задачи переносятся пачками, каждая в отдельной короткой транзакции.
+
+        :param older_than: Минимальный возраст закрытой задачи.
+        :param batch_size: Размер пачки.
+        :param pause_seconds: Пауза между пачками, чтобы не нагружать БД.
+        :return: Количество перенесенных задач.
+        """
+        closed_before = datetime.utcnow() - older_than
+        archived = 0
+        while True:
+            moved = await self._task_repo.archive_closed_tasks(closed_before, batch_size)
+            archived += moved
+            if moved < batch_size:
+                return archived
+            await asyncio.sleep(pause_seconds)
@@ -0,0 +1,163 @@
+import asyncio
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.entites.core_entities import TaskExportFormat
+from core.interfaceRepositories.task_export_ireader import (
+    TASK_EXPORT_COLUMNS,
+    ITaskExportReader,
+)
+from core.services.project_access_service import ProjectAccessService
+
+TASK_EXPORT_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("project_id", pa.string()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("status", pa.string()),
+        ("assignee_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+        ("version", pa.int32()),
+    ]
+)
+
+CONTENT_TYPES = {
+    TaskExportFormat.CSV: "text/csv; charset=utf-8",
+    TaskExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _text_value(value: Any) -> Any:
+    """Значение ячейки для CSV и строковых колонок Parquet."""
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+async def encode_csv(chunks: AsyncIterator[List[Sequence[Any]]]) -> AsyncIterator[bytes]:
+    """CSV с заголовком; одна пачка строк — один фрагмент ответа."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(TASK_EXPORT_COLUMNS)
+    async for rows in chunks:
+        writer.writerows([[_text_value(value) for value in row] for row in rows])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Проект без задач: отдаем хотя бы заголовок
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Приемник байтов для ParquetWriter, отдающий записанное по частям.
+
+    BytesIO с обрезкой не подходит: writer вычисляет смещения страниц через
+    tell(), поэтому позиция должна расти монотонно.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _record_batch(rows: List[Sequence[Any]]) -> pa.RecordBatch:
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(TASK_EXPORT_SCHEMA, columns):
+        if pa.types.is_string(field.type):
+            values = [_text_value(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=TASK_EXPORT_SCHEMA)
+
+
+async def encode_parquet(
+    chunks: AsyncIterator[List[Sequence[Any]]],
+) -> AsyncIterator[bytes]:
+    """Parquet; каждая пачка строк записывается отдельной группой строк.
+    Кодирование и сжатие выполняются в пуле потоков, чтобы не блокировать event loop.
+    """
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, TASK_EXPORT_SCHEMA)
+    try:
+        async for rows in chunks:
+            table = pa.Table.from_batches([_record_batch(rows)])
+            await asyncio.to_thread(writer.write_table, table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        # Закрытие дописывает footer с метаданными групп строк
+        writer.close()
+    yield sink.drain()
+
+
+class TaskExportService:
+    """Сервис потоковой выгрузки задач проекта."""
+
+    def __init__(
+        self,
+        reader: ITaskExportReader,
+        access: Optional[ProjectAccessService] = None,
+        chunk_size: int = 10_000,
+    ):
+        """Инициализация сервиса с зависимостями.
+        :param chunk_size: Количество строк, читаемых и кодируемых за раз;
+            ограничивает память выгрузки независимо от размера проекта.
+        """
+        self._reader: ITaskExportReader = reader
+        self._access: Optional[ProjectAccessService] = access
+        self._chunk_size = chunk_size
+
+    async def export_tasks(
+        self, project_id: UUID, export_format: TaskExportFormat
+    ) -> AsyncIterator[bytes]:
+        """
+        Выгрузить все задачи проекта, включая архивные.
+
+        Доступ проверяется сразу; чтение начинается, когда ответ начнут
+        отправлять клиенту.
+
+        :param project_id: ID проекта.
+        :param export_format: Формат выгрузки.
+        :return: Асинхронный итератор фрагментов файла.
+        :raises PermissionDeniedError: Если пользователь не участник проекта.
+        """
+        if self._access is not None:
+            await self._access.ensure_member(project_id)
+        chunks = self._reader.iter_project_tasks(project_id, self._chunk_size)
+        if export_format == TaskExportFormat.PARQUET:
+            return encode_parquet(chunks)
+        return encode_csv(chunks)
@@ -0,0 +1,306 @@
+import asyncio
+import codecs
+import csv
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+import orjson
+
+from core.entites.core_entities import (
+    TaskImportFormat,
+    TaskImportResult,
+    TaskImportRowError,
+    TaskStatus,
+)
+from core.entites.core_events import TaskCreatedEvent
+from core.exceptions import InvalidRequestError, NotFoundError
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from core.interfaceRepositories.project_irepository import IProjectRepository
+from core.interfaceRepositories.task_bulk_iloader import ITaskBulkLoader
+from core.services.project_access_service import ProjectAccessService
+
+# (номер строки, поля строки, ошибка разбора)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+async def _decoded_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Строки текста из потока байтов; неполная строка ждет следующего фрагмента."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise InvalidRequestError(f"Upload is not valid UTF-8: {e}")
+    if pending:
+        yield pending
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Разбор CSV с заголовком по мере поступления данных.
+
+    Поле в кавычках может содержать переводы строк, поэтому запись считается
+    законченной, когда число кавычек в накопленных строках четное.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    quotes = 0
+    line_number = 0
+    start_line = 0
+    async for line in _decoded_lines(chunks):
+        line_number += 1
+        if not record:
+            start_line = line_number
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        text = "".join(record)
+        record, quotes = [], 0
+
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield start_line, None, f"Malformed CSV: {e}"
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            if "title" not in header:
+                raise InvalidRequestError("CSV header must contain a 'title' column.")
+            continue
+        if len(values) != len(header):
+            yield start_line, None, f"Expected {len(header)} fields, got {len(values)}."
+            continue
+        yield start_line, dict(zip(header, values)), None
+    if record:
+        yield start_line, None, "Unterminated quoted field."
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """Разбор NDJSON: один JSON-объект на строку, пустые строки пропускаются."""
+    line_number = 0
+    async for line in _decoded_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            fields = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(fields, dict):
+            yield line_number, None, "Expected a JSON object."
+            continue
+        yield line_number, fields, None
+
+
+def _text(fields: Dict[str, Any], name: str, strip: bool = True) -> Optional[str]:
+    value = fields.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"'{name}' must be a string.")
+    if strip:
+        value = value.strip()
+    return value or None
+
+
+def _uuid(fields: Dict[str, Any], name: str) -> Optional[UUID]:
+    value = _text(fields, name)
+    if value is None:
+        return None
+    try:
+        return UUID(value)
+    except ValueError:
+        raise ValueError(f"'{name}' is not a valid UUID: {value!r}.")
+
+
+def _timestamp(fields: Dict[str, Any], name: str) -> Optional[datetime]:
+    value = _text(fields, name)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' is not an ISO 8601 timestamp: {value!r}.")
+    # Время в БД хранится в UTC без часового пояса
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def validate_task_row(line: int, fields: Dict[str, Any], now: datetime) -> Tuple:
+    """
+    Проверить строку импорта и привести ее к строке загрузчика.
+
+    Обязателен только title. status принимает значения TaskStatus в любом
+    регистре (по умолчанию todo); id задает идентификатор задачи для
+    повторяемого импорта; created_at/updated_at — время в ISO 8601.
+
+    :raises ValueError: С описанием ошибки для отчета об импорте.
+    """
+    title = _text(fields, "title")
+    if title is None:
+        raise ValueError("'title' is required.")
+    status_value = _text(fields, "status")
+    try:
+        status = TaskStatus(status_value.lower()) if status_value else TaskStatus.TODO
+    except ValueError:
+        raise ValueError(f"Unknown status {status_value!r}.")
+    created_at = _timestamp(fields, "created_at") or now
+    return (
+        line,
+        _uuid(fields, "id") or uuid4(),
+        title,
+        _text(fields, "description", strip=False),
+        status.name,
+        _uuid(fields, "assignee_id"),
+        created_at,
+        _timestamp(fields, "updated_at") or now,
+    )
+
+
+class _ImportLog:
+    """Счетчики и ошибки импорта; сохраняются только первые max_errors ошибок."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.error_count = 0
+        self.errors: List[TaskImportRowError] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(TaskImportRowError(line=line, message=message))
+
+
+class TaskImportService:
+    """Сервис массового импорта задач из CSV и NDJSON."""
+
+    def __init__(
+        self,
+        loader: ITaskBulkLoader,
+        project_repo: IProjectRepository,
+        event_publisher: IEventPublisher,
+        access: Optional[ProjectAccessService] = None,
+        batch_size: int = 5000,
+        max_rows: int = 1_000_000,
+        max_reported_errors: int = 1000,
+        event_batch_size: int = 500,
+    ):
+        """Инициализация сервиса с зависимостями.
+        :param batch_size: Строк в одной пачке COPY; ограничивает память импорта.
+        :param max_rows: Максимальное число строк в одном файле.
+        :param max_reported_errors: Сколько ошибок строк вернуть в отчете.
+        :param event_batch_size: Сколько событий публикуется одновременно.
+        """
+        self._loader: ITaskBulkLoader = loader
+        self._project_repo: IProjectRepository = project_repo
+        self._event_publisher: IEventPublisher = event_publisher
+        self._access: Optional[ProjectAccessService] = access
+        self._batch_size = batch_size
+        self._max_rows = max_rows
+        self._max_reported_errors = max_reported_errors
+        self._event_batch_size = event_batch_size
+
+    async def import_tasks(
+        self,
+        project_id: UUID,
+        chunks: AsyncIterator[bytes],
+        import_format: TaskImportFormat,
+    ) -> TaskImportResult:
+        """
+        Импортировать задачи в проект из потока байтов.
+
+        Строки проверяются по мере чтения и загружаются пачками; некорректные
+        строки пропускаются и попадают в отчет. Все корректные строки
+        вставляются одной транзакцией, события TaskCreatedEvent публикуются
+        после ее фиксации.
+
+        :param project_id: ID проекта.
+        :param chunks: Содержимое файла фрагментами.
+        :param import_format: Формат файла.
+        :return: Отчет об импорте.
+        :raises NotFoundError: Если проект не найден.
+        :raises InvalidRequestError: Если файл нельзя разобрать целиком
+            или в нем больше max_rows строк.
+        """
+        if self._access is not None:
+            await self._access.ensure_member(project_id)
+        if not await self._project_repo.get_project(project_id):
+            raise NotFoundError(f"Project with ID {project_id} not found")
+
+        parser = parse_ndjson if import_format == TaskImportFormat.NDJSON else parse_csv
+        log = _ImportLog(self._max_reported_errors)
+        load = await self._loader.load(project_id, self._batches(parser(chunks), log))
+        for line, task_id in load.conflicts:
+            log.add_error(line, f"Task id {task_id} is already used in another project.")
+        events_failed = await self._publish_created(project_id, load.inserted)
+
+        return TaskImportResult(
+            project_id=project_id,
+            received=log.received,
+            imported=len(load.inserted),
+            duplicates=load.staged - len(load.inserted) - len(load.conflicts),
+            error_count=log.error_count,
+            errors=log.errors,
+            events_failed=events_failed,
+        )
+
+    async def _batches(
+        self, rows: AsyncIterator[Tuple], log: _ImportLog
+    ) -> AsyncIterator[List[Sequence[Any]]]:
+        now = datetime.utcnow()
+        batch: List[Sequence[Any]] = []
+        async for line, fields, error in rows:
+            log.received += 1
+            if log.received > self._max_rows:
+                raise InvalidRequestError(f"Import is limited to {self._max_rows} rows.")
+            if error is None:
+                try:
+                    batch.append(validate_task_row(line, fields, now))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                log.add_error(line, error)
+                continue
+            if len(batch) >= self._batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _publish_created(
+        self, project_id: UUID, inserted: List[Tuple[UUID, str, TaskStatus]]
+    ) -> int:
+        """Опубликовать TaskCreatedEvent пачками; возвращает число неудачных публикаций.
+        Задачи к этому моменту уже сохранены, поэтому сбой брокера не прерывает импорт.
+        """
+        failed = 0
+        for start in range(0, len(inserted), self._event_batch_size):
+            results = await asyncio.gather(
+                *(
+                    self._event_publisher.publish_event(
+                        TaskCreatedEvent(
+                            task_id=task_id,
+                            project_id=project_id,
+                            title=title,
+                            status=status,
+                        ),
+                        topic="task_events",
+                    )
+                    for task_id, title, status in inserted[start : start + self._event_batch_size]
+                ),
+                return_exceptions=True,
+            )
+            failed += sum(isinstance(result, Exception) for result in results)
+        return failed
@@ -1,16 +1,34 @@
-from typing import List, Optional, Dict, Any
+import base64
+from contextlib import nullcontext
+from typing import AsyncContextManager, List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from core.entites.core_entities import Task, TaskStatus
+import orjson
+from core.entites.core_entities import (
+    Task,
+    TaskSearchPage,
+    TaskStatus,
+    TaskStatusTransition,
+)
 from core.entites.core_events import (
     TaskCreatedEvent,
     TaskStatusChangedEvent,
     TaskDeletedEvent,
+    TaskUpdatedEvent,
 )
 from core.interfaceRepositories.task_irepository import ITaskRepository
 
 from core.interfaceRepositories import IProjectRepository
 from core.interfaceRepositories.event_ipublisher import IEventPublisher
-from datetime import datetime
+from core.interfaceRepositories.unit_of_work_i import IUnitOfWork
+from core.exceptions import (
+    ConflictError,
+    InvalidRequestError,
+    NotFoundError,
+    PreconditionFailedError,
+)
+from core.services.batch_loader import BatchLoader
+from core.services.project_access_service import ProjectAccessService
+from datetime import datetime, timezone
 
 
 class TaskService:
@@ -21,11 +39,51 @@ class TaskService:
         task_repo: ITaskRepository,
         project_repo: IProjectRepository,
         event_publisher: IEventPublisher,
+        access: Optional[ProjectAccessService] = None,
+        task_loader: Optional[BatchLoader[UUID, Task]] = None,
+        uow: Optional[IUnitOfWork] = None,
     ):
-        """Инициализация сервиса с зависимостями."""
+        """Инициализация сервиса с зависимостями.
+        Без access (внутренние вызовы) проверки доступа не выполняются.
+        task_loader объединяет чтения задач по ID из конкурентных запросов в пакеты.
+        С uow изменение и его событие фиксируются одной транзакцией (outbox).
+        """
         self._task_repo: ITaskRepository = task_repo
         self._project_repo: IProjectRepository = project_repo
         self._event_publisher: IEventPublisher = event_publisher
+        self._access: Optional[ProjectAccessService] = access
+        self._task_loader: Optional[BatchLoader[UUID, Task]] = task_loader
+        self._uow: Optional[IUnitOfWork] = uow
+
+    def _transaction(self) -> AsyncContextManager[None]:
+        return self._uow.transaction() if self._uow is not None else nullcontext()
+
+    async def _ensure_member(self, project_id: UUID) -> None:
+        if self._access is not None:
+            await self._access.ensure_member(project_id)
+
+    async def _authorize_task(
+        self, task_id: UUID, project_id: Optional[UUID]
+    ) -> Optional[UUID]:
+        """
+        Проверить доступ к задаче перед изменением.
+
+        Если клиент передал project_id, задача не читается: роль берется из
+        загруженных за запрос, а project_id ограничивает сам UPDATE. Иначе
+        проект задачи определяется дополнительным чтением.
+
+        :return: ID проекта задачи, если он известен.
+        :raises NotFoundError: Если задача не найдена.
+        """
+        if self._access is None or self._access.is_superuser:
+            return project_id
+        if project_id is None:
+            task = await self._task_repo.get_task(task_id)
+            if task is None:
+                raise NotFoundError(f"Task with ID {task_id} not found")
+            project_id = task.project_id
+        await self._access.ensure_member(project_id)
+        return project_id
 
     async def create_task(
         self,
@@ -45,6 +103,7 @@ class TaskService:
         :param assignee_id: ID назначенного пользователя (опционально).
         :return: Созданный объект Task.
         """
+        await self._ensure_member(project_id)
         project = await self._project_repo.get_project(project_id)
         if not project:
             raise ValueError(f"Project with ID {project_id} not found")
@@ -57,27 +116,86 @@ class TaskService:
             assignee_id=assignee_id,
         )
 
-        task = await self._task_repo.create_task(new_task_data)
+        async with self._transaction():
+            task = await self._task_repo.create_task(new_task_data)
 
-        event = TaskCreatedEvent(
-            task_id=task.id,
-            project_id=task.project_id,
-            title=task.title,
-            status=task.status,
-            timestamp=datetime.utcnow(),
-        )
-        await self._event_publisher.publish_event(event, topic="task_events")
+            event = TaskCreatedEvent(
+                task_id=task.id,
+                project_id=task.project_id,
+                title=task.title,
+                status=task.status,
+                timestamp=datetime.utcnow(),
+            )
+            await self._event_publisher.publish_event(event, topic="task_events")
 
         return task
 
-    async def get_task(self, task_id: UUID) -> Optional[Task]:
+    async def get_task(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Task]:
         """
         Получить задачу по ID.
 
         :param task_id: ID задачи.
+        :param project_id: ID проекта (опционально); сужает поиск до одной секции.
         :return: Объект Task или None, если не найден.
         """
-        return await self._task_repo.get_task(task_id)
+        if project_id is not None:
+            await self._ensure_member(project_id)
+            return await self._task_repo.get_task(task_id, project_id)
+        if self._task_loader is not None:
+            task = await self._task_loader.load(task_id)
+        else:
+            task = await self._task_repo.get_task(task_id)
+        if task is not None:
+            await self._ensure_member(task.project_id)
+        return task
+
+    async def get_tasks(self, task_ids: List[UUID]) -> List[Task]:
+        """
+        Получить задачи по списку ID.
+
+        Задачи читаются одним запросом (через task_loader — общим пакетом
+        с конкурентными запросами). Задачи проектов, где пользователь не
+        участник, не возвращаются, как и ненайденные.
+
+        :param task_ids: ID задач; повторы игнорируются.
+        :return: Найденные задачи в порядке task_ids.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        if self._task_loader is not None:
+            tasks = [task for task in await self._task_loader.load_many(task_ids) if task]
+        else:
+            by_id = {task.id: task for task in await self._task_repo.get_tasks_by_ids(task_ids)}
+            tasks = [by_id[task_id] for task_id in task_ids if task_id in by_id]
+        if self._access is None:
+            return tasks
+        allowed = await self._access.member_project_ids()
+        if allowed is None:
+            return tasks
+        allowed_ids = set(allowed)
+        return [task for task in tasks if task.project_id in allowed_ids]
+
+    async def get_task_last_modified(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> datetime:
+        """
+        Время последнего изменения задачи для условных запросов.
+
+        :param task_id: ID задачи.
+        :param project_id: ID проекта (опционально); сужает поиск до одной секции.
+        :return: updated_at задачи.
+        :raises NotFoundError: Если задача не найдена.
+        """
+        if project_id is not None:
+            await self._ensure_member(project_id)
+        stamp = await self._task_repo.get_task_timestamp(task_id, project_id)
+        if stamp is None:
+            raise NotFoundError(f"Task with ID {task_id} not found")
+        task_project_id, updated_at = stamp
+        if project_id is None:
+            await self._ensure_member(task_project_id)
+        return updated_at
 
     async def list_tasks_by_project(
         self,
@@ -91,12 +209,14 @@ class TaskService:
         Список задач по проекту (с опциональной фильтрацией, пагинацией и сортировкой).
 
         :param project_id: ID проекта.
-        :param status: Фильтр по статусу (опционально).
+        :param status: Фильтр по статусу (опционально). Без фильтра и при
+            status=CLOSED в выборку входят и архивные задачи.
         :param limit: Максимальное количество задач.
         :param offset: Смещение.
         :param order_by: Поле для сортировки (например, "created_at", "status").
         :return: Список объектов Task.
         """
+        await self._ensure_member(project_id)
         return await self._task_repo.list_tasks(
             project_id=project_id,
             status=status,
@@ -105,8 +225,99 @@ class TaskService:
             order_by=order_by,
         )
 
+    async def list_status_history(
+        self,
+        project_id: UUID,
+        since: datetime,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[TaskStatusTransition]:
+        """
+        История смен статусов задач проекта за период.
+
+        :param project_id: ID проекта.
+        :param since: Начало периода (включительно).
+        :param until: Конец периода (не включительно), по умолчанию — текущий момент.
+        :param limit: Максимальное количество переходов (опционально).
+        :return: Переходы в порядке времени.
+        """
+        since = self._to_naive_utc(since)
+        until = self._to_naive_utc(until) if until else datetime.utcnow()
+        if since >= until:
+            raise InvalidRequestError("'since' must be earlier than 'until'.")
+        await self._ensure_member(project_id)
+        return await self._task_repo.list_status_transitions(
+            project_id, since, until, limit
+        )
+
+    async def search_tasks(
+        self,
+        query: str,
+        project_id: Optional[UUID] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> TaskSearchPage:
+        """
+        Полнотекстовый поиск задач по заголовку и описанию.
+
+        :param query: Поисковый запрос.
+        :param project_id: Ограничить поиск проектом (опционально).
+        :param limit: Размер страницы.
+        :param cursor: Курсор из предыдущей страницы (опционально).
+        :return: Страница результатов с курсором на следующую.
+        """
+        query = query.strip()
+        if not query:
+            raise InvalidRequestError("Search query must not be empty.")
+
+        if project_id is not None:
+            await self._ensure_member(project_id)
+            project_ids = [project_id]
+        elif self._access is not None:
+            # Без проекта ищем по всем проектам пользователя (None — без ограничений)
+            project_ids = await self._access.member_project_ids()
+        else:
+            project_ids = None
+
+        hits = await self._task_repo.search_tasks(
+            query=query,
+            limit=limit,
+            project_ids=project_ids,
+            after=self._decode_search_cursor(cursor) if cursor else None,
+        )
+        next_cursor = None
+        if len(hits) == limit:
+            last = hits[-1]
+            next_cursor = self._encode_search_cursor(last.rank, last.task.id)
+        return TaskSearchPage(items=hits, next_cursor=next_cursor)
+
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        """Время в БД хранится в UTC без часового пояса."""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def _encode_search_cursor(rank: float, task_id: UUID) -> str:
+        raw = orjson.dumps([rank, str(task_id)])
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode_search_cursor(cursor: str) -> Tuple[float, UUID]:
+        try:
+            rank, task_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return float(rank), UUID(task_id)
+        except (ValueError, TypeError) as e:
+            raise InvalidRequestError(f"Invalid search cursor: {e}")
+
     async def update_task(
-        self, task_id: UUID, update_data: Dict[str, Any]
+        self,
+        task_id: UUID,
+        update_data: Dict[str, Any],
+        project_id: Optional[UUID] = None,
+        expected_version: Optional[int] = None,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Task]:
         """
         Обновить задачу по ID с частичными данными.
@@ -115,58 +326,100 @@ class TaskService:
 
         :param task_id: ID задачи.
         :param update_data: Словарь с данными для обновления (например, {"description": "New description"}).
+        :param project_id: ID проекта (опционально); сужает поиск до одной секции.
+        :param expected_version: Версия задачи, которую видел клиент (опционально).
+        :param expected_updated_at: Время изменения задачи, которое видел клиент (If-Match).
         :return: Обновленный объект Task или None, если задача не найдена.
+        :raises ConflictError: Если задача была изменена после чтения клиентом
+            или находится в архиве.
+        :raises PreconditionFailedError: Если не выполнено условие If-Match.
         """
         # TODO: Добавить логику валидации update_data
-        # TODO: Добавить проверку прав пользователя на редактирование задачи
+        project_id = await self._authorize_task(task_id, project_id)
 
-        # Получаем текущее состояние для сравнения, если это нужно для определения события
-        current_task = await self._task_repo.get_task(task_id)
-        if not current_task:
-            return None
-
-        # Обновляем в БД
-        updated_task = await self._task_repo.update_task(task_id, update_data)
-
-        if updated_task:
-            # TODO: Определить, какие поля изменились, и публиковать TaskUpdatedEvent, если нужно
-            # Например:
-            # changed_fields = {k: v for k, v in update_data.items() if getattr(current_task, k, None) != v}
-            # if changed_fields:
-            #    event = TaskUpdatedEvent(...) # Создать TaskUpdatedEvent
-            #    await self._event_publisher.publish(event, topic="task_events")
-            pass  # Пока не публикуем общий TaskUpdatedEvent для простоты
+        async with self._transaction():
+            updated_task = await self._task_repo.update_task(
+                task_id, update_data, project_id, expected_version, expected_updated_at
+            )
+            if updated_task is None and await self._task_repo.is_task_archived(
+                task_id, project_id
+            ):
+                raise ConflictError(f"Task {task_id} is archived and cannot be changed.")
+            conditional = expected_version is not None or expected_updated_at is not None
+            if updated_task is None and conditional:
+                # Отличаем конфликт версий от отсутствующей задачи только на пути неудачи
+                current = await self._task_repo.get_task(task_id, project_id)
+                if current and expected_updated_at is not None and (
+                    current.updated_at != expected_updated_at
+                ):
+                    raise PreconditionFailedError(
+                        f"Task {task_id} was modified after it was read."
+                    )
+                if current:
+                    raise ConflictError(
+                        f"Task {task_id} was modified concurrently (expected version {expected_version})."
+                    )
+
+            if updated_task:
+                # Событие сбрасывает кэши задачи и списков проекта в других экземплярах
+                event = TaskUpdatedEvent(
+                    task_id=updated_task.id,
+                    project_id=updated_task.project_id,
+                    title=updated_task.title,
+                    status=updated_task.status,
+                    timestamp=datetime.utcnow(),
+                )
+                await self._event_publisher.publish_event(event, topic="task_events")
 
         return updated_task
 
     async def change_task_status(
-        self, task_id: UUID, new_status: TaskStatus
-    ) -> Optional[Task]:
+        self,
+        task_id: UUID,
+        new_status: TaskStatus,
+        expected_status: Optional[TaskStatus] = None,
+        project_id: Optional[UUID] = None,
+    ) -> Task:
         """
         Изменить статус задачи.
 
-        Это специфическая операция обновления, которая гарантированно публикует событие.
+        Смена выполняется одним условным UPDATE без предварительного чтения.
+        Событие публикуется только тем вызовом, который действительно изменил
+        статус, поэтому конкурентные смены не дублируют события.
 
         :param task_id: ID задачи.
         :param new_status: Новый статус задачи.
-        :return: Обновленный объект Task или None, если задача не найдена.
-        :raises ValueError: Если статус переход недопустим.
+        :param expected_status: Текущий статус, который ожидает клиент (опционально).
+        :param project_id: ID проекта (опционально); сужает поиск до одной секции.
+        :return: Обновленный объект Task.
+        :raises NotFoundError: Если задача не найдена.
+        :raises ConflictError: Если текущий статус не совпал с expected_status.
         """
-
-        task = await self._task_repo.get_task(task_id)
-        if not task:
-            raise ValueError(f"Task with ID {task_id} not found")
-
-        old_status = task.status
-        if old_status == new_status:
-            return task
-
-        updated_task = await self._task_repo.update_task(
-            task_id, {"status": new_status}
-        )
-
-        if updated_task:
+        project_id = await self._authorize_task(task_id, project_id)
+        async with self._transaction():
+            changed = await self._task_repo.change_task_status(
+                task_id, new_status, expected_status, project_id
+            )
+            if changed is None:
+                task = await self._task_repo.get_task(task_id, project_id)
+                if task is None:
+                    raise NotFoundError(f"Task with ID {task_id} not found")
+                if task.status == new_status:
+                    # Статус уже установлен (в том числе повтор запроса): события нет
+                    return task
+                if await self._task_repo.is_task_archived(task_id, project_id):
+                    raise ConflictError(f"Task {task_id} is archived and cannot be changed.")
+                if expected_status is None:
+                    # Статус сменили конкурентно между UPDATE и чтением
+                    raise ConflictError(f"Task {task_id} status was changed concurrently.")
+                raise ConflictError(
+                    f"Task {task_id} status is '{task.status.value}', "
+                    f"expected '{expected_status.value}'."
+                )
+
+            old_status, updated_task = changed
             event = TaskStatusChangedEvent(
+                task_id=updated_task.id,
                 project_id=updated_task.project_id,
                 old_status=old_status,
                 new_status=updated_task.status,
@@ -177,26 +430,28 @@ class TaskService:
 
         return updated_task
 
-    async def delete_task(self, task_id: UUID) -> None:
+    async def delete_task(self, task_id: UUID, project_id: Optional[UUID] = None) -> None:
         """
         Удалить задачу по ID.
 
         :param task_id: ID задачи.
+        :param project_id: ID проекта (опционально); сужает поиск до одной секции.
         """
-        # TODO: Добавить проверку прав пользователя на удаление задачи
         # TODO: Возможно, сначала получить задачу, чтобы получить project_id для события
 
-        task_to_delete = await self._task_repo.get_task(task_id)
+        task_to_delete = await self._task_repo.get_task(task_id, project_id)
         if not task_to_delete:
-            raise ValueError(f"Task with ID {task_id} not found")
+            raise NotFoundError(f"Task with ID {task_id} not found")
+        await self._ensure_member(task_to_delete.project_id)
 
-        await self._task_repo.delete_task(task_id)
+        async with self._transaction():
+            await self._task_repo.delete_task(task_id, task_to_delete.project_id)
 
-        event = TaskDeletedEvent(
-            task_id=task_to_delete.uuid,
-            project_id=task_to_delete.project_id,
-            timestamp=datetime.utcnow(),
-        )
-        await self._event_publisher.publish_event(event, topic="task_events")
+            event = TaskDeletedEvent(
+                task_id=task_to_delete.id,
+                project_id=task_to_delete.project_id,
+                timestamp=datetime.utcnow(),
+            )
+            await self._event_publisher.publish_event(event, topic="task_events")
 
         # TODO: Возможно, потребуется дополнительная логика в потребителе для обработки удаления связанных комментариев и кэша
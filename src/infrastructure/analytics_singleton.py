@@ -0,0 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from core.services.project_analytics_service import ProjectAnalyticsCache
+from infrastructure.event_publisher_singleton import event_publisher
+from settings import get_settings
+
+config = get_settings()
+
+# NumPy отпускает GIL в векторных операциях, поэтому потоков достаточно:
+# столбцы не нужно сериализовать для передачи в другой процесс
+analytics_executor = ThreadPoolExecutor(
+    max_workers=config.analytics_workers, thread_name_prefix="analytics"
+)
+project_analytics_cache = ProjectAnalyticsCache(
+    max_projects=config.analytics_cache_max_projects,
+    ttl_seconds=config.analytics_cache_ttl_seconds,
+)
+event_publisher.add_listener(project_analytics_cache.on_event)
@@ -0,0 +1,215 @@
+import copy
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+from uuid import UUID
+
+import orjson
+
+from core.entites.core_entities import Project, Task, TaskStatus
+from infrastructure.cache.redis_tier import RedisCacheTier
+from infrastructure.cache.ttl_cache import TTLCache
+from logger import get_logger
+from metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+cache_hits = metrics.counter("cache_hits_total", "Попадания в кэш сущностей по уровням.")
+cache_misses = metrics.counter("cache_misses_total", "Промахи кэша сущностей (чтение из БД).")
+cache_invalidations = metrics.counter(
+    "cache_invalidations_total", "Сброшенные записи кэша сущностей."
+)
+cache_errors = metrics.counter("cache_errors_total", "Ошибки уровня кэша Redis.")
+cache_entries = metrics.gauge("cache_entries", "Записей в локальном кэше сущностей.")
+cache_hit_ratio = metrics.gauge(
+    "cache_hit_ratio", "Доля чтений сущностей, обслуженных кэшем."
+)
+
+Entity = TypeVar("Entity")
+
+
+def _optional_uuid(value: Optional[str]) -> Optional[UUID]:
+    return UUID(value) if value is not None else None
+
+
+def _optional_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def encode_task(task: Task) -> bytes:
+    return orjson.dumps(task)
+
+
+def decode_task(data: bytes) -> Task:
+    fields: Dict[str, Any] = orjson.loads(data)
+    return Task(
+        id=UUID(fields["id"]),
+        project_id=UUID(fields["project_id"]),
+        title=fields["title"],
+        description=fields["description"],
+        status=TaskStatus(fields["status"]),
+        assignee_id=_optional_uuid(fields["assignee_id"]),
+        version=fields["version"],
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        updated_at=datetime.fromisoformat(fields["updated_at"]),
+    )
+
+
+def encode_project(project: Project) -> bytes:
+    # Статистика задач меняется с каждой задачей и в кэш не попадает
+    return orjson.dumps(
+        {
+            "id": project.id,
+            "name": project.name,
+            "description": project.description,
+            "deleted_at": project.deleted_at,
+            "created_at": project.created_at,
+            "updated_at": project.updated_at,
+        }
+    )
+
+
+def decode_project(data: bytes) -> Project:
+    fields: Dict[str, Any] = orjson.loads(data)
+    return Project(
+        id=UUID(fields["id"]),
+        name=fields["name"],
+        description=fields["description"],
+        deleted_at=_optional_datetime(fields["deleted_at"]),
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        updated_at=datetime.fromisoformat(fields["updated_at"]),
+    )
+
+
+class EntityCache(Generic[Entity]):
+    """
+    Двухуровневый кэш сущностей по ID: локальный TTLCache и, опционально, Redis.
+
+    Локальный уровень хранит копии сущностей и отдает копии, чтобы изменение
+    полученного объекта вызывающим кодом не попадало в кэш. Запись с меньшей
+    версией не вытесняет более новую: чтение, начатое до обновления, не вернет
+    в кэш старое значение. Ошибки Redis считаются промахом и не прерывают запрос.
+    С group сущности объединяются в группы (задачи проекта), которые
+    invalidate_group сбрасывает целиком на обоих уровнях.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local: TTLCache,
+        encode: Callable[[Entity], bytes],
+        decode: Callable[[bytes], Entity],
+        version: Callable[[Entity], Any],
+        redis: Optional[RedisCacheTier] = None,
+        group: Optional[Callable[[Entity], Any]] = None,
+    ):
+        """
+        :param name: Имя кэша: пространство ключей Redis и метка метрик.
+        :param local: Локальный уровень.
+        :param encode: Сериализация сущности для Redis.
+        :param decode: Десериализация сущности из Redis.
+        :param version: Версия сущности для сравнения при записи.
+        :param redis: Общий уровень Redis (опционально).
+        :param group: Ключ группы сущности для invalidate_group (опционально).
+        """
+        self.name = name
+        self._local = local
+        self._encode = encode
+        self._decode = decode
+        self._version = version
+        self._redis = redis
+        self._group = group
+        cache_entries.set_function(lambda: len(self._local), cache=name)
+        cache_hit_ratio.set_function(self.hit_ratio, cache=name)
+
+    def hit_ratio(self) -> float:
+        hits = cache_hits.value(cache=self.name, tier="local") + cache_hits.value(
+            cache=self.name, tier="redis"
+        )
+        total = hits + cache_misses.value(cache=self.name)
+        return hits / total if total else 0.0
+
+    async def get(self, key: UUID) -> Optional[Entity]:
+        entity = self._local.get(key)
+        if entity is not None:
+            cache_hits.inc(cache=self.name, tier="local")
+            return copy.copy(entity)
+        if self._redis is not None:
+            data = await self._redis_call(self._redis.get, self.name, str(key))
+            if data is not None:
+                entity = self._decode(data)
+                self._local.set(key, entity)
+                cache_hits.inc(cache=self.name, tier="redis")
+                return copy.copy(entity)
+        cache_misses.inc(cache=self.name)
+        return None
+
+    async def fill(self, key: UUID, entity: Entity) -> None:
+        """Сохранить сущность, прочитанную из БД после промаха.
+        В Redis значение записывается только при отсутствии ключа: запись
+        после обновления (put) важнее прочитанной ранее копии.
+        """
+        if self._store_local(key, entity) and self._redis is not None:
+            await self._redis_call(
+                self._redis.set,
+                self.name,
+                str(key),
+                self._encode(entity),
+                True,
+                self._group_of(entity),
+            )
+
+    async def put(self, key: UUID, entity: Entity) -> None:
+        """Сохранить сущность после изменения в БД (write-through)."""
+        if self._store_local(key, entity) and self._redis is not None:
+            await self._redis_call(
+                self._redis.set,
+                self.name,
+                str(key),
+                self._encode(entity),
+                False,
+                self._group_of(entity),
+            )
+
+    async def invalidate(self, key: UUID) -> None:
+        """Сбросить сущность на всех уровнях."""
+        self.evict_local(key)
+        if self._redis is not None:
+            await self._redis_call(self._redis.delete, self.name, str(key))
+
+    async def invalidate_group(self, group: Any) -> None:
+        """Сбросить все сущности группы на всех уровнях."""
+        self.evict_local_where(lambda entity: self._group_of(entity) == str(group))
+        if self._redis is not None:
+            await self._redis_call(self._redis.delete_group, self.name, str(group))
+
+    def evict_local(self, key: UUID) -> None:
+        """Сбросить сущность в локальном уровне (по событию от другого экземпляра)."""
+        if self._local.delete(key):
+            cache_invalidations.inc(cache=self.name)
+
+    def evict_local_where(self, predicate: Callable[[Entity], bool]) -> None:
+        evicted = self._local.delete_where(predicate)
+        if evicted:
+            cache_invalidations.inc(evicted, cache=self.name)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    def _group_of(self, entity: Entity) -> Optional[str]:
+        return str(self._group(entity)) if self._group is not None else None
+
+    def _store_local(self, key: UUID, entity: Entity) -> bool:
+        cached = self._local.get(key)
+        if cached is not None and self._version(cached) > self._version(entity):
+            return False
+        self._local.set(key, copy.copy(entity))
+        return True
+
+    async def _redis_call(self, method: Callable, *args: Any) -> Any:
+        try:
+            return await method(*args)
+        except Exception as e:
+            cache_errors.inc(cache=self.name, tier="redis")
+            logger.warning(f"Redis cache {self.name} error: {e}")
+            return None
@@ -0,0 +1,64 @@
+from typing import Optional
+
+
+class RedisCacheTier:
+    """
+    Общий для всех экземпляров сервиса уровень кэша в Redis.
+
+    Значения хранятся байтами с временем жизни ttl_seconds под ключами
+    с префиксом prefix. Ключи можно объединять в группы (например, задачи
+    одного проекта): группа — множество Redis с именами ключей, по которому
+    delete_group удаляет их все сразу.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "taskflow:cache:"):
+        # Redis нужен только при заданном REDIS_URL, поэтому импорт отложен
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+        self._prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return await self._client.get(self._key(namespace, key))
+
+    def _group_key(self, namespace: str, group: str) -> str:
+        return f"{self._prefix}{namespace}:group:{group}"
+
+    async def set(
+        self,
+        namespace: str,
+        key: str,
+        data: bytes,
+        only_if_absent: bool = False,
+        group: Optional[str] = None,
+    ) -> None:
+        """Записать значение; only_if_absent не перезаписывает существующее (SET NX).
+        С group ключ добавляется в группу; группа живет не меньше своих ключей.
+        """
+        if group is None:
+            await self._client.set(
+                self._key(namespace, key), data, ex=self._ttl_seconds, nx=only_if_absent
+            )
+            return
+        group_key = self._group_key(namespace, group)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(namespace, key), data, ex=self._ttl_seconds, nx=only_if_absent)
+            pipe.sadd(group_key, self._key(namespace, key))
+            pipe.expire(group_key, self._ttl_seconds)
+            await pipe.execute()
+
+    async def delete(self, namespace: str, key: str) -> None:
+        await self._client.delete(self._key(namespace, key))
+
+    async def delete_group(self, namespace: str, group: str) -> None:
+        """Удалить все ключи группы и саму группу."""
+        group_key = self._group_key(namespace, group)
+        keys = await self._client.smembers(group_key)
+        await self._client.delete(group_key, *keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,99 @@
+import itertools
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from infrastructure.cache.ttl_cache import TTLCache
+from metrics import get_metrics
+
+metrics = get_metrics()
+response_cache_hits = metrics.counter(
+    "response_cache_hits_total", "Ответы, отданные из кэша готовых ответов."
+)
+response_cache_misses = metrics.counter(
+    "response_cache_misses_total", "Ответы, собранные заново при промахе кэша."
+)
+response_cache_bumps = metrics.counter(
+    "response_cache_version_bumps_total", "Увеличения версии проекта в кэше ответов."
+)
+
+
+class ProjectVersionedResponseCache:
+    """
+    Кэш сериализованных ответов, привязанных к версии проекта.
+
+    Ключ записи — (ID проекта, версия проекта, нормализованные параметры
+    запроса). Любая запись в задачи проекта увеличивает его версию, после
+    чего старые записи становятся недостижимы и вытесняются по LRU/TTL —
+    перебирать их при сбросе не нужно. Ответ, собранный во время записи,
+    сохраняется под версией, прочитанной до запроса в БД, и после увеличения
+    версии не отдается.
+
+    Версии выдаются из общего для кэша счетчика: если версия проекта вытеснена
+    из таблицы версий, проект получает новую, еще не использованную версию,
+    а не начинает отсчет заново.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float, max_projects: int):
+        """
+        :param name: Имя кэша для метрик.
+        :param max_entries: Максимум хранимых ответов.
+        :param ttl_seconds: Время жизни ответа; ограничивает устаревание при пропуске событий.
+        :param max_projects: Максимум проектов в таблице версий.
+        """
+        self.name = name
+        self._responses: TTLCache[bytes] = TTLCache(max_entries, ttl_seconds)
+        self._versions: "OrderedDict[UUID, int]" = OrderedDict()
+        self._max_projects = max_projects
+        self._sequence = itertools.count(1)
+
+    def version(self, project_id: UUID) -> int:
+        version = self._versions.get(project_id)
+        if version is None:
+            return self._assign_version(project_id)
+        self._versions.move_to_end(project_id)
+        return version
+
+    def bump(self, project_id: UUID) -> None:
+        """Сделать недостижимыми все сохраненные ответы проекта."""
+        self._assign_version(project_id)
+        response_cache_bumps.inc(cache=self.name)
+
+    @staticmethod
+    def key(project_id: UUID, version: int, **params: Any) -> Tuple[Hashable, ...]:
+        """Ключ записи; параметры сортируются, None не отличается от отсутствия."""
+        return (
+            project_id,
+            version,
+            tuple(sorted((name, value) for name, value in params.items() if value is not None)),
+        )
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[bytes]:
+        body = self._responses.get(key)
+        if body is None:
+            response_cache_misses.inc(cache=self.name)
+        else:
+            response_cache_hits.inc(cache=self.name)
+        return body
+
+    def put(self, key: Tuple[Hashable, ...], body: bytes) -> None:
+        self._responses.set(key, body)
+
+    def on_event(self, event: Any, topic: str) -> None:
+        """Слушатель событий, опубликованных этим экземпляром."""
+        project_id = getattr(event, "project_id", None)
+        if project_id is not None:
+            self.bump(project_id)
+
+    def on_message(self, event: Dict[str, Any]) -> None:
+        """Обработчик событий из брокера, в том числе от других экземпляров."""
+        if event.get("project_id") is not None:
+            self.bump(UUID(event["project_id"]))
+
+    def _assign_version(self, project_id: UUID) -> int:
+        version = next(self._sequence)
+        self._versions[project_id] = version
+        self._versions.move_to_end(project_id)
+        while len(self._versions) > self._max_projects:
+            self._versions.popitem(last=False)
+        return version
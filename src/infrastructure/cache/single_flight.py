@@ -0,0 +1,106 @@
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from metrics import get_metrics
+
+metrics = get_metrics()
+flight_calls = metrics.counter(
+    "singleflight_calls_total", "Чтения, выполненные в БД через слой объединения запросов."
+)
+flight_coalesced = metrics.counter(
+    "singleflight_coalesced_total", "Чтения, получившие результат уже выполняющегося запроса."
+)
+flight_inflight = metrics.gauge(
+    "singleflight_inflight", "Выполняющиеся в данный момент объединяемые чтения."
+)
+
+Result = TypeVar("Result")
+
+
+class SingleFlight(Generic[Result]):
+    """
+    Объединение одинаковых конкурентных чтений в пределах процесса.
+
+    Первый вызов с ключом выполняет запрос, остальные вызовы с тем же ключом,
+    пришедшие до его завершения, ждут и получают тот же результат (или ту же
+    ошибку). Завершенные результаты не хранятся: это не кэш, а защита пула
+    соединений от одновременных одинаковых запросов.
+
+    Отмена первого вызова (например, при разрыве соединения клиентом) не
+    отменяет ожидающих: они выполняют запрос самостоятельно. Используется
+    только из потока event loop, поэтому блокировки не нужны.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        clone: Optional[Callable[[Result], Result]] = None,
+        max_tracked_keys: int = 1024,
+    ):
+        """
+        :param name: Имя для метрик.
+        :param clone: Копирование результата для ожидающих вызовов, чтобы
+            изменения объекта одним запросом не были видны другим.
+        :param max_tracked_keys: Сколько ключей хранить в счетчиках по ключам.
+        """
+        self.name = name
+        self._clone = clone
+        self._calls: Dict[Hashable, "asyncio.Future[Result]"] = {}
+        self._max_tracked_keys = max_tracked_keys
+        self._coalesced_by_key: "OrderedDict[Hashable, int]" = OrderedDict()
+        flight_inflight.set_function(lambda: len(self._calls), flight=name)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Result]]) -> Result:
+        future = self._calls.get(key)
+        if future is not None:
+            self._count_coalesced(key)
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Отменен первый вызов, а не этот: выполняем запрос сами
+                return await call()
+            return self._clone(result) if self._clone is not None else result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        flight_calls.inc(flight=self.name)
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Ошибка уже передана вызывающему; без ожидающих future не должен ее логировать
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self, key: Hashable) -> None:
+        """Не присоединять новые вызовы к выполняющемуся запросу (после записи)."""
+        self._calls.pop(key, None)
+
+    def forget_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def coalesced_by_key(self, limit: int = 20) -> List[Tuple[Hashable, int]]:
+        """Ключи с наибольшим числом объединенных вызовов."""
+        return sorted(self._coalesced_by_key.items(), key=lambda item: item[1], reverse=True)[
+            :limit
+        ]
+
+    def _count_coalesced(self, key: Hashable) -> None:
+        flight_coalesced.inc(flight=self.name)
+        self._coalesced_by_key[key] = self._coalesced_by_key.get(key, 0) + 1
+        self._coalesced_by_key.move_to_end(key)
+        while len(self._coalesced_by_key) > self._max_tracked_keys:
+            self._coalesced_by_key.popitem(last=False)
@@ -0,0 +1,76 @@
+import copy
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from core.entites.core_entities import Project, Task
+from infrastructure.cache.entity_cache import (
+    EntityCache,
+    decode_project,
+    decode_task,
+    encode_project,
+    encode_task,
+)
+from infrastructure.cache.redis_tier import RedisCacheTier
+from infrastructure.cache.response_cache import ProjectVersionedResponseCache
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.cache.ttl_cache import TTLCache
+from infrastructure.event_publisher_singleton import event_publisher
+from settings import get_settings
+
+config = get_settings()
+
+redis_tier = (
+    RedisCacheTier(config.redis_url, config.cache_redis_ttl_seconds)
+    if config.redis_url
+    else None
+)
+project_cache: EntityCache[Project] = EntityCache(
+    "project",
+    TTLCache(config.cache_local_max_entries, config.cache_local_ttl_seconds),
+    encode_project,
+    decode_project,
+    version=lambda project: project.updated_at,
+    redis=redis_tier,
+)
+task_cache: EntityCache[Task] = EntityCache(
+    "task",
+    TTLCache(config.cache_local_max_entries, config.cache_local_ttl_seconds),
+    encode_task,
+    decode_task,
+    version=lambda task: task.version,
+    redis=redis_tier,
+    # Задачи группируются по проекту: вычистка проекта сбрасывает их в Redis разом
+    group=lambda task: task.project_id,
+)
+
+# Готовые ответы списка задач; версия проекта растет с каждым событием по его задачам
+task_list_cache = ProjectVersionedResponseCache(
+    "task_list",
+    max_entries=config.task_list_cache_max_entries,
+    ttl_seconds=config.task_list_cache_ttl_seconds,
+    max_projects=config.task_list_cache_max_projects,
+)
+event_publisher.add_listener(task_list_cache.on_event)
+
+# Объединение одинаковых конкурентных чтений, ушедших мимо кэша
+project_reads: SingleFlight[Optional[Project]] = SingleFlight("project", clone=copy.copy)
+task_list_reads: SingleFlight[List[Task]] = SingleFlight(
+    "task_list", clone=lambda tasks: [copy.copy(task) for task in tasks]
+)
+single_flights = [project_reads, task_list_reads]
+
+
+def invalidate_entity_caches(event: Dict[str, Any]) -> None:
+    """Сбросить локальные копии сущностей по событию из task_events.
+    Redis к этому моменту уже обновлен экземпляром, изменившим сущность;
+    при вычистке проекта — воркером вычистки через кэширующие репозитории.
+    """
+    event_type = event.get("event_type", "")
+    if event_type == "TaskCreatedEvent":
+        return
+    if event.get("task_id") is not None:
+        task_cache.evict_local(UUID(event["task_id"]))
+    elif event_type.startswith("Project") and event.get("project_id") is not None:
+        project_id = UUID(event["project_id"])
+        project_cache.evict_local(project_id)
+        if event_type == "ProjectDeletedEvent":
+            task_cache.evict_local_where(lambda task: task.project_id == project_id)
@@ -1,5 +1,58 @@
+from pathlib import Path
+from typing import Optional
+
+from infrastructure.repositories.event_codec import make_event_codec
 from infrastructure.repositories.event_publisher import AioKafkaEventPublisher
+from infrastructure.repositories.event_routing import EventRouting, parse_key_fields
+from infrastructure.repositories.event_spool import EventSpool
+from infrastructure.repositories.in_memory_event_publisher import InMemoryEventPublisher
+from infrastructure.repositories.listening_event_publisher import ListeningEventPublisher
+from infrastructure.repositories.schema_registry import FileSchemaRegistry
+from infrastructure.repositories.spooling_event_publisher import SpoolingEventPublisher
 from settings import get_settings
 
 config = get_settings()
-event_publisher = AioKafkaEventPublisher(config.kafka_servers)
+schema_registry = FileSchemaRegistry(
+    Path(config.event_schema_dir or Path(__file__).resolve().parents[1] / "event_schemas")
+)
+event_codec = make_event_codec(config.event_encoding, schema_registry)
+event_routing = EventRouting(
+    default_key_field=config.event_partition_key_field or None,
+    key_fields=parse_key_fields(config.event_partition_key_overrides),
+    topic_per_aggregate=config.event_topic_per_aggregate,
+)
+broker_event_publisher: AioKafkaEventPublisher | InMemoryEventPublisher
+if config.event_publisher_backend == "memory":
+    broker_event_publisher = InMemoryEventPublisher(
+        max_queue_size=config.in_memory_event_queue_size,
+        block_when_full=config.in_memory_event_queue_block,
+        routing=event_routing,
+        codec=event_codec,
+    )
+elif config.event_publisher_backend == "kafka":
+    broker_event_publisher = AioKafkaEventPublisher(
+        config.kafka_servers,
+        wait_for_delivery=config.kafka_publish_wait_for_delivery,
+        linger_ms=config.kafka_linger_ms,
+        max_batch_size=config.kafka_max_batch_size,
+        compression_type=config.kafka_compression_type,
+        acks=config.kafka_producer_acks,
+        flush_timeout_seconds=config.kafka_flush_timeout_seconds,
+        routing=event_routing,
+        codec=event_codec,
+    )
+else:
+    raise ValueError(f"Unsupported event publisher backend {config.event_publisher_backend!r}.")
+event_spool: Optional[EventSpool] = None
+if config.event_spool_enabled:
+    event_spool = EventSpool(
+        Path(config.event_spool_dir),
+        segment_max_bytes=config.event_spool_segment_max_mb * 1024 * 1024,
+        max_bytes=config.event_spool_max_mb * 1024 * 1024,
+        fsync_interval_ms=config.event_spool_fsync_interval_ms,
+    )
+    event_publisher = ListeningEventPublisher(
+        SpoolingEventPublisher(broker_event_publisher, event_spool, event_routing, event_codec)
+    )
+else:
+    event_publisher = ListeningEventPublisher(broker_event_publisher)
@@ -0,0 +1,55 @@
+import copy
+from typing import List
+from uuid import UUID
+
+from core.entites.auth_entity import User
+from core.entites.core_entities import Project, Task
+from core.services.batch_loader import BatchLoader
+from infrastructure.cache_singleton import project_cache, task_cache
+from infrastructure.postgres_db import database
+from infrastructure.repositories.auth_repository import UserRepository
+from infrastructure.repositories.cached_project_repository import CachedProjectRepository
+from infrastructure.repositories.cached_task_repository import CachedTaskRepository
+from infrastructure.repositories.project_repository import ProjectRepository
+from infrastructure.repositories.task_repository import TaskRepository
+from settings import get_settings
+
+config = get_settings()
+
+
+# Пакеты общие для всех запросов процесса, поэтому каждый читается в своей сессии
+async def _load_tasks(task_ids: List[UUID]) -> List[Task]:
+    async with database.session_factory() as session:
+        repo = CachedTaskRepository(TaskRepository(session), task_cache)
+        return await repo.get_tasks_by_ids(task_ids)
+
+
+async def _load_projects(project_ids: List[UUID]) -> List[Project]:
+    async with database.session_factory() as session:
+        repo = CachedProjectRepository(ProjectRepository(session), project_cache)
+        return await repo.get_projects_by_ids(project_ids)
+
+
+async def _load_users(user_ids: List[UUID]) -> List[User]:
+    async with database.session_factory() as session:
+        return await UserRepository(session).get_by_ids(user_ids)
+
+
+task_loader: BatchLoader[UUID, Task] = BatchLoader(
+    _load_tasks,
+    key=lambda task: task.id,
+    max_batch_size=config.batch_loader_max_batch_size,
+    clone=copy.copy,
+)
+project_loader: BatchLoader[UUID, Project] = BatchLoader(
+    _load_projects,
+    key=lambda project: project.id,
+    max_batch_size=config.batch_loader_max_batch_size,
+    clone=copy.copy,
+)
+user_loader: BatchLoader[UUID, User] = BatchLoader(
+    _load_users,
+    key=lambda user: user.id,
+    max_batch_size=config.batch_loader_max_batch_size,
+    clone=copy.copy,
+)
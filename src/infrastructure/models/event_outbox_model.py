@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import BigInteger, Identity, Index, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+from infrastructure.models.base_model import utc_now
+from infrastructure.postgres_db import Base
+
+
+class EventOutbox(Base):
+    """Исходящие события (transactional outbox).
+
+    Строка пишется в той же транзакции, что и изменение, породившее событие;
+    relay-воркер публикует строки в брокер и удаляет их.
+    """
+
+    __tablename__ = "event_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    topic: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Ключ партиции Kafka (обычно project_id); NULL — без ключа
+    partition_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Слот relay, вычисленный из ключа при записи (outbox_slot)
+    slot: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Событие, уже сериализованное в JSON: relay отправляет байты без изменений
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=utc_now)
+
+
+# relay выбирает старейшие строки слота: index scan по (slot, id) без сортировки
+Index("ix_event_outbox_slot_id", EventOutbox.slot, EventOutbox.id)
+
+
+def outbox_slot(partition_key: Any, slots: Any) -> Any:
+    """
+    SQL-выражение слота для ключа партиции: события одного ключа попадают
+    в один слот, строки без ключа — в общий.
+
+    :param partition_key: Выражение или параметр с ключом партиции.
+    :param slots: Число слотов (OUTBOX_RELAY_LOCK_SLOTS).
+    """
+    return func.hashtext(func.coalesce(partition_key, ""), type_=Integer).op(
+        "&", return_type=Integer
+    )(0x7FFFFFFF) % slots
@@ -1,17 +1,48 @@
-from sqlalchemy import UUID, ForeignKey, Enum as SQLEnum, String
-from infrastructure.models.base_model import BaseModelMixin
+from datetime import datetime
+from sqlalchemy import (
+    UUID,
+    literal_column,
+    BigInteger,
+    Computed,
+    ForeignKey,
+    Identity,
+    Enum as SQLEnum,
+    String,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from infrastructure.models.base_model import BaseModelMixin, utc_now
 from infrastructure.postgres_db import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING, Optional
-from uuid import UUID as PY_UUID
-from core.entites.core_entities import TaskStatus
+from uuid import UUID as PY_UUID, uuid4
+from core.entites.core_entities import ProjectRole, TaskStatus
+
+# Конфигурация 'simple' не зависит от языка: заголовки бывают и на русском, и на английском
+TASK_SEARCH_CONFIG = "simple"
+TASK_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
 
 
 class Task(Base, BaseModelMixin):
     """Модель задачи."""
 
     __tablename__ = "tasks"
+    # Таблица секционирована по HASH(project_id); ключ секционирования входит в PK
+    __table_args__ = (
+        PrimaryKeyConstraint("project_id", "id", name="tasks_pkey"),
+        {"postgresql_partition_by": "HASH (project_id)"},
+    )
 
+    # id входит в составной PK из __table_args__, поэтому без primary_key из миксина
+    id: Mapped[PY_UUID] = mapped_column(
+        UUID(as_uuid=True), default=uuid4, nullable=False
+    )
     project_id: Mapped[PY_UUID] = mapped_column(
         ForeignKey("projects.id"), nullable=False
     )
@@ -28,9 +59,51 @@ class Task(Base, BaseModelMixin):
     assignee_id: Mapped[Optional[PY_UUID]] = mapped_column(
         UUID(as_uuid=True), nullable=True
     )
+    # Версия строки для оптимистичной блокировки; увеличивается репозиторием
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    # Поисковый вектор вычисляется самой БД; не загружается при обычных выборках
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(TASK_SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
     project: Mapped["Project"] = relationship(back_populates="tasks")
 
 
+class TaskArchive(Base, BaseModelMixin):
+    """Архив закрытых задач.
+
+    Закрытые задачи старше заданного возраста переносятся сюда фоновым воркером,
+    чтобы не занимать место в горячей таблице tasks и ее индексах.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (PrimaryKeyConstraint("project_id", "id", name="tasks_archive_pkey"),)
+
+    id: Mapped[PY_UUID] = mapped_column(
+        UUID(as_uuid=True), default=uuid4, nullable=False
+    )
+    project_id: Mapped[PY_UUID] = mapped_column(
+        ForeignKey("projects.id"), nullable=False
+    )
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(
+        SQLEnum(TaskStatus, name="task_status_enum", create_type=False),
+        nullable=False,
+        default=TaskStatus.CLOSED,
+    )
+    assignee_id: Mapped[Optional[PY_UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    archived_at: Mapped[datetime] = mapped_column(nullable=False)
+
+
 class Project(Base, BaseModelMixin):
     """Модель проекта."""
 
@@ -38,7 +111,134 @@ class Project(Base, BaseModelMixin):
 
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Отметка мягкого удаления: задачи проекта вычищаются фоновым воркером пачками
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     tasks: Mapped[list["Task"]] = relationship(
         back_populates="project", cascade="all, delete-orphan"
     )
+
+
+class TaskStatusHistory(Base):
+    """Журнал смен статусов задач (только добавление).
+
+    Заполняется триггерами уровня оператора на tasks в той же транзакции,
+    что и изменение задачи.
+    """
+
+    __tablename__ = "task_status_history"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    task_id: Mapped[PY_UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    project_id: Mapped[PY_UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    old_status: Mapped[Optional[TaskStatus]] = mapped_column(
+        SQLEnum(TaskStatus, name="task_status_enum", create_type=False), nullable=True
+    )
+    new_status: Mapped[TaskStatus] = mapped_column(
+        SQLEnum(TaskStatus, name="task_status_enum", create_type=False), nullable=False
+    )
+    changed_at: Mapped[datetime] = mapped_column(nullable=False)
+
+
+class ProjectMember(Base):
+    """Участник проекта и его роль."""
+
+    __tablename__ = "project_members"
+
+    project_id: Mapped[PY_UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[PY_UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    role: Mapped[ProjectRole] = mapped_column(
+        SQLEnum(ProjectRole, name="project_role_enum"),
+        nullable=False,
+        default=ProjectRole.MEMBER,
+    )
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=utc_now)
+
+
+class ProjectTaskStats(Base):
+    """Счетчики задач проекта по статусам.
+
+    Поддерживаются триггерами на таблице tasks в той же транзакции, что и изменение задач.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[PY_UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[TaskStatus] = mapped_column(
+        SQLEnum(TaskStatus, name="task_status_enum", create_type=False),
+        primary_key=True,
+    )
+    task_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+Index("ix_tasks_id", Task.id)
+Index("ix_tasks_search_vector", Task.search_vector, postgresql_using="gin")
+
+# Условие "задача не закрыта" литералом, а не параметром: так планировщик
+# сопоставляет запрос с частичными индексами и в generic-плане
+TASK_IS_OPEN = Task.status != literal_column("'CLOSED'")
+TASK_IS_CLOSED = Task.status == literal_column("'CLOSED'")
+
+# Горячие индексы покрывают только незакрытые задачи; закрытые со временем уходят в архив
+Index(
+    "ix_tasks_open_project_created_at",
+    Task.project_id,
+    Task.created_at,
+    postgresql_where=TASK_IS_OPEN,
+)
+Index(
+    "ix_tasks_open_project_status",
+    Task.project_id,
+    Task.status,
+    postgresql_where=TASK_IS_OPEN,
+)
+# Для архивации: поиск закрытых задач, давно не менявшихся
+Index("ix_tasks_closed_updated_at", Task.updated_at, postgresql_where=TASK_IS_CLOSED)
+
+# Записи журнала добавляются по времени, поэтому BRIN по changed_at крошечный и
+# отсекает блоки при выборке за период; переходы проекта читаются по btree
+Index(
+    "ix_task_status_history_changed_at",
+    TaskStatusHistory.changed_at,
+    postgresql_using="brin",
+)
+Index(
+    "ix_task_status_history_project_changed_at",
+    TaskStatusHistory.project_id,
+    TaskStatusHistory.changed_at,
+)
+
+# Проекты пользователя: index-only scan по (user_id, project_id) вместе с ролью
+Index(
+    "ix_project_members_user_project",
+    ProjectMember.user_id,
+    ProjectMember.project_id,
+    postgresql_include=["role"],
+)
+
+Index(
+    "ix_projects_pending_purge",
+    Project.deleted_at,
+    postgresql_where=Project.deleted_at.isnot(None),
+)
+
+# Индексы для автодополнения названий проектов: короткие префиксы обслуживает
+# btree по lower(name) COLLATE "C", более длинный ввод — триграммный GIN (pg_trgm)
+Index(
+    "ix_projects_name_prefix",
+    func.lower(Project.name).collate("C"),
+    postgresql_where=Project.deleted_at.is_(None),
+)
+Index(
+    "ix_projects_name_trgm",
+    Project.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+    postgresql_where=Project.deleted_at.is_(None),
+)
@@ -29,8 +29,10 @@ Base = declarative_base()
 
 
 class Database:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(url=url, echo=echo)
+    def __init__(self, url: str, echo: bool = False, query_cache_size: int = 500):
+        self.engine = create_async_engine(
+            url=url, echo=echo, query_cache_size=query_cache_size
+        )
 
         self.session_factory = async_sessionmaker(
             bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False
@@ -66,4 +68,6 @@ class Database:
 
 
 # database = Database(config.database_url)
-database: Database = Database(config.database_url)
+database: Database = Database(
+    config.database_url, query_cache_size=config.sqlalchemy_query_cache_size
+)
@@ -3,7 +3,8 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import any_, bindparam, select, update, delete
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from core.interfaceRepositories.auth_irepository import (
     IUserRepository,
@@ -12,6 +13,15 @@ from core.interfaceRepositories.auth_irepository import (
 from core.entites.auth_entity import User, RefreshTokenEntity
 from infrastructure.models.auth_models import UserModel, RefreshTokenModel
 
+# Горячие запросы строятся один раз при импорте
+_GET_USER_BY_ID = select(UserModel).where(UserModel.id == bindparam("user_id"))
+_GET_USERS_BY_IDS = select(UserModel).where(
+    UserModel.id == any_(bindparam("user_ids", type_=ARRAY(UserModel.id.type)))
+)
+_GET_REFRESH_TOKEN_BY_JTI = select(RefreshTokenModel).where(
+    RefreshTokenModel.jti == bindparam("jti")
+)
+
 
 class UserRepository(IUserRepository):
     """Репозиторий для работы с пользователями"""
@@ -48,12 +58,16 @@ class UserRepository(IUserRepository):
         )
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        result = await self._session.execute(
-            select(UserModel).where(UserModel.id == user_id)
-        )
+        result = await self._session.execute(_GET_USER_BY_ID, {"user_id": user_id})
         m = result.scalars().first()
         return self._map_to_entity(m) if m else None
 
+    async def get_by_ids(self, user_ids: List[UUID]) -> List[User]:
+        if not user_ids:
+            return []
+        result = await self._session.execute(_GET_USERS_BY_IDS, {"user_ids": list(user_ids)})
+        return [self._map_to_entity(m) for m in result.scalars()]
+
     async def get_by_email(self, email: str) -> Optional[User]:
         result = await self._session.execute(
             select(UserModel).where(UserModel.email == email)
@@ -124,9 +138,7 @@ class RefreshTokenRepository(IRefreshTokenRepository):
         return token_entity
 
     async def get_refresh_token_by_jti(self, jti: UUID) -> Optional[RefreshTokenEntity]:
-        result = await self._session.execute(
-            select(RefreshTokenModel).where(RefreshTokenModel.jti == jti)
-        )
+        result = await self._session.execute(_GET_REFRESH_TOKEN_BY_JTI, {"jti": jti})
         m = result.scalars().first()
         if not m:
             return None
@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entites.core_entities import (
+    Project,
+    ProjectMember,
+    ProjectRole,
+    ProjectSuggestion,
+    ProjectTaskStats,
+)
+from core.interfaceRepositories.project_irepository import IProjectRepository
+from infrastructure.cache.entity_cache import EntityCache
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.repositories.unit_of_work import after_commit
+
+
+class CachedProjectRepository(IProjectRepository):
+    """
+    Репозиторий проектов с кэшем get_project.
+
+    Чтение по ID идет через кэш, изменения проекта записываются в кэш
+    (write-through), удаление сбрасывает его; внутри единицы работы — только
+    после фиксации транзакции. Остальные методы передаются
+    обернутому репозиторию без изменений. Одинаковые конкурентные чтения
+    проекта при промахе кэша объединяются через flight, пока сессия не
+    изменяла проекты.
+    """
+
+    def __init__(
+        self,
+        inner: IProjectRepository,
+        cache: EntityCache[Project],
+        flight: Optional[SingleFlight[Optional[Project]]] = None,
+        session: Optional[AsyncSession] = None,
+    ):
+        self._inner: IProjectRepository = inner
+        self._cache: EntityCache[Project] = cache
+        self._flight: Optional[SingleFlight[Optional[Project]]] = flight
+        self._session: Optional[AsyncSession] = session
+        self._written = False
+
+    async def _after_commit(self, action: Callable[[], Awaitable[None]]) -> None:
+        if self._session is None:
+            await action()
+        else:
+            await after_commit(self._session, action)
+
+    def _after_write(self, project_id: UUID) -> None:
+        self._written = True
+        if self._flight is not None:
+            self._flight.forget(project_id)
+
+    async def create_project(
+        self, project: Project, owner_id: Optional[UUID] = None
+    ) -> Project:
+        created = await self._inner.create_project(project, owner_id)
+        await self._after_commit(lambda: self._cache.put(created.id, created))
+        return created
+
+    async def get_project(self, project_id: UUID) -> Optional[Project]:
+        project = await self._cache.get(project_id)
+        if project is None:
+            if self._flight is None or self._written:
+                project = await self._inner.get_project(project_id)
+            else:
+                project = await self._flight.do(
+                    project_id, lambda: self._inner.get_project(project_id)
+                )
+            if project is not None:
+                await self._cache.fill(project_id, project)
+        return project
+
+    async def get_projects_by_ids(self, project_ids: List[UUID]) -> List[Project]:
+        projects: List[Project] = []
+        missing: List[UUID] = []
+        for project_id in project_ids:
+            project = await self._cache.get(project_id)
+            if project is None:
+                missing.append(project_id)
+            else:
+                projects.append(project)
+        if missing:
+            loaded = await self._inner.get_projects_by_ids(missing)
+            for project in loaded:
+                await self._cache.fill(project.id, project)
+            projects.extend(loaded)
+        return projects
+
+    async def get_project_timestamp(self, project_id: UUID) -> Optional[datetime]:
+        project = await self._cache.get(project_id)
+        if project is not None:
+            return project.updated_at
+        return await self._inner.get_project_timestamp(project_id)
+
+    async def update_project(
+        self,
+        project_id: UUID,
+        update_data: Dict[str, Any],
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Project]:
+        updated = await self._inner.update_project(
+            project_id, update_data, expected_updated_at
+        )
+        self._after_write(project_id)
+        if updated is None:
+            await self._cache.invalidate(project_id)
+        else:
+            await self._after_commit(lambda: self._cache.put(project_id, updated))
+        return updated
+
+    async def delete_project(self, project_id: UUID) -> bool:
+        result = await self._inner.delete_project(project_id)
+        self._after_write(project_id)
+        await self._after_commit(lambda: self._cache.invalidate(project_id))
+        return result
+
+    async def mark_project_deleted(self, project_id: UUID) -> bool:
+        marked = await self._inner.mark_project_deleted(project_id)
+        self._after_write(project_id)
+        await self._after_commit(lambda: self._cache.invalidate(project_id))
+        return marked
+
+    async def list_deleted_project_ids(self) -> List[UUID]:
+        return await self._inner.list_deleted_project_ids()
+
+    async def list_projects(
+        self, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> List[Project]:
+        return await self._inner.list_projects(limit, offset)
+
+    async def list_member_projects(
+        self, user_id: UUID, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Project]:
+        return await self._inner.list_member_projects(user_id, limit, after)
+
+    async def get_member_roles(self, user_id: UUID) -> Dict[UUID, ProjectRole]:
+        return await self._inner.get_member_roles(user_id)
+
+    async def list_members(self, project_id: UUID) -> List[ProjectMember]:
+        return await self._inner.list_members(project_id)
+
+    async def add_member(
+        self, project_id: UUID, user_id: UUID, role: ProjectRole
+    ) -> ProjectMember:
+        return await self._inner.add_member(project_id, user_id, role)
+
+    async def remove_member(self, project_id: UUID, user_id: UUID) -> bool:
+        return await self._inner.remove_member(project_id, user_id)
+
+    async def get_task_stats(
+        self, project_ids: List[UUID]
+    ) -> Dict[UUID, ProjectTaskStats]:
+        return await self._inner.get_task_stats(project_ids)
+
+    async def get_project_by_filter(self, filters: Dict[str, Any]) -> Optional[Project]:
+        return await self._inner.get_project_by_filter(filters)
+
+    async def search_projects(
+        self, query: str, limit: int, user_id: Optional[UUID] = None
+    ) -> List[ProjectSuggestion]:
+        return await self._inner.search_projects(query, limit, user_id)
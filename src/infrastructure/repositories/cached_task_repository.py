@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.entites.core_entities import (
+    Task,
+    TaskSearchHit,
+    TaskStatus,
+    TaskStatusTransition,
+    TaskTimelineColumns,
+)
+from core.interfaceRepositories.task_irepository import ITaskRepository
+from infrastructure.cache.entity_cache import EntityCache
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.repositories.unit_of_work import after_commit
+
+
+class CachedTaskRepository(ITaskRepository):
+    """
+    Репозиторий задач с кэшем get_task.
+
+    Чтение по ID идет через кэш, созданные и измененные задачи записываются
+    в кэш (write-through), удаление и неудавшееся условное обновление сбрасывают
+    его. Внутри единицы работы запись и сброс откладываются до фиксации
+    транзакции: другие запросы не видят в кэше незафиксированных задач, а при
+    откате кэш не меняется. Одинаковые конкурентные запросы списка задач объединяются через
+    list_flight; после записи в этой сессии списки читаются напрямую, чтобы
+    запрос видел свои изменения. Поиск и пакетные операции передаются
+    обернутому репозиторию.
+    """
+
+    def __init__(
+        self,
+        inner: ITaskRepository,
+        cache: EntityCache[Task],
+        list_flight: Optional[SingleFlight[List[Task]]] = None,
+        session: Optional[AsyncSession] = None,
+    ):
+        self._inner: ITaskRepository = inner
+        self._cache: EntityCache[Task] = cache
+        self._list_flight: Optional[SingleFlight[List[Task]]] = list_flight
+        self._session: Optional[AsyncSession] = session
+        self._written = False
+
+    async def _after_commit(self, action: Callable[[], Awaitable[None]]) -> None:
+        if self._session is None:
+            await action()
+        else:
+            await after_commit(self._session, action)
+
+    def _after_write(self, project_id: Optional[UUID]) -> None:
+        self._written = True
+        if self._list_flight is None:
+            return
+        if project_id is None:
+            self._list_flight.forget_where(lambda key: True)
+        else:
+            self._list_flight.forget_where(lambda key: key[0] == project_id)
+
+    async def create_task(self, task: Task) -> Task:
+        created = await self._inner.create_task(task)
+        self._after_write(created.project_id)
+        await self._after_commit(lambda: self._cache.put(created.id, created))
+        return created
+
+    async def get_task(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Task]:
+        task = await self._cache.get(task_id)
+        if task is None:
+            task = await self._inner.get_task(task_id, project_id)
+            if task is not None:
+                await self._cache.fill(task_id, task)
+            return task
+        # ID задач уникальны: задача из кэша в другом проекте в этом проекте не существует
+        if project_id is not None and task.project_id != project_id:
+            return None
+        return task
+
+    async def get_tasks_by_ids(self, task_ids: List[UUID]) -> List[Task]:
+        tasks: List[Task] = []
+        missing: List[UUID] = []
+        for task_id in task_ids:
+            task = await self._cache.get(task_id)
+            if task is None:
+                missing.append(task_id)
+            else:
+                tasks.append(task)
+        if missing:
+            loaded = await self._inner.get_tasks_by_ids(missing)
+            for task in loaded:
+                await self._cache.fill(task.id, task)
+            tasks.extend(loaded)
+        return tasks
+
+    async def is_task_archived(self, task_id: UUID, project_id: Optional[UUID] = None) -> bool:
+        return await self._inner.is_task_archived(task_id, project_id)
+
+    async def get_task_timestamp(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Tuple[UUID, datetime]]:
+        task = await self._cache.get(task_id)
+        if task is None:
+            return await self._inner.get_task_timestamp(task_id, project_id)
+        if project_id is not None and task.project_id != project_id:
+            return None
+        return task.project_id, task.updated_at
+
+    async def update_task(
+        self,
+        task_id: UUID,
+        update_data: Dict[str, Any],
+        project_id: Optional[UUID] = None,
+        expected_version: Optional[int] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Task]:
+        updated = await self._inner.update_task(
+            task_id, update_data, project_id, expected_version, expected_updated_at
+        )
+        self._after_write(updated.project_id if updated is not None else project_id)
+        if updated is None:
+            # Клиент мог получить устаревшую версию из кэша: следующее чтение пойдет в БД
+            await self._cache.invalidate(task_id)
+        else:
+            await self._after_commit(lambda: self._cache.put(task_id, updated))
+        return updated
+
+    async def change_task_status(
+        self,
+        task_id: UUID,
+        new_status: TaskStatus,
+        expected_status: Optional[TaskStatus] = None,
+        project_id: Optional[UUID] = None,
+    ) -> Optional[Tuple[TaskStatus, Task]]:
+        changed = await self._inner.change_task_status(
+            task_id, new_status, expected_status, project_id
+        )
+        self._after_write(changed[1].project_id if changed is not None else project_id)
+        if changed is None:
+            await self._cache.invalidate(task_id)
+        else:
+            task = changed[1]
+            await self._after_commit(lambda: self._cache.put(task_id, task))
+        return changed
+
+    async def delete_task(self, task_id: UUID, project_id: Optional[UUID] = None) -> None:
+        await self._inner.delete_task(task_id, project_id)
+        self._after_write(project_id)
+        await self._after_commit(lambda: self._cache.invalidate(task_id))
+
+    async def delete_tasks_batch(self, project_id: UUID, batch_size: int) -> int:
+        deleted = await self._inner.delete_tasks_batch(project_id, batch_size)
+        self._after_write(project_id)
+        await self._after_commit(lambda: self._cache.invalidate_group(project_id))
+        return deleted
+
+    async def delete_status_history_batch(self, project_id: UUID, batch_size: int) -> int:
+        return await self._inner.delete_status_history_batch(project_id, batch_size)
+
+    async def archive_closed_tasks(self, closed_before: datetime, batch_size: int) -> int:
+        # Перенос в архив не меняет данные задачи, кэш остается верным
+        return await self._inner.archive_closed_tasks(closed_before, batch_size)
+
+    async def list_tasks(
+        self,
+        project_id: UUID,
+        status: Optional[TaskStatus] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        order_by: Optional[str] = None,
+    ) -> List[Task]:
+        if self._list_flight is None or self._written:
+            return await self._inner.list_tasks(project_id, status, limit, offset, order_by)
+        return await self._list_flight.do(
+            (project_id, status, limit, offset, order_by),
+            lambda: self._inner.list_tasks(project_id, status, limit, offset, order_by),
+        )
+
+    async def list_status_transitions(
+        self,
+        project_id: UUID,
+        since: datetime,
+        until: datetime,
+        limit: Optional[int] = None,
+    ) -> List[TaskStatusTransition]:
+        return await self._inner.list_status_transitions(project_id, since, until, limit)
+
+    async def get_task_timeline_columns(self, project_id: UUID) -> TaskTimelineColumns:
+        return await self._inner.get_task_timeline_columns(project_id)
+
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        project_ids: Optional[List[UUID]] = None,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[TaskSearchHit]:
+        return await self._inner.search_tasks(query, limit, project_ids, after)
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID
+
+import orjson
+
+from infrastructure.repositories.schema_registry import EventSchema, FileSchemaRegistry
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+Converter = Callable[[Any], Any]
+
+
+class JsonEventCodec:
+    """Событие как JSON-объект с именами полей (формат по умолчанию)."""
+
+    name = "json"
+
+    def encode(self, event: Any) -> bytes:
+        return orjson.dumps(event)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return orjson.loads(data)
+
+
+def _encode_timestamp(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // MICROSECOND
+
+
+def _decode_timestamp(value: int) -> str:
+    return (EPOCH + value * MICROSECOND).isoformat()
+
+
+def _enum_converters(symbols: Tuple[str, ...]) -> Tuple[Converter, Converter]:
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+    return (
+        lambda value: index[value.value if isinstance(value, Enum) else value],
+        lambda value: symbols[value],
+    )
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _converters(schema: EventSchema) -> List[Tuple[str, Converter, Converter]]:
+    converters = []
+    for field in schema.fields:
+        if field.type == "uuid":
+            encode, decode = (lambda value: value.bytes), (lambda value: str(UUID(bytes=value)))
+        elif field.type == "timestamp":
+            encode, decode = _encode_timestamp, _decode_timestamp
+        elif field.type == "enum":
+            encode, decode = _enum_converters(field.symbols)
+        else:
+            encode, decode = _identity, _identity
+        converters.append((field.name, encode, decode))
+    return converters
+
+
+class MsgpackEventCodec:
+    """
+    Компактное бинарное представление событий по схемам из реестра.
+
+    Сообщение — массив msgpack [event_type, версия схемы, [значения полей]]:
+    имена полей не передаются, UUID занимает 16 байт, время — целое число
+    микросекунд с эпохи, статус — номер значения в перечислении схемы.
+    Декодер читает поля по версии из заголовка сообщения, поэтому потребители
+    переживают добавление новой версии схемы издателем.
+
+    События без схемы в реестре кодируются в JSON. decode различает форматы
+    по первому байту, поэтому потребители читают оба формата и кодировку можно
+    переключать без остановки потребителей.
+    """
+
+    name = "msgpack"
+
+    def __init__(self, registry: FileSchemaRegistry):
+        # Зависимость нужна, только если включено бинарное кодирование
+        import msgpack
+
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+        self._registry = registry
+        self._converters: Dict[Tuple[str, int], List[Tuple[str, Converter, Converter]]] = {}
+
+    def encode(self, event: Any) -> bytes:
+        event_type = getattr(event, "event_type", None)
+        schema = self._registry.latest(event_type) if event_type is not None else None
+        if schema is None:
+            return orjson.dumps(event)
+        values = []
+        for name, encode, _ in self._schema_converters(schema):
+            value = getattr(event, name)
+            values.append(encode(value) if value is not None else None)
+        return self._packb([event_type, schema.version, values], use_bin_type=True)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """
+        Событие в том же виде, что и после orjson.loads: UUID и время — строки.
+
+        :raises ValueError: Если сообщение повреждено или версия схемы неизвестна.
+        """
+        if data[:1] == b"{":
+            return orjson.loads(data)
+        try:
+            event_type, version, values = self._unpackb(data, raw=False)
+            schema = self._registry.get(event_type, version)
+        except Exception as e:
+            raise ValueError(f"Malformed msgpack event: {e}") from e
+        if schema is None:
+            raise ValueError(f"Unknown schema {event_type} v{version}.")
+        converters = self._schema_converters(schema)
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError(f"Event {event_type} does not match schema v{version}.")
+        try:
+            event = {
+                name: decode(value) if value is not None else None
+                for (name, _, decode), value in zip(converters, values)
+            }
+        except Exception as e:
+            # Неверный индекс перечисления, тип UUID или времени
+            raise ValueError(f"Event {event_type} v{version} has a malformed field: {e}") from e
+        event["event_type"] = event_type
+        return event
+
+    def _schema_converters(self, schema: EventSchema) -> List[Tuple[str, Converter, Converter]]:
+        key = (schema.event_type, schema.version)
+        converters = self._converters.get(key)
+        if converters is None:
+            converters = self._converters[key] = _converters(schema)
+        return converters
+
+
+EventCodec = JsonEventCodec | MsgpackEventCodec
+
+
+def make_event_codec(encoding: str, registry: FileSchemaRegistry) -> EventCodec:
+    """
+    :raises ValueError: Если кодировка не поддерживается.
+    """
+    if encoding == JsonEventCodec.name:
+        return JsonEventCodec()
+    if encoding == MsgpackEventCodec.name:
+        return MsgpackEventCodec(registry)
+    raise ValueError(f"Unsupported event encoding {encoding!r}.")
@@ -1,23 +1,75 @@
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, List, Optional, Set, Tuple, Union
 from aiokafka import AIOKafkaProducer
-import orjson
 from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from infrastructure.repositories.event_codec import EventCodec, JsonEventCodec
+from infrastructure.repositories.event_routing import EventRouting
+from logger import get_logger
+from metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+events_published = metrics.counter(
+    "events_published_total", "События, подтвержденные брокером."
+)
+events_publish_failures = metrics.counter(
+    "events_publish_failures_total", "События, которые брокер не принял."
+)
+events_publish_pending = metrics.gauge(
+    "events_publish_pending", "События, отправленные без ожидания и еще не подтвержденные."
+)
 
 
 class AioKafkaEventPublisher(IEventPublisher):
     """
     Реализация издателя событий в Kafka с использованием aiokafka.
-    Использует orjson для сериализации событий в JSON.
+    Сериализует события кодеком: JSON (orjson) или компактным msgpack по схемам.
+
+    По умолчанию publish_event только ставит событие в буфер продюсера и не
+    ждет брокера: продюсер копит пачку linger_ms миллисекунд (или до
+    max_batch_size байт), сжимает ее и отправляет одним запросом. Подтверждения
+    отслеживаются в фоне, ошибки доставки логируются и попадают в метрики.
+    С wait_for_delivery=True каждая публикация ждет подтверждения, как раньше.
     """
 
-    def __init__(self, bootstrap_servers: List[str]):
+    def __init__(
+        self,
+        bootstrap_servers: Union[str, List[str]],
+        wait_for_delivery: bool = False,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        compression_type: Optional[str] = None,
+        acks: Union[int, str] = 1,
+        flush_timeout_seconds: float = 10.0,
+        routing: Optional[EventRouting] = None,
+        codec: Optional[EventCodec] = None,
+    ):
         """
         Инициализация издателя.
 
-        :param bootstrap_servers: Список адресов Kafka брокеров (например, ["kafka:9092"]).
+        :param bootstrap_servers: Адреса Kafka брокеров (например, ["kafka:9092"]).
+        :param wait_for_delivery: Ждать подтверждения брокера в publish_event.
+        :param linger_ms: Сколько продюсер ждет дополнения пачки перед отправкой.
+        :param max_batch_size: Максимальный размер пачки на партицию в байтах.
+        :param compression_type: Сжатие пачек: gzip, snappy, lz4, zstd или None.
+        :param acks: Подтверждение записи: 0, 1 или "all".
+        :param flush_timeout_seconds: Сколько ждать неподтвержденные события при остановке.
+        :param routing: Выбор топика и ключа партиции для событий без явного ключа.
+        :param codec: Сериализация событий; по умолчанию JSON.
         """
         self._bootstrap_servers = bootstrap_servers
+        self._wait_for_delivery = wait_for_delivery
+        self._linger_ms = linger_ms
+        self._max_batch_size = max_batch_size
+        self._compression_type = compression_type
+        self._acks = acks
+        self._flush_timeout_seconds = flush_timeout_seconds
+        self._routing = routing or EventRouting()
+        self._codec = codec or JsonEventCodec()
         self._producer: Optional[AIOKafkaProducer] = None
+        self._pending: Set["asyncio.Future[Any]"] = set()
+        events_publish_pending.set_function(lambda: len(self._pending))
 
     async def start(self) -> None:
         """
@@ -26,84 +78,123 @@ class AioKafkaEventPublisher(IEventPublisher):
         if self._producer is None:
             self._producer = AIOKafkaProducer(
                 bootstrap_servers=self._bootstrap_servers,
-                # Сериализатор для ключей (если нужны ключи для партицирования)
-                # key_serializer=lambda key: orjson.dumps(key),
-                # Сериализатор для значений (сообщений)
-                value_serializer=lambda value: orjson.dumps(value),
+                # Ключ партиции: события одного проекта сохраняют порядок
+                key_serializer=lambda key: key.encode() if key is not None else None,
+                # Сериализатор для значений (сообщений); события из outbox уже
+                # закодированы и отправляются без повторной сериализации
+                value_serializer=lambda value: (
+                    value if isinstance(value, bytes) else self._codec.encode(value)
+                ),
+                linger_ms=self._linger_ms,
+                max_batch_size=self._max_batch_size,
+                compression_type=self._compression_type,
+                acks=self._acks,
             )
             await self._producer.start()
             print("AIOKafkaProducer started.")
 
+    async def flush(self) -> None:
+        """
+        Отправить накопленные пачки и дождаться подтверждения отправленных событий.
+        Неподтвержденные за flush_timeout_seconds события логируются как потерянные.
+        """
+        if self._producer is None:
+            return
+        try:
+            await asyncio.wait_for(self._producer.flush(), self._flush_timeout_seconds)
+            if self._pending:
+                await asyncio.wait(set(self._pending), timeout=self._flush_timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending:
+            logger.error(
+                f"{len(self._pending)} event(s) were not acknowledged by Kafka before shutdown."
+            )
+
     async def stop(self) -> None:
         """
         Останавливает Kafka Producer. Должен быть вызван при завершении работы приложения.
         """
         if self._producer is not None:
+            await self.flush()
             await self._producer.stop()
             print("AIOKafkaProducer stopped.")
             self._producer = None
 
-    async def publish_event(self, event: Any, topic: str) -> None:
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
         """
         Опубликовать событие в указанный топик Kafka.
 
-        Событие сериализуется в JSON.
+        Событие сериализуется кодеком издателя. Без wait_for_delivery метод возвращается,
+        как только событие принято в буфер продюсера; ожидание возможно, только
+        если буфер заполнен.
 
         :param event: Объект события (dataclass, dict и т.п.).
-        :param topic: Топик Kafka для публикации.
+        :param topic: Топик Kafka для публикации (или общий топик, если включены
+            топики по агрегатам).
+        :param key: Ключ партиции; по умолчанию выбирается EventRouting.
+        :raises KafkaError: Если событие не удалось поставить в очередь
+            (или, с wait_for_delivery, доставить).
         """
         if self._producer is None:
             # Это должно быть предотвращено корректным жизненным циклом приложения,
             # где start() вызывается при старте, а stop() при шатдауне.
             raise RuntimeError("Kafka producer is not started. Call .start() first.")
 
-        # orjson.dumps() автоматически обрабатывает dataclasses, dicts, lists, UUIDs, datetime, enums
-        # message_bytes = orjson.dumps(event) # value_serializer делает это за нас
-
+        if key is None:
+            key = self._routing.key_for(event)
+        topic = self._routing.topic_for(event, topic)
         try:
-            # producer.send_and_wait() отправляет сообщение и ждет подтверждения от брокера
-            # Это может блокировать, но гарантирует, что сообщение принято брокером.
-            # Для очень высокопроизводительных сценариев можно использовать producer.send() без await
-            # и обрабатывать результат через Future. Но send_and_wait() проще для начала.
-            await self._producer.send_and_wait(
-                topic, event
-            )  # value_serializer сработает здесь
-            # print(f"Event published to topic {topic}: {event}") # Осторожно с логированием чувствительных данных
-
+            delivery = await self._producer.send(topic, event, key=key)
+            if self._wait_for_delivery:
+                await delivery
+                events_published.inc(topic=topic)
+                return
         except Exception as e:
-            # TODO: Реализовать более надежную обработку ошибок, логирование
-            print(f"Error publishing event to topic {topic}: {e}")
-            # В зависимости от требований, здесь можно попробовать повторить отправку,
-            # отправить в Dead Letter Queue, или просто залогировать ошибку.
+            events_publish_failures.inc(topic=topic)
+            logger.error(f"Error publishing event to topic {topic}: {e}")
             raise  # Перевыбрасываем ошибку, чтобы вызывающий код знал о сбое публикации
 
+        self._pending.add(delivery)
+        delivery.add_done_callback(
+            lambda future: self._on_delivery(future, topic, event)
+        )
+
+    async def publish_batch(self, events: List[Tuple[Any, str, Optional[str]]]) -> None:
+        """
+        Опубликовать пачку событий и дождаться подтверждения каждого.
+
+        Все события сначала ставятся в буфер продюсера, поэтому уходят общими
+        пачками, а не по одному запросу на событие.
+
+        :param events: Тройки (событие, топик, ключ партиции); bytes отправляются
+            как есть, топик и ключ не пересчитываются.
+        :raises KafkaError: Если хотя бы одно событие не доставлено (часть
+            событий пачки при этом могла быть доставлена).
+        """
+        if self._producer is None:
+            raise RuntimeError("Kafka producer is not started. Call .start() first.")
+        try:
+            deliveries = [
+                await self._producer.send(topic, event, key=key) for event, topic, key in events
+            ]
+            await asyncio.gather(*deliveries)
+        except Exception as e:
+            events_publish_failures.inc(topic=events[0][1] if events else "")
+            logger.error(f"Error publishing a batch of {len(events)} event(s): {e}")
+            raise
+        for _, topic, _ in events:
+            events_published.inc(topic=topic)
 
-# Пример использования (для иллюстрации, не для продакшена в core_service)
-# В реальном приложении этот класс будет инициализирован при старте
-# и передан через DI в сервисы.
-
-# async def example_usage():
-#     kafka_servers = ["localhost:9092"] # Замените на адрес вашего Kafka брокера
-#     publisher = AioKafkaEventPublisher(kafka_servers)
-#     await publisher.start()
-#
-#     try:
-#         # Предполагаем, что у вас есть класс ProjectCreatedEvent где-то определен
-#         from src.core.entites.core_events import ProjectCreatedEvent
-#         from uuid import uuid4
-#         from datetime import datetime
-#
-#         event = ProjectCreatedEvent(
-#             project_id=uuid4(),
-#             name="New Example Project",
-#             timestamp=datetime.utcnow()
-#         )
-#         await publisher.publish(event, topic="task_events")
-#         print("Example event published successfully.")
-#
-#     finally:
-#         await publisher.stop()
-#
-# if __name__ == "__main__":
-#     import asyncio
-#     asyncio.run(example_usage())
+    def _on_delivery(self, future: "asyncio.Future[Any]", topic: str, event: Any) -> None:
+        self._pending.discard(future)
+        if future.cancelled():
+            error: Optional[BaseException] = asyncio.CancelledError()
+        else:
+            error = future.exception()
+        if error is None:
+            events_published.inc(topic=topic)
+            return
+        events_publish_failures.inc(topic=topic)
+        event_type = getattr(event, "event_type", type(event).__name__)
+        logger.error(f"Event {event_type} was not delivered to topic {topic}: {error!r}")
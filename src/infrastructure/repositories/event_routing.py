@@ -0,0 +1,77 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Агрегаты, события которых публикуются сервисом (см. core_events)
+AGGREGATES = ("project", "task")
+_AGGREGATE_PREFIX = re.compile(r"[A-Z][a-z0-9]*")
+
+
+def parse_key_fields(value: str) -> Dict[str, Optional[str]]:
+    """
+    Переопределения ключа партиции из строки настроек.
+
+    "ProjectCreatedEvent=project_id,TaskDeletedEvent=task_id"; значение
+    none — публиковать событие этого типа без ключа.
+    """
+    key_fields: Dict[str, Optional[str]] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        event_type, _, field = item.partition("=")
+        field = field.strip()
+        key_fields[event_type.strip()] = None if field.lower() in ("", "none") else field
+    return key_fields
+
+
+class EventRouting:
+    """
+    Выбор ключа партиции и топика для события.
+
+    По умолчанию ключ — project_id события: все события проекта попадают в одну
+    партицию и читаются по порядку, а разные проекты обрабатываются параллельно
+    по числу партиций. Для отдельных типов событий поле ключа переопределяется.
+    С topic_per_aggregate события публикуются в топик своего агрегата
+    (project_events, task_events) вместо общего.
+    """
+
+    def __init__(
+        self,
+        default_key_field: Optional[str] = "project_id",
+        key_fields: Optional[Dict[str, Optional[str]]] = None,
+        topic_per_aggregate: bool = False,
+    ):
+        """
+        :param default_key_field: Поле события с ключом партиции; None — без ключа.
+        :param key_fields: Поле ключа по типу события (event_type).
+        :param topic_per_aggregate: Публиковать в топик агрегата события.
+        """
+        self._default_key_field = default_key_field
+        self._key_fields = key_fields or {}
+        self._topic_per_aggregate = topic_per_aggregate
+
+    def key_for(self, event: Any) -> Optional[str]:
+        field = self._key_fields.get(_event_type(event), self._default_key_field)
+        if field is None:
+            return None
+        value = event.get(field) if isinstance(event, dict) else getattr(event, field, None)
+        return str(value) if value is not None else None
+
+    def topic_for(self, event: Any, topic: str) -> str:
+        if not self._topic_per_aggregate:
+            return topic
+        aggregate = _AGGREGATE_PREFIX.match(_event_type(event))
+        if aggregate is None or aggregate.group(0).lower() not in AGGREGATES:
+            return topic
+        return f"{aggregate.group(0).lower()}_events"
+
+    def topics(self, topic: str) -> List[str]:
+        """Топики, которые нужно читать потребителю событий сервиса."""
+        if not self._topic_per_aggregate:
+            return [topic]
+        return [f"{aggregate}_events" for aggregate in AGGREGATES]
+
+
+def _event_type(event: Any) -> str:
+    if isinstance(event, dict):
+        return event.get("event_type", "")
+    return getattr(event, "event_type", type(event).__name__)
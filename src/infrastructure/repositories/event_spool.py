@@ -0,0 +1,389 @@
+import asyncio
+import errno
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logger import get_logger
+from metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+spool_appended = metrics.counter(
+    "event_spool_appended_total", "События, записанные в спул на диске."
+)
+spool_drained = metrics.counter(
+    "event_spool_drained_total", "События, переданные из спула в брокер."
+)
+spool_dead_letters = metrics.counter(
+    "event_spool_dead_letters_total", "Записи спула, перенесенные в dead letter."
+)
+spool_rejected = metrics.counter(
+    "event_spool_rejected_total", "События, не принятые спулом из-за лимита размера."
+)
+spool_depth = metrics.gauge("event_spool_depth", "События в спуле, ожидающие отправки.")
+spool_bytes = metrics.gauge("event_spool_bytes", "Размер сегментов спула на диске.")
+
+# Заголовок записи: длина тела и CRC32 тела
+HEADER = struct.Struct(">II")
+TOPIC_LENGTH = struct.Struct(">H")
+# -1 — событие без ключа партиции
+KEY_LENGTH = struct.Struct(">i")
+CURSOR = struct.Struct(">QQ")
+SEGMENT_SUFFIX = ".seg"
+CURSOR_FILE = "cursor"
+DEAD_LETTER_FILE = "dead_letter.spool"
+READ_CHUNK_BYTES = 1024 * 1024
+
+Position = Tuple[int, int]
+
+
+class SpoolFullError(Exception):
+    """Спул достиг максимального размера."""
+
+
+@dataclass
+class SpooledEvent:
+    """Событие из спула; position — место сразу после записи."""
+
+    topic: str
+    key: Optional[str]
+    payload: bytes
+    position: Position
+
+
+def encode_record(topic: str, key: Optional[str], payload: bytes) -> bytes:
+    topic_bytes = topic.encode()
+    key_bytes = key.encode() if key is not None else b""
+    body = b"".join(
+        (
+            TOPIC_LENGTH.pack(len(topic_bytes)),
+            topic_bytes,
+            KEY_LENGTH.pack(len(key_bytes) if key is not None else -1),
+            key_bytes,
+            payload,
+        )
+    )
+    return HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_body(body: bytes) -> Tuple[str, Optional[str], bytes]:
+    """
+    :raises ValueError: Если тело записи повреждено.
+    """
+    try:
+        (topic_length,) = TOPIC_LENGTH.unpack_from(body, 0)
+        position = TOPIC_LENGTH.size
+        topic = body[position : position + topic_length].decode()
+        position += topic_length
+        (key_length,) = KEY_LENGTH.unpack_from(body, position)
+        position += KEY_LENGTH.size
+        key = None
+        if key_length >= 0:
+            key = body[position : position + key_length].decode()
+            position += key_length
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed spool record: {e}") from e
+    return topic, key, body[position:]
+
+
+def _scan(data: bytes) -> Tuple[int, int]:
+    """
+    Количество целых записей от начала data и конец последней из них.
+    Записи с неверным CRC считаются: при чтении они уйдут в dead letter.
+    """
+    count = 0
+    position = 0
+    while position + HEADER.size <= len(data):
+        length, _ = HEADER.unpack_from(data, position)
+        end = position + HEADER.size + length
+        if end > len(data):
+            break
+        count += 1
+        position = end
+    return count, position
+
+
+class EventSpool:
+    """
+    Спул событий на диске на время недоступности брокера.
+
+    Файл только дописывается; записи с длиной и CRC32 идут в сегменты
+    <номер>.seg, новый сегмент начинается при превышении segment_max_bytes.
+    Запись считается принятой после fsync; fsync выполняется пачкой для всех
+    записей, накопленных за fsync_interval_ms (групповая фиксация), поэтому
+    одновременные запросы платят за один fsync. Чтение идет строго по порядку
+    записи от сохраненного курсора; полностью разобранные сегменты удаляются.
+
+    При открытии неполная запись в конце последнего сегмента (обрыв записи
+    при сбое) обрезается. Записи с неверным CRC и события, которые брокер
+    отвергает, переносятся в dead_letter.spool в том же формате.
+
+    Используется только из потока event loop.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = 16 * 1024 * 1024,
+        max_bytes: int = 1024 * 1024 * 1024,
+        fsync_interval_ms: int = 5,
+    ):
+        """
+        :param directory: Каталог сегментов спула.
+        :param segment_max_bytes: Размер сегмента, после которого начинается новый.
+        :param max_bytes: Максимальный размер спула; сверх него события не принимаются.
+        :param fsync_interval_ms: Сколько копить записи перед общим fsync.
+        """
+        self._directory = directory
+        self._segment_max_bytes = segment_max_bytes
+        self._max_bytes = max_bytes
+        self._fsync_interval_seconds = fsync_interval_ms / 1000
+        self._sizes: Dict[int, int] = {}
+        self._active = 0
+        self._fd: Optional[int] = None
+        self._cursor: Position = (0, 0)
+        self._pending = 0
+        self._written = 0
+        self._synced = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        self._appended = asyncio.Event()
+        spool_depth.set_function(lambda: self._pending)
+        spool_bytes.set_function(lambda: sum(self._sizes.values()))
+
+    @property
+    def pending(self) -> int:
+        """События, еще не переданные из спула."""
+        return self._pending
+
+    def open(self) -> None:
+        """Открыть спул и восстановить курсор и недоставленные события после перезапуска."""
+        if self._fd is not None:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        indexes = sorted(int(path.stem) for path in self._directory.glob(f"*{SEGMENT_SUFFIX}"))
+        cursor = self._load_cursor()
+        if cursor is None or cursor[0] not in indexes:
+            cursor = (indexes[0], 0) if indexes else (0, 0)
+        for index in [index for index in indexes if index < cursor[0]]:
+            self._segment_path(index).unlink()
+            indexes.remove(index)
+        if not indexes:
+            indexes = [cursor[0]]
+            self._segment_path(cursor[0]).touch()
+
+        self._pending = 0
+        for index in indexes:
+            data = self._segment_path(index).read_bytes()
+            start = cursor[1] if index == cursor[0] else 0
+            count, valid_end = _scan(data[start:])
+            self._pending += count
+            if index == indexes[-1] and start + valid_end < len(data):
+                logger.warning(
+                    f"Event spool segment {index}: truncating "
+                    f"{len(data) - start - valid_end} byte(s) of an incomplete write."
+                )
+                os.truncate(self._segment_path(index), start + valid_end)
+                data = data[: start + valid_end]
+            self._sizes[index] = len(data)
+
+        self._active = indexes[-1]
+        self._cursor = (cursor[0], min(cursor[1], self._sizes[cursor[0]]))
+        self._fd = os.open(self._segment_path(self._active), os.O_WRONLY | os.O_APPEND)
+        if self._pending:
+            logger.warning(f"Event spool recovered {self._pending} undelivered event(s).")
+
+    async def close(self) -> None:
+        if self._fd is None:
+            return
+        await self._sync()
+        os.close(self._fd)
+        self._fd = None
+
+    async def append(self, topic: str, key: Optional[str], payload: bytes) -> None:
+        """
+        Записать событие и дождаться fsync.
+
+        :raises SpoolFullError: Если спул достиг максимального размера.
+        :raises OSError: Если запись на диск не удалась.
+        """
+        record = encode_record(topic, key, payload)
+        if sum(self._sizes.values()) + len(record) > self._max_bytes:
+            spool_rejected.inc()
+            raise SpoolFullError(f"Event spool is full ({self._max_bytes} bytes).")
+        if (
+            self._sizes[self._active] > 0
+            and self._sizes[self._active] + len(record) > self._segment_max_bytes
+        ):
+            self._rotate()
+        written = 0
+        while written < len(record):
+            written += os.write(self._fd, record[written:])
+        self._sizes[self._active] += len(record)
+        self._pending += 1
+        self._written += 1
+        spool_appended.inc()
+        self._appended.set()
+        await self._sync()
+
+    async def wait_for_events(self, timeout: float) -> None:
+        """Дождаться непустого спула (или таймаута)."""
+        if self._pending:
+            return
+        self._appended.clear()
+        try:
+            await asyncio.wait_for(self._appended.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def read_batch(self, max_records: int) -> List[SpooledEvent]:
+        """
+        Следующие события по порядку, не сдвигая курсор (его сдвигает commit).
+        Пачка не выходит за границу сегмента.
+        """
+        while True:
+            segment, offset = self._cursor
+            end = self._sizes[segment]
+            if offset >= end:
+                if segment == self._active:
+                    return []
+                self._drop_segment(segment)
+                continue
+            events, corrupt = self._read_records(segment, offset, end, max_records)
+            if events:
+                return events
+            raw, next_offset = corrupt
+            self._write_dead_letter(encode_record("", None, raw))
+            spool_dead_letters.inc(reason="corrupt")
+            logger.error(
+                f"Event spool segment {segment}: corrupt record at offset {offset} "
+                "moved to dead letter."
+            )
+            self._move_cursor((segment, next_offset), 1)
+
+    def commit(self, events: List[SpooledEvent]) -> None:
+        """Отметить события, переданные в брокер."""
+        if events:
+            self._move_cursor(events[-1].position, len(events))
+            spool_drained.inc(len(events))
+
+    def dead_letter(self, event: SpooledEvent, reason: str) -> None:
+        """Перенести событие, которое не удается отправить, в dead letter."""
+        self._write_dead_letter(encode_record(event.topic, event.key, event.payload))
+        spool_dead_letters.inc(reason=reason)
+        self._move_cursor(event.position, 1)
+
+    def _read_records(
+        self, segment: int, offset: int, end: int, max_records: int
+    ) -> Tuple[List[SpooledEvent], Optional[Tuple[bytes, int]]]:
+        """События от offset; если первая же запись испорчена — (её байты, смещение после нее)."""
+        data = self._read(segment, offset, min(end - offset, READ_CHUNK_BYTES))
+        events: List[SpooledEvent] = []
+        position = 0
+        while len(events) < max_records and position < len(data):
+            if offset + position + HEADER.size > end:
+                # Обрыв заголовка в конце сегмента
+                return events, None if events else (data[position:], end)
+            if position + HEADER.size > len(data):
+                break
+            length, crc = HEADER.unpack_from(data, position)
+            record_end = position + HEADER.size + length
+            if offset + record_end > end:
+                # Длина выходит за сегмент: остаток сегмента не читается
+                rest = self._read(segment, offset + position, end - offset - position)
+                return events, None if events else (rest, end)
+            if record_end > len(data):
+                if events:
+                    break
+                # Запись больше фрагмента чтения
+                data = self._read(segment, offset, HEADER.size + length)
+                continue
+            body = data[position + HEADER.size : record_end]
+            try:
+                if zlib.crc32(body) != crc:
+                    raise ValueError("CRC mismatch")
+                topic, key, payload = decode_body(body)
+            except ValueError:
+                return events, None if events else (body, offset + record_end)
+            events.append(SpooledEvent(topic, key, payload, (segment, offset + record_end)))
+            position = record_end
+        return events, None
+
+    def _read(self, segment: int, offset: int, size: int) -> bytes:
+        with self._segment_path(segment).open("rb") as file:
+            file.seek(offset)
+            return file.read(size)
+
+    def _rotate(self) -> None:
+        os.fsync(self._fd)
+        os.close(self._fd)
+        self._synced = self._written
+        self._active += 1
+        self._sizes[self._active] = 0
+        self._fd = os.open(
+            self._segment_path(self._active), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+
+    async def _sync(self) -> None:
+        target = self._written
+        while self._synced < target:
+            if self._sync_task is None:
+                self._sync_task = asyncio.create_task(self._fsync())
+            await asyncio.shield(self._sync_task)
+
+    async def _fsync(self) -> None:
+        try:
+            # Копим записи конкурентных запросов, чтобы закрыть их одним fsync
+            await asyncio.sleep(self._fsync_interval_seconds)
+            written, fd = self._written, self._fd
+            try:
+                await asyncio.to_thread(os.fsync, fd)
+            except OSError as e:
+                # Сегмент закрыт при ротации, а перед закрытием уже сброшен на диск
+                if e.errno != errno.EBADF:
+                    raise
+            self._synced = max(self._synced, written)
+        finally:
+            self._sync_task = None
+
+    def _move_cursor(self, position: Position, count: int) -> None:
+        self._cursor = position
+        self._pending = max(0, self._pending - count)
+        self._save_cursor()
+
+    def _drop_segment(self, segment: int) -> None:
+        self._segment_path(segment).unlink(missing_ok=True)
+        del self._sizes[segment]
+        self._cursor = (min(self._sizes), 0)
+        self._save_cursor()
+
+    def _load_cursor(self) -> Optional[Position]:
+        path = self._directory / CURSOR_FILE
+        try:
+            return CURSOR.unpack(path.read_bytes())
+        except (FileNotFoundError, struct.error):
+            return None
+
+    def _save_cursor(self) -> None:
+        # Без fsync: потерянное обновление курсора приводит к повторной отправке, не к потере
+        path = self._directory / CURSOR_FILE
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(CURSOR.pack(*self._cursor))
+        os.replace(temporary, path)
+
+    def _write_dead_letter(self, record: bytes) -> None:
+        fd = os.open(
+            self._directory / DEAD_LETTER_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        try:
+            os.write(fd, record)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _segment_path(self, index: int) -> Path:
+        return self._directory / f"{index:012d}{SEGMENT_SUFFIX}"
@@ -0,0 +1,268 @@
+import asyncio
+import itertools
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from aiokafka import TopicPartition
+
+from infrastructure.repositories.event_codec import EventCodec, JsonEventCodec
+from infrastructure.repositories.event_routing import EventRouting
+
+
+@dataclass
+class InMemoryRecord:
+    """Сообщение в партиции; поля совпадают с используемыми полями ConsumerRecord."""
+
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[bytes]
+    value: bytes
+    timestamp: int
+
+
+class InMemoryBroker:
+    """
+    Брокер в памяти процесса вместо Kafka для тестов и бенчмарков потребителей.
+
+    Воспроизводит то, на что опираются EventConsumerRunner и обработчики:
+    партиции с порядком внутри партиции, выбор партиции по ключу, группы
+    потребителей с распределением партиций и ребалансировкой при входе и
+    выходе участника, зафиксированные смещения группы и highwater.
+    Ребалансировка «жадная», как в Kafka: сначала у всех участников
+    отзываются все партиции, затем раздаются заново. Фиксация смещения
+    партиции, которой потребитель уже не владеет, отклоняется.
+    """
+
+    def __init__(
+        self,
+        partitions: int = 4,
+        codec: Optional[EventCodec] = None,
+        routing: Optional[EventRouting] = None,
+    ):
+        """
+        :param partitions: Количество партиций у создаваемых топиков.
+        :param codec: Сериализация событий в send_event; по умолчанию JSON.
+        :param routing: Выбор топика и ключа партиции в send_event.
+        """
+        self._partitions = partitions
+        self._codec = codec or JsonEventCodec()
+        self._routing = routing or EventRouting()
+        self._logs: Dict[str, List[List[InMemoryRecord]]] = {}
+        self._committed: Dict[Tuple[str, TopicPartition], int] = {}
+        self._groups: Dict[str, List["InMemoryConsumer"]] = {}
+        self._owners: Dict[Tuple[str, TopicPartition], "InMemoryConsumer"] = {}
+        self._round_robin = itertools.count()
+        self._lock = asyncio.Lock()
+        self._appended = asyncio.Event()
+
+    def partitions_for(self, topic: str) -> List[TopicPartition]:
+        """Партиции топика; топик создается при первом обращении."""
+        log = self._logs.setdefault(topic, [[] for _ in range(self._partitions)])
+        return [TopicPartition(topic, partition) for partition in range(len(log))]
+
+    def send(self, topic: str, value: bytes, key: Optional[bytes] = None) -> InMemoryRecord:
+        """Записать сообщение: с ключом — в партицию по хешу ключа, без — по кругу."""
+        self.partitions_for(topic)
+        log = self._logs[topic]
+        if key is None:
+            partition = next(self._round_robin) % len(log)
+        else:
+            partition = zlib.crc32(key) % len(log)
+        record = InMemoryRecord(
+            topic, partition, len(log[partition]), key, value, int(time.time() * 1000)
+        )
+        log[partition].append(record)
+        self._notify()
+        return record
+
+    def send_event(
+        self, event: Any, topic: str, key: Optional[str] = None
+    ) -> InMemoryRecord:
+        """Записать событие так же, как это делает AioKafkaEventPublisher."""
+        if key is None:
+            key = self._routing.key_for(event)
+        return self.send(
+            self._routing.topic_for(event, topic),
+            self._codec.encode(event),
+            key.encode() if key is not None else None,
+        )
+
+    def consumer(
+        self, group_id: Optional[str], auto_offset_reset: str = "earliest"
+    ) -> "InMemoryConsumer":
+        """Создать потребителя; подходит как ConsumerFactory для EventConsumerRunner."""
+        return InMemoryConsumer(self, group_id, auto_offset_reset)
+
+    def highwater(self, partition: TopicPartition) -> int:
+        return len(self._logs[partition.topic][partition.partition])
+
+    def committed(self, group_id: str, partition: TopicPartition) -> Optional[int]:
+        return self._committed.get((group_id, partition))
+
+    def lag(self, group_id: str, topic: str) -> int:
+        """Сообщения топика, еще не зафиксированные группой."""
+        return sum(
+            self.highwater(partition) - (self.committed(group_id, partition) or 0)
+            for partition in self.partitions_for(topic)
+        )
+
+    def _notify(self) -> None:
+        self._appended.set()
+        self._appended = asyncio.Event()
+
+    async def _join(self, consumer: "InMemoryConsumer") -> None:
+        async with self._lock:
+            if consumer.group_id is None:
+                await consumer._assign(
+                    [p for topic in consumer.topics for p in self.partitions_for(topic)]
+                )
+                return
+            self._groups.setdefault(consumer.group_id, []).append(consumer)
+            await self._rebalance(consumer.group_id)
+
+    async def _leave(self, consumer: "InMemoryConsumer") -> None:
+        async with self._lock:
+            if consumer.group_id is None:
+                return
+            members = self._groups[consumer.group_id]
+            members.remove(consumer)
+            for key in [key for key, owner in self._owners.items() if owner is consumer]:
+                del self._owners[key]
+            await self._rebalance(consumer.group_id)
+
+    async def _rebalance(self, group_id: str) -> None:
+        members = self._groups[group_id]
+        for member in members:
+            await member._revoke()
+        partitions = sorted(
+            {p for member in members for topic in member.topics for p in self.partitions_for(topic)}
+        )
+        assignments: Dict[InMemoryConsumer, List[TopicPartition]] = {m: [] for m in members}
+        for index, partition in enumerate(partitions):
+            candidates = [m for m in members if partition.topic in m.topics]
+            owner = candidates[index % len(candidates)]
+            assignments[owner].append(partition)
+            self._owners[(group_id, partition)] = owner
+        for member, assigned in assignments.items():
+            await member._assign(assigned)
+
+    def _fetch(
+        self, consumer: "InMemoryConsumer", max_records: Optional[int]
+    ) -> Dict[TopicPartition, List[InMemoryRecord]]:
+        batches: Dict[TopicPartition, List[InMemoryRecord]] = {}
+        remaining = max_records if max_records is not None else float("inf")
+        for partition in consumer._fetchable():
+            if remaining <= 0:
+                break
+            log = self._logs[partition.topic][partition.partition]
+            position = consumer._positions[partition]
+            records = log[position : position + int(min(remaining, len(log)))]
+            if records:
+                batches[partition] = records
+                consumer._positions[partition] = position + len(records)
+                remaining -= len(records)
+        return batches
+
+    def _commit(
+        self, consumer: "InMemoryConsumer", offsets: Dict[TopicPartition, int]
+    ) -> None:
+        if consumer.group_id is None:
+            raise RuntimeError("Offsets can only be committed by a consumer group member.")
+        for partition in offsets:
+            if self._owners.get((consumer.group_id, partition)) is not consumer:
+                raise RuntimeError(
+                    f"Commit failed: {partition} is not assigned to this consumer."
+                )
+        for partition, offset in offsets.items():
+            self._committed[(consumer.group_id, partition)] = offset
+
+
+class InMemoryConsumer:
+    """Потребитель InMemoryBroker с подмножеством API AIOKafkaConsumer."""
+
+    def __init__(self, broker: InMemoryBroker, group_id: Optional[str], auto_offset_reset: str):
+        self.group_id = group_id
+        self.topics: List[str] = []
+        self._broker = broker
+        self._auto_offset_reset = auto_offset_reset
+        self._listener: Any = None
+        self._joined = False
+        self._assignment: List[TopicPartition] = []
+        self._positions: Dict[TopicPartition, int] = {}
+        self._paused: Set[TopicPartition] = set()
+
+    async def start(self) -> None:
+        pass
+
+    def subscribe(self, topics: Iterable[str], listener: Any = None) -> None:
+        self.topics = list(topics)
+        self._listener = listener
+
+    async def getmany(
+        self, timeout_ms: int = 0, max_records: Optional[int] = None
+    ) -> Dict[TopicPartition, List[InMemoryRecord]]:
+        if not self._joined:
+            self._joined = True
+            await self._broker._join(self)
+        # Ребалансировка идет под блокировкой брокера: ждем ее окончания
+        async with self._broker._lock:
+            appended = self._broker._appended
+            batches = self._broker._fetch(self, max_records)
+        if batches or not timeout_ms:
+            return batches
+        try:
+            await asyncio.wait_for(appended.wait(), timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            return {}
+        async with self._broker._lock:
+            return self._broker._fetch(self, max_records)
+
+    async def commit(self, offsets: Dict[TopicPartition, int]) -> None:
+        self._broker._commit(self, offsets)
+
+    def assignment(self) -> Set[TopicPartition]:
+        return set(self._assignment)
+
+    def highwater(self, partition: TopicPartition) -> int:
+        return self._broker.highwater(partition)
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self._paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self._paused.difference_update(partitions)
+        self._broker._notify()
+
+    async def stop(self) -> None:
+        if self._joined:
+            self._joined = False
+            await self._broker._leave(self)
+        self._assignment = []
+
+    def _fetchable(self) -> List[TopicPartition]:
+        return [p for p in self._assignment if p not in self._paused]
+
+    async def _revoke(self) -> None:
+        revoked, self._assignment = self._assignment, []
+        if revoked and self._listener is not None:
+            await self._listener.on_partitions_revoked(revoked)
+
+    async def _assign(self, partitions: List[TopicPartition]) -> None:
+        self._assignment = partitions
+        self._paused.clear()
+        for partition in partitions:
+            committed = (
+                self._broker.committed(self.group_id, partition)
+                if self.group_id is not None
+                else None
+            )
+            if committed is None:
+                committed = (
+                    0 if self._auto_offset_reset == "earliest" else self._broker.highwater(partition)
+                )
+            self._positions[partition] = committed
+        if self._listener is not None:
+            await self._listener.on_partitions_assigned(partitions)
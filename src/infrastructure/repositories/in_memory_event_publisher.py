@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from infrastructure.repositories.event_codec import EventCodec, JsonEventCodec
+from infrastructure.repositories.event_routing import EventRouting
+from logger import get_logger
+from metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+events_published = metrics.counter(
+    "events_published_total", "События, подтвержденные брокером."
+)
+events_dropped = metrics.counter(
+    "in_memory_events_dropped_total", "События, не поместившиеся в очередь подписчика."
+)
+subscriber_failures = metrics.counter(
+    "in_memory_subscriber_failures_total", "Ошибки подписчиков издателя в памяти."
+)
+queue_depth = metrics.gauge(
+    "in_memory_event_queue_depth", "События в очереди подписчика издателя в памяти."
+)
+
+# Подписчик получает событие в том же виде, что и потребитель брокера (словарь)
+Subscriber = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class _Subscription:
+    topic: str
+    name: str
+    callback: Subscriber
+    queue: "asyncio.Queue[bytes]"
+    task: Optional[asyncio.Task] = field(default=None)
+
+
+class InMemoryEventPublisher(IEventPublisher):
+    """
+    Издатель событий в ограниченные очереди процесса вместо Kafka.
+
+    Локальный режим без брокера: сервис запускается и обслуживает запросы без
+    кластера Kafka, а задержка записи не включает обращение к брокеру. У каждого
+    подписчика своя очередь и задача, доставляющая события по порядку публикации.
+    События сериализуются кодеком при публикации и десериализуются перед
+    доставкой, как при работе через брокер, поэтому подписчиками могут быть те
+    же обработчики, что и у потребителей Kafka.
+
+    Заполненная очередь подписчика либо задерживает публикацию (block_when_full),
+    либо отбрасывает событие с записью в метрику. События живут только в
+    памяти процесса и теряются при его остановке.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        block_when_full: bool = True,
+        flush_timeout_seconds: float = 10.0,
+        routing: Optional[EventRouting] = None,
+        codec: Optional[EventCodec] = None,
+    ):
+        """
+        :param max_queue_size: Емкость очереди каждого подписчика.
+        :param block_when_full: Ждать места в очереди вместо отбрасывания события.
+        :param flush_timeout_seconds: Сколько ждать разбора очередей при остановке.
+        :param routing: Выбор топика и ключа партиции.
+        :param codec: Сериализация событий; по умолчанию JSON.
+        """
+        self._max_queue_size = max_queue_size
+        self._block_when_full = block_when_full
+        self._flush_timeout_seconds = flush_timeout_seconds
+        self._routing = routing or EventRouting()
+        self._codec = codec or JsonEventCodec()
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        self._started = False
+
+    def subscribe(self, topic: str, callback: Subscriber, name: Optional[str] = None) -> None:
+        """
+        Подписать обработчик на топик. Обработчик может быть корутиной;
+        его ошибки логируются и не прерывают доставку следующих событий.
+        """
+        subscription = _Subscription(
+            topic,
+            name or getattr(callback, "__qualname__", repr(callback)),
+            callback,
+            asyncio.Queue(self._max_queue_size),
+        )
+        self._subscriptions.setdefault(topic, []).append(subscription)
+        queue_depth.set_function(
+            subscription.queue.qsize, topic=topic, subscriber=subscription.name
+        )
+        if self._started:
+            subscription.task = asyncio.create_task(self._deliver(subscription))
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for subscription in self._all_subscriptions():
+            subscription.task = asyncio.create_task(self._deliver(subscription))
+        logger.info("In-memory event publisher started.")
+
+    async def flush(self) -> None:
+        """Дождаться, пока подписчики разберут уже опубликованные события."""
+        joins = [s.queue.join() for s in self._all_subscriptions() if s.task is not None]
+        if not joins:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*joins), self._flush_timeout_seconds)
+        except asyncio.TimeoutError:
+            pending = sum(s.queue.qsize() for s in self._all_subscriptions())
+            logger.error(f"{pending} in-memory event(s) were not delivered before shutdown.")
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        await self.flush()
+        tasks = [s.task for s in self._all_subscriptions() if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in self._all_subscriptions():
+            subscription.task = None
+        self._started = False
+        logger.info("In-memory event publisher stopped.")
+
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
+        """
+        Поставить событие в очереди подписчиков топика.
+
+        :raises RuntimeError: Если издатель не запущен.
+        """
+        if not self._started:
+            raise RuntimeError("In-memory event publisher is not started. Call .start() first.")
+        await self._enqueue(self._routing.topic_for(event, topic), self._codec.encode(event))
+
+    async def publish_batch(self, events: List[Tuple[Any, str, Optional[str]]]) -> None:
+        """Опубликовать пачку (событие, топик, ключ); bytes ставятся в очередь как есть."""
+        if not self._started:
+            raise RuntimeError("In-memory event publisher is not started. Call .start() first.")
+        for event, topic, _ in events:
+            await self._enqueue(
+                topic, event if isinstance(event, bytes) else self._codec.encode(event)
+            )
+
+    async def _enqueue(self, topic: str, data: bytes) -> None:
+        for subscription in self._subscriptions.get(topic, ()):
+            if self._block_when_full:
+                await subscription.queue.put(data)
+                continue
+            try:
+                subscription.queue.put_nowait(data)
+            except asyncio.QueueFull:
+                events_dropped.inc(topic=topic, subscriber=subscription.name)
+        events_published.inc(topic=topic)
+
+    async def _deliver(self, subscription: _Subscription) -> None:
+        while True:
+            data = await subscription.queue.get()
+            try:
+                result = subscription.callback(self._codec.decode(data))
+                if inspect.isawaitable(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                subscriber_failures.inc(topic=subscription.topic, subscriber=subscription.name)
+                logger.error(
+                    f"In-memory subscriber {subscription.name} failed on {subscription.topic}: {e}"
+                )
+            finally:
+                subscription.queue.task_done()
+
+    def _all_subscriptions(self) -> List[_Subscription]:
+        return [s for subscriptions in self._subscriptions.values() for s in subscriptions]
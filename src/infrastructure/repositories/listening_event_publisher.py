@@ -0,0 +1,46 @@
+from typing import Any, Callable, List, Optional
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+
+EventListener = Callable[[Any, str], None]
+
+
+class ListeningEventPublisher(IEventPublisher):
+    """
+    Издатель-обертка, уведомляющий локальных слушателей о публикуемых событиях.
+
+    Слушатели вызываются в том же процессе после попытки публикации, даже если
+    брокер ее не принял: изменение в БД к этому моменту уже зафиксировано.
+    Используется для сброса локальных кэшей.
+    """
+
+    def __init__(self, inner: IEventPublisher):
+        """
+        :param inner: Издатель, который отправляет события в брокер.
+        """
+        self._inner: IEventPublisher = inner
+        self._listeners: List[EventListener] = []
+
+    def add_listener(self, listener: EventListener) -> None:
+        """Подписать слушателя; он вызывается как listener(event, topic)."""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        await self._inner.start()
+
+    async def flush(self) -> None:
+        await self._inner.flush()
+
+    async def stop(self) -> None:
+        await self._inner.stop()
+
+    def notify(self, event: Any, topic: str) -> None:
+        """Уведомить слушателей о событии, опубликованном в обход этого издателя
+        (например, через outbox после фиксации транзакции)."""
+        for listener in self._listeners:
+            listener(event, topic)
+
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
+        try:
+            await self._inner.publish_event(event, topic, key)
+        finally:
+            self.notify(event, topic)
@@ -0,0 +1,74 @@
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Integer, bindparam, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from infrastructure.models.event_outbox_model import EventOutbox, outbox_slot
+from infrastructure.repositories.event_codec import EventCodec, JsonEventCodec
+from infrastructure.repositories.event_routing import EventRouting
+from infrastructure.repositories.unit_of_work import after_commit, commit
+
+EventListener = Callable[[Any, str], None]
+
+_INSERT_EVENT = insert(EventOutbox).values(
+    slot=outbox_slot(bindparam("slot_key"), bindparam("slots", type_=Integer))
+)
+
+
+class OutboxEventPublisher(IEventPublisher):
+    """
+    Издатель, записывающий события в таблицу event_outbox сессии запроса.
+
+    Внутри единицы работы событие фиксируется вместе с изменением, которое
+    его породило, и не теряется при недоступности брокера; в брокер его
+    отправляет OutboxRelayWorker. Запрос не ждет Kafka. Локальные слушатели
+    (сброс кэшей процесса) вызываются после фиксации транзакции.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        notify: Optional[EventListener] = None,
+        routing: Optional[EventRouting] = None,
+        codec: Optional[EventCodec] = None,
+        slots: int = 16,
+    ):
+        """
+        :param session: Сессия запроса, общая с репозиториями.
+        :param notify: Уведомление локальных слушателей о событии после фиксации.
+        :param routing: Выбор топика и ключа партиции; сохраняются вместе с событием.
+        :param codec: Сериализация события в payload; по умолчанию JSON.
+        :param slots: Число слотов relay; то же, что у OutboxRelayWorker.
+        """
+        self._session = session
+        self._slots = slots
+        self._notify = notify
+        self._routing = routing or EventRouting()
+        self._codec = codec or JsonEventCodec()
+
+    async def start(self) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
+        partition_key = key if key is not None else self._routing.key_for(event)
+        await self._session.execute(
+            _INSERT_EVENT,
+            {
+                "topic": self._routing.topic_for(event, topic),
+                "partition_key": partition_key,
+                "slot_key": partition_key,
+                "slots": self._slots,
+                "event_type": getattr(event, "event_type", type(event).__name__),
+                "payload": self._codec.encode(event),
+            },
+        )
+        await commit(self._session)
+        if self._notify is not None:
+            await after_commit(self._session, lambda: self._notify(event, topic))
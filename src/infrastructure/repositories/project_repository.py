@@ -1,16 +1,54 @@
 from core.interfaceRepositories.project_irepository import IProjectRepository
-from core.entites.core_entities import Project, TaskStatus
+from core.entites.core_entities import (
+    Project,
+    ProjectMember,
+    ProjectRole,
+    ProjectSuggestion,
+    ProjectTaskStats,
+    TaskStatus,
+)
+from core.exceptions import NotFoundError
 from infrastructure.models.project_task_model import Project as ProjectModel
+from infrastructure.repositories.unit_of_work import commit
+from infrastructure.models.project_task_model import (
+    ProjectMember as ProjectMemberModel,
+)
+from infrastructure.models.project_task_model import (
+    ProjectTaskStats as ProjectTaskStatsModel,
+)
 
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import any_, bindparam, func, select, update, delete
 from uuid import UUID
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+# Горячий запрос строится один раз при импорте
+_GET_PROJECT = select(ProjectModel).where(
+    ProjectModel.id == bindparam("project_id"), ProjectModel.deleted_at.is_(None)
+)
+_GET_PROJECTS_BY_IDS = select(ProjectModel).where(
+    ProjectModel.id == any_(bindparam("project_ids", type_=ARRAY(ProjectModel.id.type))),
+    ProjectModel.deleted_at.is_(None),
+)
+_GET_PROJECT_TIMESTAMP = select(ProjectModel.updated_at).where(
+    ProjectModel.id == bindparam("project_id"), ProjectModel.deleted_at.is_(None)
+)
+# Читается при каждой проверке доступа; обслуживается index-only scan
+# по покрывающему индексу ix_project_members_user_project
+_GET_MEMBER_ROLES = select(ProjectMemberModel.project_id, ProjectMemberModel.role).where(
+    ProjectMemberModel.user_id == bindparam("user_id")
+)
+
 
 class ProjectRepository(IProjectRepository):
     """Репозиторий для работы с проектами в базе данных."""
 
+    # Ввод короче длины триграммы ищется только по префиксу
+    TRIGRAM_MIN_QUERY_LENGTH = 3
+
     def __init__(self, session: AsyncSession):
         """Инициализация репозитория с сессией базы данных."""
         self._session = session
@@ -24,6 +62,7 @@ class ProjectRepository(IProjectRepository):
             description=model.description,
             created_at=model.created_at,
             updated_at=model.updated_at,
+            deleted_at=model.deleted_at,
         )
 
     @staticmethod
@@ -37,15 +76,38 @@ class ProjectRepository(IProjectRepository):
             updated_at=entity.updated_at,
         )
 
-    async def create_project(self, project: Project) -> Project:
+    @staticmethod
+    def _map_member_to_entity(model: ProjectMemberModel) -> ProjectMember:
+        """Преобразовать модель участника в сущность."""
+        return ProjectMember(
+            project_id=UUID(str(model.project_id)),
+            user_id=UUID(str(model.user_id)),
+            role=model.role,
+            created_at=model.created_at,
+        )
+
+    async def create_project(
+        self, project: Project, owner_id: Optional[UUID] = None
+    ) -> Project:
         """Создать новый проект.
+        Проект и его владелец сохраняются в одной транзакции.
         :param project: Объект проекта.
+        :param owner_id: ID пользователя-владельца (опционально).
         :return: Созданный объект проекта.
         """
 
         project_model = self._map_to_model(project)
         self._session.add(project_model)
-        await self._session.commit()
+        if owner_id is not None:
+            await self._session.flush()
+            self._session.add(
+                ProjectMemberModel(
+                    project_id=project_model.id,
+                    user_id=owner_id,
+                    role=ProjectRole.OWNER,
+                )
+            )
+        await commit(self._session)
         await self._session.refresh(project_model)
         return self._map_to_entity(project_model)
 
@@ -54,28 +116,55 @@ class ProjectRepository(IProjectRepository):
         :param project_id: ID проекта.
         :return: Объект проекта или None, если не найден.
         """
-        result = await self._session.execute(
-            select(ProjectModel).where(ProjectModel.id == project_id)
-        )
+        result = await self._session.execute(_GET_PROJECT, {"project_id": project_id})
         project_model = result.scalars().first()
         return self._map_to_entity(project_model) if project_model else None
 
+    async def get_projects_by_ids(self, project_ids: List[UUID]) -> List[Project]:
+        """Получить проекты по списку ID одним запросом.
+        :param project_ids: ID проектов.
+        :return: Найденные проекты в произвольном порядке.
+        """
+        if not project_ids:
+            return []
+        result = await self._session.execute(
+            _GET_PROJECTS_BY_IDS, {"project_ids": list(project_ids)}
+        )
+        return [self._map_to_entity(model) for model in result.scalars()]
+
+    async def get_project_timestamp(self, project_id: UUID) -> Optional[datetime]:
+        """Время последнего изменения проекта.
+        :param project_id: ID проекта.
+        :return: updated_at или None, если проект не найден.
+        """
+        result = await self._session.execute(
+            _GET_PROJECT_TIMESTAMP, {"project_id": project_id}
+        )
+        return result.scalar_one_or_none()
+
     async def update_project(
-        self, project_id: UUID, update_data: dict
+        self,
+        project_id: UUID,
+        update_data: dict,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Project]:
         """Обновить проект по ID с частичными данными.
         :param project_id: ID проекта.
         :param update_data: Словарь с обновляемыми данными.
-        :return: Объект проекта или None, если не найден.
+        :param expected_updated_at: Обновить, только если время изменения совпадает (If-Match).
+        :return: Объект проекта или None, если не найден или условие не выполнено.
         """
+        conditions = [ProjectModel.id == project_id, ProjectModel.deleted_at.is_(None)]
+        if expected_updated_at is not None:
+            conditions.append(ProjectModel.updated_at == expected_updated_at)
         stmt = (
             update(ProjectModel)
-            .where(ProjectModel.id == project_id)
+            .where(*conditions)
             .values(**update_data)
             .execution_options(synchronize_session="fetch")
         )
         result = await self._session.execute(stmt)
-        await self._session.commit()
+        await commit(self._session)
         return await self.get_project(project_id) if result.rowcount > 0 else None
 
     async def delete_project(self, project_id: UUID) -> bool:
@@ -85,9 +174,35 @@ class ProjectRepository(IProjectRepository):
         """
         stmt = delete(ProjectModel).where(ProjectModel.id == project_id)
         result = await self._session.execute(stmt)
-        await self._session.commit()
+        await commit(self._session)
         return result.rowcount > 0
 
+    async def mark_project_deleted(self, project_id: UUID) -> bool:
+        """Пометить проект удаленным.
+        :param project_id: ID проекта.
+        :return: True, если проект был помечен, иначе False.
+        """
+        stmt = (
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id, ProjectModel.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        await commit(self._session)
+        return result.rowcount > 0
+
+    async def list_deleted_project_ids(self) -> List[UUID]:
+        """Список ID проектов, ожидающих вычистки задач.
+        :return: Список ID проектов.
+        """
+        result = await self._session.execute(
+            select(ProjectModel.id)
+            .where(ProjectModel.deleted_at.isnot(None))
+            .order_by(ProjectModel.deleted_at)
+        )
+        return [UUID(str(project_id)) for project_id in result.scalars().all()]
+
     async def list_projects(
         self, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> List[Project]:
@@ -96,7 +211,7 @@ class ProjectRepository(IProjectRepository):
         :param offset: Смещение для пагинации.
         :return: Список объектов проектов.
         """
-        stmt = select(ProjectModel)
+        stmt = select(ProjectModel).where(ProjectModel.deleted_at.is_(None))
         if limit is not None:
             stmt = stmt.limit(limit)
         if offset is not None:
@@ -104,15 +219,200 @@ class ProjectRepository(IProjectRepository):
         result = await self._session.execute(stmt)
         return [self._map_to_entity(project) for project in result.scalars().all()]
 
+    async def list_member_projects(
+        self, user_id: UUID, limit: Optional[int] = None, after: Optional[UUID] = None
+    ) -> List[Project]:
+        """Проекты пользователя с пагинацией по ключу.
+        Участия читаются по индексу (user_id, project_id) уже в порядке project_id,
+        поэтому страница не зависит от глубины и не требует сортировки.
+        :param user_id: ID пользователя.
+        :param limit: Максимальное количество проектов.
+        :param after: ID последнего проекта предыдущей страницы.
+        :return: Список проектов.
+        """
+        stmt = (
+            select(ProjectModel)
+            .join(ProjectMemberModel, ProjectMemberModel.project_id == ProjectModel.id)
+            .where(
+                ProjectMemberModel.user_id == user_id,
+                ProjectModel.deleted_at.is_(None),
+            )
+            .order_by(ProjectMemberModel.project_id)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if after is not None:
+            stmt = stmt.where(ProjectMemberModel.project_id > after)
+        result = await self._session.execute(stmt)
+        return [self._map_to_entity(project) for project in result.scalars().all()]
+
+    async def get_member_roles(self, user_id: UUID) -> Dict[UUID, ProjectRole]:
+        """Роли пользователя во всех его проектах одним запросом.
+        :param user_id: ID пользователя.
+        :return: Словарь {ID проекта: роль}.
+        """
+        result = await self._session.execute(_GET_MEMBER_ROLES, {"user_id": user_id})
+        return {UUID(str(project_id)): role for project_id, role in result.all()}
+
+    async def list_members(self, project_id: UUID) -> List[ProjectMember]:
+        """Участники проекта.
+        :param project_id: ID проекта.
+        :return: Список участников.
+        """
+        result = await self._session.execute(
+            select(ProjectMemberModel)
+            .where(ProjectMemberModel.project_id == project_id)
+            .order_by(ProjectMemberModel.created_at)
+        )
+        return [self._map_member_to_entity(m) for m in result.scalars().all()]
+
+    async def add_member(
+        self, project_id: UUID, user_id: UUID, role: ProjectRole
+    ) -> ProjectMember:
+        """Добавить участника или изменить роль существующего.
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        :param role: Роль участника.
+        :return: Участник проекта.
+        """
+        stmt = (
+            insert(ProjectMemberModel)
+            .values(project_id=project_id, user_id=user_id, role=role)
+            .on_conflict_do_update(
+                index_elements=[ProjectMemberModel.project_id, ProjectMemberModel.user_id],
+                set_={"role": role},
+            )
+            .returning(ProjectMemberModel)
+        )
+        try:
+            result = await self._session.execute(stmt)
+            member = self._map_member_to_entity(result.scalars().one())
+            await commit(self._session)
+        except IntegrityError:
+            await self._session.rollback()
+            raise NotFoundError(f"User with ID {user_id} not found.")
+        return member
+
+    async def remove_member(self, project_id: UUID, user_id: UUID) -> bool:
+        """Исключить участника из проекта.
+        :param project_id: ID проекта.
+        :param user_id: ID пользователя.
+        :return: True, если участник был исключен, иначе False.
+        """
+        result = await self._session.execute(
+            delete(ProjectMemberModel).where(
+                ProjectMemberModel.project_id == project_id,
+                ProjectMemberModel.user_id == user_id,
+            )
+        )
+        await commit(self._session)
+        return result.rowcount > 0
+
+    async def get_task_stats(
+        self, project_ids: List[UUID]
+    ) -> Dict[UUID, ProjectTaskStats]:
+        """Получить счетчики задач по статусам одним запросом по первичному ключу.
+        :param project_ids: Список ID проектов.
+        :return: Словарь {ID проекта: счетчики}.
+        """
+        stats = {
+            project_id: ProjectTaskStats(project_id=project_id)
+            for project_id in project_ids
+        }
+        if not stats:
+            return stats
+        result = await self._session.execute(
+            select(
+                ProjectTaskStatsModel.project_id,
+                ProjectTaskStatsModel.status,
+                ProjectTaskStatsModel.task_count,
+            ).where(ProjectTaskStatsModel.project_id.in_(list(stats)))
+        )
+        for project_id, status, task_count in result.all():
+            stats[project_id].counts[status] = task_count
+        return stats
+
     async def get_project_by_filter(self, filters: Dict[str, Any]) -> Optional[Project]:
         """
         Получить проект по фильтру.
         :param filters: Словарь вида {"id": ..., "name": ...}
         :return: Объект Project или None, если не найден.
         """
-        stmt = select(ProjectModel)
+        stmt = select(ProjectModel).where(ProjectModel.deleted_at.is_(None))
         for field, value in filters.items():
             stmt = stmt.where(getattr(ProjectModel, field) == value)
         result = await self._session.execute(stmt)
         project_model = result.scalars().first()
         return self._map_to_entity(project_model) if project_model else None
+
+    async def search_projects(
+        self, query: str, limit: int, user_id: Optional[UUID] = None
+    ) -> List[ProjectSuggestion]:
+        """
+        Автодополнение названий проектов.
+
+        Короткий ввод ищется по префиксу через btree-индекс ix_projects_name_prefix,
+        более длинный — по сходству слов (pg_trgm, оператор <%) через GIN-индекс
+        ix_projects_name_trgm; совпадения по префиксу ранжируются выше.
+
+        :param query: Введенная строка в нижнем регистре.
+        :param limit: Максимальное количество подсказок.
+        :param user_id: Искать только среди проектов этого пользователя (опционально).
+        :return: Список ProjectSuggestion.
+        """
+        # Побайтовое сравнение (COLLATE "C") совпадает с порядком индекса префиксов
+        name_lower = func.lower(ProjectModel.name).collate("C")
+
+        if len(query) < self.TRIGRAM_MIN_QUERY_LENGTH:
+            # Префикс задан диапазоном, а не LIKE: так индекс используется и для
+            # сортировки, и в обобщенном плане подготовленного запроса
+            upper_bound = query[:-1] + chr(ord(query[-1]) + 1)
+            stmt = (
+                select(
+                    ProjectModel.id,
+                    ProjectModel.name,
+                    func.similarity(ProjectModel.name, query).label("score"),
+                )
+                .where(
+                    ProjectModel.deleted_at.is_(None),
+                    name_lower >= query,
+                    name_lower < upper_bound,
+                )
+                .order_by(name_lower)
+                .limit(limit)
+            )
+        else:
+            prefix = (
+                query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                + "%"
+            )
+            is_prefix = func.lower(ProjectModel.name).like(
+                bindparam("prefix", prefix), escape="\\"
+            )
+            score = func.word_similarity(query, ProjectModel.name)
+            stmt = (
+                select(ProjectModel.id, ProjectModel.name, score.label("score"))
+                .where(
+                    ProjectModel.deleted_at.is_(None),
+                    bindparam("query", query).op("<%")(ProjectModel.name),
+                )
+                .order_by(is_prefix.desc(), score.desc(), name_lower)
+                .limit(limit)
+            )
+
+        if user_id is not None:
+            # Проверка участия — поиск по покрывающему индексу для каждого кандидата
+            stmt = stmt.where(
+                select(ProjectMemberModel.project_id)
+                .where(
+                    ProjectMemberModel.user_id == user_id,
+                    ProjectMemberModel.project_id == ProjectModel.id,
+                )
+                .exists()
+            )
+
+        result = await self._session.execute(stmt)
+        return [
+            ProjectSuggestion(id=project_id, name=name, score=float(score))
+            for project_id, name, score in result.all()
+        ]
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+FIELD_TYPES = ("uuid", "string", "timestamp", "enum", "int")
+
+
+@dataclass(frozen=True)
+class SchemaField:
+    name: str
+    type: str
+    symbols: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class EventSchema:
+    """Версия схемы события: поля в порядке их записи в сообщении."""
+
+    event_type: str
+    version: int
+    fields: Tuple[SchemaField, ...]
+
+
+def _parse_schema(path: Path) -> EventSchema:
+    document = orjson.loads(path.read_bytes())
+    fields = []
+    for field in document["fields"]:
+        if field["type"] not in FIELD_TYPES:
+            raise ValueError(f"{path}: unknown type {field['type']!r} of field {field['name']}.")
+        if field["type"] == "enum" and not field.get("symbols"):
+            raise ValueError(f"{path}: enum field {field['name']} has no symbols.")
+        fields.append(SchemaField(field["name"], field["type"], tuple(field.get("symbols", ()))))
+    return EventSchema(document["event_type"], int(document["version"]), tuple(fields))
+
+
+class FileSchemaRegistry:
+    """
+    Реестр схем событий из каталога файлов <EventType>.v<N>.json.
+
+    Заменяет внешний schema registry: схемы версионируются вместе с кодом.
+    Издатель пишет событие по последней версии схемы его типа, потребитель
+    читает по версии из заголовка сообщения. Новая версия добавляется новым
+    файлом; старые файлы не удаляются, пока в брокере есть сообщения этой версии.
+    """
+
+    def __init__(self, directory: Path):
+        self._schemas: Dict[Tuple[str, int], EventSchema] = {}
+        self._latest: Dict[str, EventSchema] = {}
+        for path in sorted(directory.glob("*.v*.json")):
+            schema = _parse_schema(path)
+            self._schemas[(schema.event_type, schema.version)] = schema
+            latest = self._latest.get(schema.event_type)
+            if latest is None or latest.version < schema.version:
+                self._latest[schema.event_type] = schema
+
+    def get(self, event_type: str, version: int) -> Optional[EventSchema]:
+        return self._schemas.get((event_type, version))
+
+    def latest(self, event_type: str) -> Optional[EventSchema]:
+        return self._latest.get(event_type)
+
+    def event_types(self) -> List[str]:
+        return sorted(self._latest)
@@ -0,0 +1,69 @@
+from typing import Any, Optional
+
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from infrastructure.repositories.event_codec import EventCodec, JsonEventCodec
+from infrastructure.repositories.event_routing import EventRouting
+from infrastructure.repositories.event_spool import EventSpool
+from logger import get_logger
+
+logger = get_logger()
+
+
+class SpoolingEventPublisher(IEventPublisher):
+    """
+    Издатель-обертка, сохраняющий в спул на диске события, которые брокер не принял.
+
+    Изменение в БД к моменту публикации уже зафиксировано, поэтому сбой
+    брокера не должен превращаться в ошибку запроса: событие записывается в
+    EventSpool, и запрос завершается успешно. SpoolDrainWorker отправляет
+    события из спула по порядку, когда брокер снова доступен. Пока спул не
+    пуст, новые события тоже идут в спул, чтобы не обогнать сохраненные.
+    Ошибка возвращается вызывающему коду, только если событие не удалось
+    сохранить и в спул.
+    """
+
+    def __init__(
+        self,
+        inner: IEventPublisher,
+        spool: EventSpool,
+        routing: Optional[EventRouting] = None,
+        codec: Optional[EventCodec] = None,
+    ):
+        """
+        :param inner: Издатель, который отправляет события в брокер.
+        :param spool: Спул событий на диске.
+        :param routing: Выбор топика и ключа партиции; сохраняются вместе с событием.
+        :param codec: Сериализация события в спул; по умолчанию JSON.
+        """
+        self._inner = inner
+        self._spool = spool
+        self._routing = routing or EventRouting()
+        self._codec = codec or JsonEventCodec()
+
+    async def start(self) -> None:
+        self._spool.open()
+        await self._inner.start()
+
+    async def flush(self) -> None:
+        await self._inner.flush()
+
+    async def stop(self) -> None:
+        await self._inner.stop()
+        await self._spool.close()
+
+    async def publish_event(self, event: Any, topic: str, key: Optional[str] = None) -> None:
+        """
+        :raises SpoolFullError: Если брокер недоступен, а спул заполнен.
+        :raises OSError: Если брокер недоступен, а запись в спул не удалась.
+        """
+        if not self._spool.pending:
+            try:
+                await self._inner.publish_event(event, topic, key)
+                return
+            except Exception as e:
+                logger.warning(f"Broker rejected {type(event).__name__}, spooling it: {e}")
+        await self._spool.append(
+            self._routing.topic_for(event, topic),
+            key if key is not None else self._routing.key_for(event),
+            self._codec.encode(event),
+        )
@@ -0,0 +1,91 @@
+from typing import Any, AsyncIterator, List, Sequence
+from uuid import UUID
+
+from core.entites.core_entities import TaskBulkLoadResult, TaskStatus
+from core.interfaceRepositories.task_bulk_iloader import (
+    TASK_IMPORT_COLUMNS,
+    ITaskBulkLoader,
+)
+from infrastructure.postgres_db import Database
+
+STAGING_TABLE = "task_import_staging"
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMPORARY TABLE {STAGING_TABLE} (
+    line integer NOT NULL,
+    id uuid NOT NULL,
+    title varchar NOT NULL,
+    description varchar,
+    status task_status_enum NOT NULL,
+    assignee_id uuid,
+    created_at timestamp without time zone NOT NULL,
+    updated_at timestamp without time zone NOT NULL
+) ON COMMIT DROP
+"""
+
+# id задач глобально уникальны (GET /tasks/{id} ищет без проекта), а первичный
+# ключ (project_id, id) ловит только повтор внутри проекта. Строки с id, занятым
+# задачей другого проекта (в том числе в архиве), возвращаются как ошибки.
+CONFLICTS_SQL = f"""
+SELECT s.line, s.id
+FROM {STAGING_TABLE} AS s
+WHERE EXISTS (SELECT 1 FROM tasks AS t WHERE t.id = s.id AND t.project_id <> $1)
+   OR EXISTS (SELECT 1 FROM tasks_archive AS a WHERE a.id = s.id AND a.project_id <> $1)
+ORDER BY s.line
+"""
+
+# Одна вставка на весь импорт: триггеры счетчиков и истории статусов уровня
+# оператора срабатывают один раз. Задачи, уже существующие в проекте (в том
+# числе в архиве), пропускаются, поэтому повторный импорт того же файла с id
+# ничего не дублирует. id, занятые в других проектах, не вставляются.
+MERGE_SQL = f"""
+INSERT INTO tasks (id, project_id, title, description, status, assignee_id, created_at, updated_at)
+SELECT s.id, $1, s.title, s.description, s.status, s.assignee_id, s.created_at, s.updated_at
+FROM {STAGING_TABLE} AS s
+WHERE NOT EXISTS (SELECT 1 FROM tasks AS t WHERE t.id = s.id AND t.project_id <> $1)
+  AND NOT EXISTS (SELECT 1 FROM tasks_archive AS a WHERE a.id = s.id)
+ORDER BY s.line
+ON CONFLICT (project_id, id) DO NOTHING
+RETURNING id, title, status
+"""
+
+
+class TaskBulkLoader(ITaskBulkLoader):
+    """
+    Массовая загрузка задач через COPY во временную таблицу.
+
+    Строки копируются пачками протоколом COPY (asyncpg copy_records_to_table)
+    во временную таблицу и переносятся в tasks одним INSERT ... SELECT в той
+    же транзакции: при ошибке не остается частично загруженного импорта.
+    Загрузка идет через собственное соединение из пула, без ORM.
+    """
+
+    def __init__(self, database: Database):
+        self._database = database
+
+    async def load(
+        self, project_id: UUID, batches: AsyncIterator[List[Sequence[Any]]]
+    ) -> TaskBulkLoadResult:
+        async with self._database.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            async with driver_connection.transaction():
+                await driver_connection.execute(CREATE_STAGING_SQL)
+                staged = 0
+                async for batch in batches:
+                    await driver_connection.copy_records_to_table(
+                        STAGING_TABLE, records=batch, columns=TASK_IMPORT_COLUMNS
+                    )
+                    staged += len(batch)
+                # Временные таблицы не анализируются автоматически
+                await driver_connection.execute(f"ANALYZE {STAGING_TABLE}")
+                conflicts = await driver_connection.fetch(CONFLICTS_SQL, project_id)
+                rows = await driver_connection.fetch(MERGE_SQL, project_id)
+        return TaskBulkLoadResult(
+            staged=staged,
+            conflicts=[(row["line"], UUID(str(row["id"]))) for row in conflicts],
+            # asyncpg возвращает собственный тип UUID, который не сериализуется в события
+            inserted=[
+                (UUID(str(row["id"])), row["title"], TaskStatus[row["status"]]) for row in rows
+            ],
+        )
@@ -0,0 +1,52 @@
+from typing import Any, AsyncIterator, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, union_all
+
+from core.interfaceRepositories.task_export_ireader import (
+    TASK_EXPORT_COLUMNS,
+    ITaskExportReader,
+)
+from infrastructure.models.project_task_model import Task as TaskModel
+from infrastructure.models.project_task_model import TaskArchive as TaskArchiveModel
+from infrastructure.postgres_db import Database
+
+# Без ORDER BY: сортировка всего проекта заставила бы БД материализовать
+# результат до отдачи первой строки
+_PROJECT_TASKS = union_all(
+    *(
+        select(*(getattr(model, name) for name in TASK_EXPORT_COLUMNS)).where(
+            model.project_id == bindparam("project_id")
+        )
+        for model in (TaskModel, TaskArchiveModel)
+    )
+)
+
+
+class TaskExportReader(ITaskExportReader):
+    """
+    Потоковое чтение задач проекта через серверный курсор.
+
+    Выгрузка длится дольше запроса и переживает сессию запроса, поэтому
+    читатель берет из пула собственное соединение на время выгрузки.
+    Чтение идет в транзакции REPEATABLE READ READ ONLY: задачи, перенесенные
+    в архив во время выгрузки, не попадут в нее дважды и не потеряются.
+    """
+
+    def __init__(self, database: Database):
+        self._database = database
+
+    async def iter_project_tasks(
+        self, project_id: UUID, chunk_size: int
+    ) -> AsyncIterator[List[Sequence[Any]]]:
+        async with self._database.engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level="REPEATABLE READ", postgresql_readonly=True
+            )
+            async with connection.begin():
+                result = await connection.stream(
+                    _PROJECT_TASKS.execution_options(yield_per=chunk_size),
+                    {"project_id": project_id},
+                )
+                async for rows in result.partitions(chunk_size):
+                    yield rows
@@ -1,11 +1,140 @@
+from functools import lru_cache
 from core.interfaceRepositories.task_irepository import ITaskRepository
-from core.entites.core_entities import Task, TaskStatus
+from core.entites.core_entities import (
+    Task,
+    TaskSearchHit,
+    TaskStatus,
+    TaskStatusTransition,
+    TaskTimelineColumns,
+)
+from core.exceptions import InvalidRequestError
 from infrastructure.models.project_task_model import Task as TaskModel
+from infrastructure.repositories.unit_of_work import commit
+from infrastructure.models.project_task_model import TaskArchive as TaskArchiveModel
+from infrastructure.models.project_task_model import TaskStatusHistory as TaskStatusHistoryModel
+from infrastructure.models.project_task_model import (
+    TASK_IS_CLOSED,
+    TASK_IS_OPEN,
+    TASK_SEARCH_CONFIG,
+)
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import (
+    and_,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    extract,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, ENUM
+from datetime import datetime
 from uuid import UUID
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# Общие колонки tasks и tasks_archive; перечисляются явно при переносе и объединении
+TASK_COLUMNS = (
+    "id",
+    "project_id",
+    "title",
+    "description",
+    "status",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+    "version",
+)
+_TASK_RETURNING = [getattr(TaskModel, name) for name in TASK_COLUMNS]
+
+# Горячие запросы строятся один раз при импорте: на каждый вызов не создается
+# новая конструкция select(), а ключ кэша компиляции SQLAlchemy мемоизирован
+# на объекте запроса.
+_GET_TASK = select(TaskModel).where(TaskModel.id == bindparam("task_id"))
+# С ключом секционирования запрос читает одну секцию вместо всех
+_GET_TASK_IN_PROJECT = select(TaskModel).where(
+    TaskModel.project_id == bindparam("project_id"), TaskModel.id == bindparam("task_id")
+)
+_GET_ARCHIVED_TASK = select(TaskArchiveModel).where(
+    TaskArchiveModel.id == bindparam("task_id")
+)
+_GET_ARCHIVED_TASK_IN_PROJECT = select(TaskArchiveModel).where(
+    TaskArchiveModel.project_id == bindparam("project_id"),
+    TaskArchiveModel.id == bindparam("task_id"),
+)
+# Пакетное чтение по списку ID: один запрос с = ANY(:task_ids) вместо N запросов
+_GET_TASKS_BY_IDS = {
+    model: select(model).where(
+        model.id == any_(bindparam("task_ids", type_=ARRAY(model.id.type)))
+    )
+    for model in (TaskModel, TaskArchiveModel)
+}
+# Условные GET проверяют только время изменения: строка не превращается в сущность
+_GET_TASK_TIMESTAMP = {
+    (model, in_project): select(model.project_id, model.updated_at).where(
+        *(
+            [model.project_id == bindparam("project_id")] if in_project else []
+        ),
+        model.id == bindparam("task_id"),
+    )
+    for model in (TaskModel, TaskArchiveModel)
+    for in_project in (False, True)
+}
+
+# Поля, по которым разрешена сортировка списка задач
+ORDERABLE_COLUMNS = ("id", "title", "status", "assignee_id", "created_at", "updated_at")
+
+
+@lru_cache(maxsize=None)
+def _list_tasks_statement(
+    with_status: bool, order_by: Optional[str], with_limit: bool, with_offset: bool
+):
+    """Готовый запрос list_tasks по горячей таблице; вариантов конечное число.
+    С фильтром по незакрытому статусу добавляется TASK_IS_OPEN, чтобы запрос
+    обслуживался частичными индексами.
+    """
+    query = select(TaskModel).where(TaskModel.project_id == bindparam("project_id"))
+    if with_status:
+        query = query.where(TaskModel.status == bindparam("status"), TASK_IS_OPEN)
+    if order_by:
+        query = query.order_by(getattr(TaskModel, order_by))
+    if with_limit:
+        query = query.limit(bindparam("limit"))
+    if with_offset:
+        query = query.offset(bindparam("offset"))
+    return query
+
+
+@lru_cache(maxsize=None)
+def _list_tasks_with_archive_statement(
+    closed_only: bool, order_by: Optional[str], with_limit: bool, with_offset: bool
+):
+    """Задачи проекта из tasks вместе с архивом; с closed_only — только закрытые."""
+    hot = select(*[getattr(TaskModel, name) for name in TASK_COLUMNS]).where(
+        TaskModel.project_id == bindparam("project_id")
+    )
+    if closed_only:
+        hot = hot.where(TASK_IS_CLOSED)
+    archived = select(*[getattr(TaskArchiveModel, name) for name in TASK_COLUMNS]).where(
+        TaskArchiveModel.project_id == bindparam("project_id")
+    )
+    tasks = union_all(hot, archived).subquery("project_tasks")
+    query = select(tasks)
+    if order_by:
+        query = query.order_by(tasks.c[order_by])
+    if with_limit:
+        query = query.limit(bindparam("limit"))
+    if with_offset:
+        query = query.offset(bindparam("offset"))
+    return query
 
 
 class TaskRepository(ITaskRepository):
@@ -27,8 +156,16 @@ class TaskRepository(ITaskRepository):
             assignee_id=UUID(str(model.assignee_id)) if model.assignee_id else None,
             created_at=model.created_at,
             updated_at=model.updated_at,
+            version=model.version,
         )
 
+    @staticmethod
+    def _task_key(task_id: UUID, project_id: Optional[UUID], model=TaskModel) -> list:
+        """Условие выбора задачи; с project_id планировщик отсекает лишние секции."""
+        if project_id is None:
+            return [model.id == task_id]
+        return [model.project_id == project_id, model.id == task_id]
+
     @staticmethod
     def _map_to_model(entity: Task) -> TaskModel:
         """Преобразовать сущность в модель базы данных."""
@@ -41,6 +178,7 @@ class TaskRepository(ITaskRepository):
             assignee_id=entity.assignee_id,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
+            version=entity.version,
         )
 
     async def create_task(self, task: Task) -> Task:
@@ -50,50 +188,256 @@ class TaskRepository(ITaskRepository):
         """
         task_model = self._map_to_model(task)
         self._session.add(task_model)
-        await self._session.commit()
+        await commit(self._session)
         await self._session.refresh(task_model)
         return self._map_to_entity(task_model)
 
-    async def get_task(self, task_id: UUID) -> Optional[Task]:
+    async def get_task(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Task]:
         """Получить задачу по ID.
         :param task_id: ID задачи.
+        :param project_id: ID проекта; если известен, читается только одна секция.
         :return: Объект задачи или None, если не найден.
         """
+        if project_id is not None:
+            params = {"task_id": task_id, "project_id": project_id}
+            hot, archived = _GET_TASK_IN_PROJECT, _GET_ARCHIVED_TASK_IN_PROJECT
+        else:
+            params = {"task_id": task_id}
+            hot, archived = _GET_TASK, _GET_ARCHIVED_TASK
+
+        task_model = (await self._session.execute(hot, params)).scalars().first()
+        if task_model is None:
+            # Архивные задачи доступны только для чтения
+            task_model = (await self._session.execute(archived, params)).scalars().first()
+        return self._map_to_entity(task_model) if task_model else None
+
+    async def get_tasks_by_ids(self, task_ids: List[UUID]) -> List[Task]:
+        """Получить задачи по списку ID одним запросом.
+        Архив читается только для ID, не найденных среди горячих задач.
+        :param task_ids: ID задач.
+        :return: Найденные задачи в произвольном порядке.
+        """
+        if not task_ids:
+            return []
         result = await self._session.execute(
-            select(TaskModel).where(TaskModel.id == task_id)
+            _GET_TASKS_BY_IDS[TaskModel], {"task_ids": list(task_ids)}
         )
-        task_model = result.scalars().first()
-        return self._map_to_entity(task_model) if task_model else None
+        tasks = [self._map_to_entity(model) for model in result.scalars()]
+        found = {task.id for task in tasks}
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing:
+            result = await self._session.execute(
+                _GET_TASKS_BY_IDS[TaskArchiveModel], {"task_ids": missing}
+            )
+            tasks.extend(self._map_to_entity(model) for model in result.scalars())
+        return tasks
+
+    async def get_task_timestamp(
+        self, task_id: UUID, project_id: Optional[UUID] = None
+    ) -> Optional[Tuple[UUID, datetime]]:
+        """ID проекта и время последнего изменения задачи (горячей или архивной).
+        :param task_id: ID задачи.
+        :param project_id: ID проекта; если известен, читается только одна секция.
+        :return: (project_id, updated_at) или None, если задача не найдена.
+        """
+        params = {"task_id": task_id}
+        if project_id is not None:
+            params["project_id"] = project_id
+        for model in (TaskModel, TaskArchiveModel):
+            stmt = _GET_TASK_TIMESTAMP[(model, project_id is not None)]
+            row = (await self._session.execute(stmt, params)).first()
+            if row is not None:
+                return row[0], row[1]
+        return None
+
+    async def is_task_archived(self, task_id: UUID, project_id: Optional[UUID] = None) -> bool:
+        """Находится ли задача в tasks_archive.
+        :param task_id: ID задачи.
+        :param project_id: ID проекта, если известен.
+        :return: True, если задача архивная.
+        """
+        params = {"task_id": task_id}
+        if project_id is not None:
+            params["project_id"] = project_id
+        stmt = _GET_TASK_TIMESTAMP[(TaskArchiveModel, project_id is not None)]
+        return (await self._session.execute(stmt, params)).first() is not None
 
     async def update_task(
-        self, task_id: UUID, update_data: Dict[str, Any]
+        self,
+        task_id: UUID,
+        update_data: Dict[str, Any],
+        project_id: Optional[UUID] = None,
+        expected_version: Optional[int] = None,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Task]:
-        """Обновить задачу по ID с частичными данными.
+        """Обновить задачу по ID с частичными данными одним UPDATE ... RETURNING.
         :param task_id: ID задачи.
         :param update_data: Словарь с обновляемыми данными.
-        :return: Объект задачи или None, если не найден.
+        :param project_id: ID проекта (ключ секционирования), если известен.
+        :param expected_version: Обновить, только если версия задачи совпадает.
+        :param expected_updated_at: Обновить, только если время изменения совпадает (If-Match).
+        :return: Объект задачи или None, если задача не найдена или условие не выполнено.
         """
+        conditions = self._task_key(task_id, project_id)
+        if expected_version is not None:
+            conditions.append(TaskModel.version == expected_version)
+        if expected_updated_at is not None:
+            conditions.append(TaskModel.updated_at == expected_updated_at)
         stmt = (
             update(TaskModel)
-            .where(TaskModel.id == task_id)
-            .values(**update_data)
-            .execution_options(synchronize_session="fetch")
+            .where(*conditions)
+            .values(**update_data, version=TaskModel.version + 1)
+            .returning(*_TASK_RETURNING)
+            .execution_options(synchronize_session=False)
         )
-        result = await self._session.execute(stmt)
-        await self._session.commit()
+        row = (await self._session.execute(stmt)).first()
+        await commit(self._session)
+        return self._map_to_entity(row) if row else None
 
-        if result.rowcount == 0:
+    async def change_task_status(
+        self,
+        task_id: UUID,
+        new_status: TaskStatus,
+        expected_status: Optional[TaskStatus] = None,
+        project_id: Optional[UUID] = None,
+    ) -> Optional[Tuple[TaskStatus, Task]]:
+        """Сменить статус задачи одним оператором (compare-and-set).
+        Строка блокируется подзапросом FOR UPDATE, поэтому прежний статус в RETURNING
+        берется из последней зафиксированной версии: две конкурентные смены не
+        увидят один и тот же старый статус.
+        :param task_id: ID задачи.
+        :param new_status: Новый статус.
+        :param expected_status: Сменить, только если текущий статус совпадает.
+        :param project_id: ID проекта (ключ секционирования), если известен.
+        :return: (прежний статус, задача) или None, если задача не найдена,
+            статус уже равен new_status или не совпал с expected_status.
+        """
+        conditions = self._task_key(task_id, project_id)
+        if expected_status is not None:
+            conditions.append(TaskModel.status == expected_status)
+        locked = (
+            select(TaskModel.project_id, TaskModel.id, TaskModel.status)
+            .where(*conditions)
+            .with_for_update()
+            .subquery("locked")
+        )
+        stmt = (
+            update(TaskModel)
+            .where(
+                TaskModel.project_id == locked.c.project_id,
+                TaskModel.id == locked.c.id,
+                locked.c.status != new_status,
+            )
+            .values(status=new_status, version=TaskModel.version + 1)
+            .returning(locked.c.status.label("old_status"), *_TASK_RETURNING)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self._session.execute(stmt)).first()
+        await commit(self._session)
+        if row is None:
             return None
+        return TaskStatus(row.old_status), self._map_to_entity(row)
 
-        return await self.get_task(task_id)
-
-    async def delete_task(self, task_id: UUID) -> None:
+    async def delete_task(self, task_id: UUID, project_id: Optional[UUID] = None) -> None:
         """Удалить задачу по ID.
         :param task_id: ID задачи.
+        :param project_id: ID проекта (ключ секционирования), если известен.
+        """
+        stmt = delete(TaskModel).where(*self._task_key(task_id, project_id))
+        result = await self._session.execute(stmt)
+        if result.rowcount == 0:
+            stmt = delete(TaskArchiveModel).where(
+                *self._task_key(task_id, project_id, TaskArchiveModel)
+            )
+            await self._session.execute(stmt)
+        await commit(self._session)
+
+    async def delete_tasks_batch(self, project_id: UUID, batch_size: int) -> int:
+        """Удалить пачку задач проекта и зафиксировать транзакцию.
+        Сначала удаляются задачи из tasks, затем из архива; журнал статусов
+        вычищается отдельно, через delete_status_history_batch.
+        Ограничение размера пачки держит блокировки и WAL одной транзакции малыми.
+        :param project_id: ID проекта.
+        :param batch_size: Максимальное количество удаляемых задач.
+        :return: Количество удаленных задач.
+        """
+        deleted = 0
+        for model in (TaskModel, TaskArchiveModel):
+            batch_ids = (
+                select(model.id)
+                .where(model.project_id == project_id)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            stmt = (
+                delete(model)
+                .where(model.project_id == project_id, model.id.in_(batch_ids))
+                .execution_options(synchronize_session=False)
+            )
+            deleted = (await self._session.execute(stmt)).rowcount
+            if deleted:
+                break
+        await commit(self._session)
+        return deleted
+
+    async def delete_status_history_batch(self, project_id: UUID, batch_size: int) -> int:
+        """Удалить пачку записей журнала статусов проекта и зафиксировать транзакцию.
+        :param project_id: ID проекта.
+        :param batch_size: Максимальное количество удаляемых записей.
+        :return: Количество удаленных записей.
+        """
+        batch_ids = (
+            select(TaskStatusHistoryModel.id)
+            .where(TaskStatusHistoryModel.project_id == project_id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        stmt = (
+            delete(TaskStatusHistoryModel)
+            .where(
+                TaskStatusHistoryModel.project_id == project_id,
+                TaskStatusHistoryModel.id.in_(batch_ids),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        deleted = (await self._session.execute(stmt)).rowcount
+        await commit(self._session)
+        return deleted
+
+    async def archive_closed_tasks(self, closed_before: datetime, batch_size: int) -> int:
+        """Перенести пачку закрытых задач в tasks_archive одним оператором.
+        DELETE ... RETURNING и INSERT выполняются в одной транзакции, поэтому задача
+        не теряется и не дублируется; SKIP LOCKED пропускает строки, которые сейчас
+        меняет сервис.
+        :param closed_before: Переносятся задачи, не менявшиеся с этого момента.
+        :param batch_size: Максимальное количество задач в пачке.
+        :return: Количество перенесенных задач.
         """
-        stmt = delete(TaskModel).where(TaskModel.id == task_id)
-        await self._session.execute(stmt)
-        await self._session.commit()
+        batch = (
+            select(TaskModel.project_id, TaskModel.id)
+            .where(TASK_IS_CLOSED, TaskModel.updated_at < closed_before)
+            .order_by(TaskModel.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(TaskModel)
+            .where(tuple_(TaskModel.project_id, TaskModel.id).in_(batch))
+            .returning(*_TASK_RETURNING)
+            .cte("moved")
+        )
+        stmt = insert(TaskArchiveModel).from_select(
+            [*TASK_COLUMNS, "archived_at"],
+            select(
+                *[moved.c[name] for name in TASK_COLUMNS],
+                func.timezone("UTC", func.now()),
+            ),
+        )
+        result = await self._session.execute(stmt)
+        await commit(self._session)
+        return result.rowcount
 
     async def list_tasks(
         self,
@@ -104,6 +448,8 @@ class TaskRepository(ITaskRepository):
         order_by: Optional[str] = None,
     ) -> List[Task]:
         """Список задач по проекту (с фильтрацией и пагинацией).
+        Без фильтра и при status=CLOSED в выборку входит архив; остальные
+        статусы читаются только из горячей таблицы.
         :param project_id: ID проекта.
         :param status: Фильтр по статусу (опционально).
         :param limit: Максимальное количество задач.
@@ -111,21 +457,173 @@ class TaskRepository(ITaskRepository):
         :param order_by: Поле для сортировки (например, "created_at", "status").
         :return: Список объектов Task.
         """
-        query = select(TaskModel).where(TaskModel.project_id == project_id)
-
-        if status:
-            query = query.where(TaskModel.status == status)
-
-        if order_by:
-            query = query.order_by(getattr(TaskModel, order_by))
+        if order_by and order_by not in ORDERABLE_COLUMNS:
+            raise InvalidRequestError(
+                f"Cannot order tasks by '{order_by}'. Allowed: {', '.join(ORDERABLE_COLUMNS)}."
+            )
 
+        params = {"project_id": project_id}
         if limit:
-            query = query.limit(limit)
-
+            params["limit"] = limit
         if offset:
-            query = query.offset(offset)
+            params["offset"] = offset
 
-        result = await self._session.execute(query)
+        if status is None or status == TaskStatus.CLOSED:
+            query = _list_tasks_with_archive_statement(
+                status is not None, order_by or None, bool(limit), bool(offset)
+            )
+            rows = (await self._session.execute(query, params)).all()
+            return [self._map_to_entity(row) for row in rows]
+
+        query = _list_tasks_statement(
+            bool(status), order_by or None, bool(limit), bool(offset)
+        )
+        if status:
+            params["status"] = status
+
+        result = await self._session.execute(query, params)
         task_models = result.scalars().all()
 
         return [self._map_to_entity(task_model) for task_model in task_models]
+
+    async def list_status_transitions(
+        self,
+        project_id: UUID,
+        since: datetime,
+        until: datetime,
+        limit: Optional[int] = None,
+    ) -> List[TaskStatusTransition]:
+        """Переходы статусов задач проекта за период [since, until).
+        Читается диапазон индекса ix_task_status_history_project_changed_at.
+        :param project_id: ID проекта.
+        :param since: Начало периода (включительно).
+        :param until: Конец периода (не включительно).
+        :param limit: Максимальное количество переходов (опционально).
+        :return: Переходы в порядке времени.
+        """
+        stmt = (
+            select(
+                TaskStatusHistoryModel.task_id,
+                TaskStatusHistoryModel.project_id,
+                TaskStatusHistoryModel.old_status,
+                TaskStatusHistoryModel.new_status,
+                TaskStatusHistoryModel.changed_at,
+            )
+            .where(
+                TaskStatusHistoryModel.project_id == project_id,
+                TaskStatusHistoryModel.changed_at >= since,
+                TaskStatusHistoryModel.changed_at < until,
+            )
+            .order_by(TaskStatusHistoryModel.changed_at, TaskStatusHistoryModel.id)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self._session.execute(stmt)
+        return [
+            TaskStatusTransition(
+                task_id=task_id,
+                project_id=row_project_id,
+                old_status=old_status,
+                new_status=new_status,
+                changed_at=changed_at,
+            )
+            for task_id, row_project_id, old_status, new_status, changed_at in result.all()
+        ]
+
+    async def get_task_timeline_columns(self, project_id: UUID) -> TaskTimelineColumns:
+        """Временные метки всех задач проекта (горячих и архивных) одним запросом.
+        Строки сворачиваются в массивы на стороне БД: вместо тысяч строк
+        возвращается одна строка из четырех массивов.
+        :param project_id: ID проекта.
+        :return: TaskTimelineColumns; для проекта без задач — пустые списки.
+        """
+        started = func.min(TaskStatusHistoryModel.changed_at).filter(
+            TaskStatusHistoryModel.new_status == TaskStatus.IN_PROGRESS
+        )
+        completed = func.min(TaskStatusHistoryModel.changed_at).filter(
+            TaskStatusHistoryModel.new_status.in_([TaskStatus.DONE, TaskStatus.CLOSED])
+        )
+        history = (
+            select(
+                TaskStatusHistoryModel.task_id,
+                started.label("started_at"),
+                completed.label("completed_at"),
+            )
+            .where(TaskStatusHistoryModel.project_id == project_id)
+            .group_by(TaskStatusHistoryModel.task_id)
+            .subquery("history")
+        )
+        tasks = union_all(
+            *(
+                select(model.id, model.status, model.created_at).where(
+                    model.project_id == project_id
+                )
+                for model in (TaskModel, TaskArchiveModel)
+            )
+        ).subquery("project_tasks")
+
+        # Позиция значения в enum_range совпадает с порядком объявления TaskStatus
+        status_enum = ENUM(name="task_status_enum", create_type=False)
+        status_code = (
+            func.array_position(func.enum_range(cast(null(), status_enum)), tasks.c.status) - 1
+        )
+
+        def epoch(column):
+            return func.coalesce(
+                cast(extract("epoch", column), DOUBLE_PRECISION),
+                cast(literal("NaN"), DOUBLE_PRECISION),
+            )
+
+        stmt = select(
+            func.array_agg(status_code),
+            func.array_agg(epoch(tasks.c.created_at)),
+            func.array_agg(epoch(history.c.started_at)),
+            func.array_agg(epoch(history.c.completed_at)),
+        ).select_from(tasks.outerjoin(history, history.c.task_id == tasks.c.id))
+
+        status_codes, created_at, started_at, completed_at = (
+            await self._session.execute(stmt)
+        ).one()
+        return TaskTimelineColumns(
+            status_codes=status_codes or [],
+            created_at=created_at or [],
+            started_at=started_at or [],
+            completed_at=completed_at or [],
+        )
+
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        project_ids: Optional[List[UUID]] = None,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[TaskSearchHit]:
+        """Полнотекстовый поиск по GIN-индексу ix_tasks_search_vector.
+        Пагинация по ключу (rank, id): глубокие страницы не перечитывают предыдущие.
+        :param query: Поисковый запрос (синтаксис websearch).
+        :param limit: Размер страницы.
+        :param project_ids: Ограничить поиск проектами (опционально).
+        :param after: Ключ (rank, id) последнего результата предыдущей страницы.
+        :return: Список TaskSearchHit по убыванию релевантности.
+        """
+        ts_query = func.websearch_to_tsquery(TASK_SEARCH_CONFIG, query)
+        # ts_rank возвращает real; приводим к double, чтобы ключ курсора сравнивался точно
+        rank = cast(func.ts_rank(TaskModel.search_vector, ts_query), DOUBLE_PRECISION)
+
+        stmt = select(TaskModel, rank.label("rank")).where(
+            TaskModel.search_vector.op("@@")(ts_query)
+        )
+        if project_ids is not None:
+            stmt = stmt.where(TaskModel.project_id.in_(project_ids))
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(
+                or_(rank < after_rank, and_(rank == after_rank, TaskModel.id > after_id))
+            )
+        stmt = stmt.order_by(rank.desc(), TaskModel.id).limit(limit)
+
+        result = await self._session.execute(stmt)
+        return [
+            TaskSearchHit(task=self._map_to_entity(task_model), rank=task_rank)
+            for task_model, task_rank in result.all()
+        ]
@@ -0,0 +1,73 @@
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.interfaceRepositories.unit_of_work_i import IUnitOfWork
+
+# Ключи session.info: глубина открытых единиц работы и действия после фиксации
+_DEPTH = "unit_of_work_depth"
+_AFTER_COMMIT = "unit_of_work_after_commit"
+
+
+async def commit(session: AsyncSession) -> None:
+    """
+    Зафиксировать изменения репозитория.
+
+    Внутри единицы работы изменения только отправляются в БД (flush):
+    фиксирует их SqlAlchemyUnitOfWork при выходе из внешнего блока.
+    """
+    if session.info.get(_DEPTH):
+        await session.flush()
+        return
+    await session.commit()
+    await _run_after_commit(session)
+
+
+async def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """
+    Вызвать callback после фиксации текущей транзакции (или сразу, если ее нет).
+    callback может вернуть корутину: она будет дождана. При откате не вызывается.
+    """
+    if session.info.get(_DEPTH):
+        session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+    else:
+        await _call(callback)
+
+
+async def _call(callback: Callable[[], Any]) -> None:
+    result = callback()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    callbacks: List[Callable[[], Any]] = session.info.pop(_AFTER_COMMIT, [])
+    for callback in callbacks:
+        await _call(callback)
+
+
+class SqlAlchemyUnitOfWork(IUnitOfWork):
+    """Единица работы поверх сессии запроса, общей для репозиториев и outbox."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        info = self._session.info
+        depth = info.get(_DEPTH, 0)
+        info[_DEPTH] = depth + 1
+        try:
+            yield
+        except BaseException:
+            info[_DEPTH] = depth
+            if not depth:
+                info.pop(_AFTER_COMMIT, None)
+                await self._session.rollback()
+            raise
+        info[_DEPTH] = depth
+        if not depth:
+            await self._session.commit()
+            await _run_after_commit(self._session)
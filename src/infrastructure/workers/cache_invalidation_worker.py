@@ -0,0 +1,108 @@
+from typing import Any, Callable, Dict, List
+
+from infrastructure.analytics_singleton import project_analytics_cache
+from infrastructure.cache_singleton import invalidate_entity_caches, task_list_cache
+from infrastructure.event_publisher_singleton import (
+    broker_event_publisher,
+    event_codec,
+    event_routing,
+)
+from infrastructure.repositories.event_codec import EventCodec
+from infrastructure.repositories.in_memory_event_publisher import InMemoryEventPublisher
+from infrastructure.workers.event_consumer_runner import (
+    ConsumedEvent,
+    ConsumerFactory,
+    EventConsumerRunner,
+    kafka_consumer_factory,
+)
+from logger import get_logger
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+
+EventHandler = Callable[[Dict[str, Any]], None]
+
+
+class CacheInvalidationWorker:
+    """
+    Фоновый воркер, сбрасывающий локальные кэши по событиям из Kafka.
+
+    Потребитель работает без группы: каждый экземпляр сервиса читает все
+    партиции топика и получает все события, в том числе опубликованные
+    другими экземплярами. Смещения не сохраняются — после перезапуска
+    локальные кэши пусты, и пропущенные события им не нужны.
+    """
+
+    def __init__(
+        self,
+        consumer_factory: ConsumerFactory,
+        topics: List[str],
+        handlers: List[EventHandler],
+        codec: EventCodec,
+        max_batch_size: int = 500,
+        max_pending_batches: int = 4,
+    ):
+        """
+        Инициализация воркера.
+
+        :param consumer_factory: Создание потребителя Kafka (или брокера в памяти).
+        :param topics: Топики событий.
+        :param handlers: Обработчики десериализованных событий.
+        :param codec: Десериализация сообщений (читает и JSON, и msgpack).
+        :param max_batch_size: Максимум сообщений за один опрос.
+        :param max_pending_batches: Пачек в очереди партиции до ее паузы.
+        """
+        self._handlers = handlers
+        # Сброс кэша не повторяется: обработчики сами логируют свои ошибки
+        self._runner = EventConsumerRunner(
+            "cache_invalidation",
+            consumer_factory,
+            topics,
+            self._handle_batch,
+            codec,
+            group_id=None,
+            max_batch_size=max_batch_size,
+            max_pending_batches=max_pending_batches,
+            max_attempts=1,
+        )
+
+    async def start(self) -> None:
+        """Запустить воркер."""
+        await self._runner.start()
+
+    async def stop(self) -> None:
+        """Остановить воркер."""
+        await self._runner.stop()
+
+    def handle(self, event: Dict[str, Any]) -> None:
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Cache invalidation handler failed for {event}: {e}")
+
+    async def _handle_batch(self, events: List[ConsumedEvent]) -> None:
+        for consumed in events:
+            self.handle(consumed.event)
+
+
+cache_invalidation_worker = CacheInvalidationWorker(
+    kafka_consumer_factory(config.kafka_servers, auto_offset_reset="latest"),
+    event_routing.topics("task_events"),
+    [
+        invalidate_entity_caches,
+        project_analytics_cache.on_message,
+        task_list_cache.on_message,
+    ],
+    event_codec,
+    max_batch_size=config.event_consumer_max_batch_size,
+    max_pending_batches=config.event_consumer_max_pending_batches,
+)
+if isinstance(broker_event_publisher, InMemoryEventPublisher):
+    # Без Kafka события доходят до обработчиков через очереди издателя в памяти;
+    # потребитель Kafka в этом режиме не запускается
+    for topic in event_routing.topics("task_events"):
+        broker_event_publisher.subscribe(
+            topic, cache_invalidation_worker.handle, "cache_invalidation"
+        )
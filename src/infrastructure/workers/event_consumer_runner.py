@@ -0,0 +1,360 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener, TopicPartition
+
+from infrastructure.repositories.event_codec import EventCodec
+from logger import get_logger
+from metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+consumer_records = metrics.counter(
+    "consumer_records_total", "События, обработанные потребителем."
+)
+consumer_records_skipped = metrics.counter(
+    "consumer_records_skipped_total",
+    "События, пропущенные потребителем: не декодировались или обработчик не справился.",
+)
+consumer_handler_failures = metrics.counter(
+    "consumer_handler_failures_total", "Неудачные вызовы обработчика пачки событий."
+)
+consumer_commit_failures = metrics.counter(
+    "consumer_commit_failures_total", "Неудачные фиксации смещений потребителя."
+)
+consumer_rebalances = metrics.counter(
+    "consumer_rebalances_total", "Партиции, отозванные у потребителя при ребалансировке."
+)
+consumer_lag = metrics.gauge(
+    "consumer_lag", "Сообщения партиции, еще не обработанные потребителем."
+)
+
+
+@dataclass
+class ConsumedEvent:
+    """Десериализованное событие из брокера с координатами сообщения."""
+
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[str]
+    event: Dict[str, Any]
+
+
+BatchHandler = Callable[[List[ConsumedEvent]], Awaitable[None]]
+# Создает потребителя для группы (None — без группы и без фиксации смещений)
+ConsumerFactory = Callable[[Optional[str]], Any]
+
+
+def kafka_consumer_factory(
+    bootstrap_servers: str, auto_offset_reset: str = "earliest", **options: Any
+) -> ConsumerFactory:
+    """Фабрика AIOKafkaConsumer с ручной фиксацией смещений."""
+
+    def factory(group_id: Optional[str]) -> AIOKafkaConsumer:
+        return AIOKafkaConsumer(
+            bootstrap_servers=bootstrap_servers,
+            group_id=group_id,
+            enable_auto_commit=False,
+            auto_offset_reset=auto_offset_reset,
+            **options,
+        )
+
+    return factory
+
+
+class _PartitionWorker:
+    """Очередь пачек одной партиции и задача, обрабатывающая их по порядку."""
+
+    def __init__(self, partition: TopicPartition):
+        self.partition = partition
+        self.queue: "asyncio.Queue[Optional[list]]" = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        # Смещение, с которого продолжится чтение после обработанных сообщений
+        self.processed: Optional[int] = None
+        self.committed: Optional[int] = None
+        self.paused = False
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, runner: "EventConsumerRunner"):
+        self._runner = runner
+
+    async def on_partitions_revoked(self, revoked: Iterable[TopicPartition]) -> None:
+        await self._runner._revoke(list(revoked))
+
+    async def on_partitions_assigned(self, assigned: Iterable[TopicPartition]) -> None:
+        for partition in assigned:
+            self._runner._worker(partition)
+
+
+class EventConsumerRunner:
+    """
+    Потребитель топиков событий с параллельной обработкой партиций.
+
+    Цикл опроса забирает сообщения пачками (getmany) и раскладывает их по
+    очередям партиций; у каждой партиции своя задача, поэтому медленная
+    партиция не задерживает остальные, а порядок внутри партиции (внутри
+    проекта) сохраняется. Обработчик получает всю пачку партиции сразу.
+    Партиция, у которой накопилось max_pending_batches пачек, ставится на
+    паузу, пока обработчик ее не разберет.
+
+    Смещения фиксируются вручную и только после обработки: раз в
+    commit_interval_seconds, при отзыве партиций и при остановке. Доставка —
+    не менее одного раза, обработчики должны быть идемпотентны. При
+    ребалансировке отзываемые партиции дорабатывают текущую пачку, остаток
+    очереди отбрасывается (его перечитает новый владелец), обработанное
+    фиксируется до передачи партиции.
+
+    Обработчик, упавший max_attempts раз подряд, пропускает пачку: одно
+    испорченное событие не останавливает партицию навсегда.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        consumer_factory: ConsumerFactory,
+        topics: List[str],
+        handler: BatchHandler,
+        codec: EventCodec,
+        group_id: Optional[str] = None,
+        max_batch_size: int = 500,
+        max_pending_batches: int = 4,
+        poll_timeout_ms: int = 1000,
+        commit_interval_seconds: float = 1.0,
+        max_attempts: int = 3,
+        retry_interval_seconds: float = 1.0,
+        revoke_timeout_seconds: float = 30.0,
+    ):
+        """
+        :param name: Имя потребителя: метка метрик и логов.
+        :param consumer_factory: Создание потребителя (Kafka или InMemoryBroker.consumer).
+        :param topics: Топики событий.
+        :param handler: Обработчик пачки событий одной партиции.
+        :param codec: Десериализация сообщений.
+        :param group_id: Группа потребителей; без группы каждый экземпляр читает
+            все партиции и смещения не фиксируются.
+        :param max_batch_size: Максимум сообщений за один опрос.
+        :param max_pending_batches: Пачек в очереди партиции до ее паузы.
+        :param poll_timeout_ms: Сколько ждать сообщений в одном опросе.
+        :param commit_interval_seconds: Период фиксации смещений.
+        :param max_attempts: Попыток обработать пачку до ее пропуска.
+        :param retry_interval_seconds: Пауза перед повторной попыткой (растет с попыткой).
+        :param revoke_timeout_seconds: Сколько ждать текущую пачку отзываемой партиции.
+        """
+        self.name = name
+        self._consumer_factory = consumer_factory
+        self._topics = topics
+        self._handler = handler
+        self._codec = codec
+        self._group_id = group_id
+        self._max_batch_size = max_batch_size
+        self._max_pending_batches = max_pending_batches
+        self._poll_timeout_ms = poll_timeout_ms
+        self._commit_interval_seconds = commit_interval_seconds
+        self._max_attempts = max_attempts
+        self._retry_interval_seconds = retry_interval_seconds
+        self._revoke_timeout_seconds = revoke_timeout_seconds
+        self._consumer: Any = None
+        self._workers: Dict[TopicPartition, _PartitionWorker] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить потребителя."""
+        if self._task is not None:
+            return
+        self._consumer = self._consumer_factory(self._group_id)
+        await self._consumer.start()
+        self._consumer.subscribe(self._topics, listener=_RebalanceListener(self))
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Consumer {self.name} started: topics {', '.join(self._topics)}.")
+
+    async def stop(self) -> None:
+        """Остановить опрос, дождаться текущих пачек и зафиксировать обработанное."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._revoke(list(self._workers), rebalance=False)
+        await self._consumer.stop()
+        self._consumer = None
+        logger.info(f"Consumer {self.name} stopped.")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_commit = loop.time() + self._commit_interval_seconds
+        while True:
+            try:
+                batches = await self._consumer.getmany(
+                    timeout_ms=self._poll_timeout_ms, max_records=self._max_batch_size
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Consumer {self.name} poll failed: {e}")
+                await asyncio.sleep(self._retry_interval_seconds)
+                continue
+            for partition, records in batches.items():
+                if records:
+                    self._dispatch(partition, records)
+            self._update_lag()
+            if loop.time() >= next_commit:
+                await self._commit(list(self._workers.values()))
+                next_commit = loop.time() + self._commit_interval_seconds
+
+    def _worker(self, partition: TopicPartition) -> _PartitionWorker:
+        worker = self._workers.get(partition)
+        if worker is None:
+            worker = self._workers[partition] = _PartitionWorker(partition)
+            worker.task = asyncio.create_task(self._process(worker))
+        return worker
+
+    def _dispatch(self, partition: TopicPartition, records: list) -> None:
+        if partition not in self._consumer.assignment():
+            # Партицию отозвали, пока пачка была в пути: ее перечитает новый владелец
+            return
+        worker = self._worker(partition)
+        worker.queue.put_nowait(records)
+        if worker.queue.qsize() >= self._max_pending_batches and not worker.paused:
+            self._consumer.pause(partition)
+            worker.paused = True
+
+    async def _process(self, worker: _PartitionWorker) -> None:
+        while True:
+            records = await worker.queue.get()
+            if records is None:
+                return
+            try:
+                await self._handle(worker.partition, records)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Задача партиции не должна умереть: иначе ее очередь не разбирается,
+                # а приостановленная партиция больше не возобновляется
+                consumer_records_skipped.inc(
+                    len(records), consumer=self.name, topic=worker.partition.topic
+                )
+                logger.error(
+                    f"Consumer {self.name} skips {len(records)} record(s) of "
+                    f"{worker.partition.topic}[{worker.partition.partition}] from offset "
+                    f"{records[0].offset} after an unexpected error: {e}"
+                )
+            worker.processed = records[-1].offset + 1
+            if worker.paused and worker.queue.qsize() < self._max_pending_batches:
+                worker.paused = False
+                if self._consumer is not None:
+                    self._consumer.resume(worker.partition)
+
+    async def _handle(self, partition: TopicPartition, records: list) -> None:
+        labels = {"consumer": self.name, "topic": partition.topic}
+        events = []
+        for record in records:
+            try:
+                event = self._codec.decode(record.value)
+            except ValueError as e:
+                consumer_records_skipped.inc(**labels)
+                logger.error(
+                    f"Consumer {self.name} skips malformed event "
+                    f"{partition.topic}[{partition.partition}]@{record.offset}: {e}"
+                )
+                continue
+            if not isinstance(event, dict):
+                consumer_records_skipped.inc(**labels)
+                continue
+            key = record.key.decode() if record.key is not None else None
+            events.append(
+                ConsumedEvent(record.topic, record.partition, record.offset, key, event)
+            )
+        if not events:
+            return
+
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await self._handler(events)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                consumer_handler_failures.inc(**labels)
+                if attempt == self._max_attempts:
+                    consumer_records_skipped.inc(len(events), **labels)
+                    logger.error(
+                        f"Consumer {self.name} skips {len(events)} event(s) of "
+                        f"{partition.topic}[{partition.partition}] from offset "
+                        f"{events[0].offset} after {attempt} attempt(s): {e}"
+                    )
+                    return
+                logger.warning(f"Consumer {self.name} handler failed, retrying: {e}")
+                await asyncio.sleep(self._retry_interval_seconds * attempt)
+                continue
+            consumer_records.inc(len(events), **labels)
+            return
+
+    async def _revoke(self, partitions: List[TopicPartition], rebalance: bool = True) -> None:
+        """Доработать текущие пачки партиций, отбросить очереди и зафиксировать смещения."""
+        workers = [self._workers.pop(p) for p in partitions if p in self._workers]
+        for worker in workers:
+            while not worker.queue.empty():
+                worker.queue.get_nowait()
+            worker.queue.put_nowait(None)
+        tasks = [worker.task for worker in workers if worker.task is not None]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self._revoke_timeout_seconds)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(
+                    f"Consumer {self.name}: {len(pending)} partition(s) revoked "
+                    "before the current batch finished."
+                )
+                await asyncio.wait(pending)
+        await self._commit(workers)
+        for worker in workers:
+            consumer_lag.set(
+                0,
+                consumer=self.name,
+                topic=worker.partition.topic,
+                partition=worker.partition.partition,
+            )
+        if rebalance and workers:
+            consumer_rebalances.inc(len(workers), consumer=self.name)
+
+    async def _commit(self, workers: List[_PartitionWorker]) -> None:
+        if self._group_id is None or self._consumer is None:
+            return
+        offsets = {
+            worker.partition: worker.processed
+            for worker in workers
+            if worker.processed is not None and worker.processed != worker.committed
+        }
+        if not offsets:
+            return
+        try:
+            await self._consumer.commit(offsets)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Смещения будут зафиксированы следующей попыткой или перечитаны новым владельцем
+            consumer_commit_failures.inc(consumer=self.name)
+            logger.warning(f"Consumer {self.name} commit failed: {e}")
+            return
+        for worker in workers:
+            if worker.partition in offsets:
+                worker.committed = offsets[worker.partition]
+
+    def _update_lag(self) -> None:
+        for partition, worker in self._workers.items():
+            highwater = self._consumer.highwater(partition)
+            if highwater is None or worker.processed is None:
+                continue
+            consumer_lag.set(
+                max(0, highwater - worker.processed),
+                consumer=self.name,
+                topic=partition.topic,
+                partition=partition.partition,
+            )
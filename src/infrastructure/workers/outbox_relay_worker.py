@@ -0,0 +1,197 @@
+import asyncio
+import random
+from typing import Any, Optional
+
+from sqlalchemy import Integer, bindparam, delete, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from infrastructure.event_publisher_singleton import broker_event_publisher, event_publisher
+from infrastructure.models.event_outbox_model import EventOutbox, outbox_slot
+from infrastructure.postgres_db import Database, database
+from infrastructure.repositories.event_publisher import AioKafkaEventPublisher
+from infrastructure.repositories.in_memory_event_publisher import InMemoryEventPublisher
+from logger import get_logger
+from metrics import get_metrics
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+metrics = get_metrics()
+
+outbox_relayed = metrics.counter("outbox_relayed_total", "События, переданные из outbox в брокер.")
+outbox_relay_failures = metrics.counter(
+    "outbox_relay_failures_total", "Неудачные попытки передать пачку outbox в брокер."
+)
+
+# Пространство advisory-блокировок слотов outbox ("outb")
+OUTBOX_LOCK_SPACE = 0x6F757462
+
+_SLOTS = bindparam("slots", type_=Integer)
+# Непустые слоты одним запросом: по пробе индекса (slot, id) на слот
+_SLOT_SERIES = func.generate_series(0, _SLOTS - 1).table_valued("slot").render_derived("slots")
+_BUSY_SLOTS = select(_SLOT_SERIES.c.slot).where(
+    exists().where(EventOutbox.slot == _SLOT_SERIES.c.slot)
+)
+# Блокировка уровня сессии: слот, оказавшийся пустым, отпускается сразу, а не
+# в конце транзакции; занятый другим relay слот пропускаем, а не ждем
+_TRY_LOCK_SLOT = select(
+    func.pg_try_advisory_lock(bindparam("lock_space"), bindparam("slot"))
+)
+_UNLOCK_SLOT = select(func.pg_advisory_unlock(bindparam("lock_space"), bindparam("slot")))
+_CLAIM_BATCH = (
+    select(EventOutbox.id, EventOutbox.topic, EventOutbox.partition_key, EventOutbox.payload)
+    .where(EventOutbox.slot == bindparam("slot"))
+    .order_by(EventOutbox.id)
+    .limit(bindparam("batch_size"))
+)
+# Строки, записанные при другом числе слотов, переносятся в слоты текущего
+_RESLOT = (
+    update(EventOutbox)
+    .where(EventOutbox.slot != outbox_slot(EventOutbox.partition_key, _SLOTS))
+    .values(slot=outbox_slot(EventOutbox.partition_key, _SLOTS))
+)
+_DELETE_RELAYED = delete(EventOutbox).where(EventOutbox.id.in_(bindparam("ids", expanding=True)))
+
+
+class OutboxRelayWorker:
+    """
+    Фоновый воркер, публикующий события из event_outbox в брокер.
+
+    Ключи партиций распределены по lock_slots слотам; слот строки хранится
+    в event_outbox и вычисляется при записи. Проход находит непустые слоты,
+    берет advisory-блокировку первого свободного из них, публикует его
+    старейшие строки по порядку id с ожиданием подтверждений и удаляет их в
+    той же транзакции. Несколько экземпляров сервиса разбирают разные слоты
+    параллельно, а события одного ключа (проекта) публикует только один relay
+    за раз и строго по порядку записи: пачка, не дошедшая до брокера,
+    откатывается и отправляется повторно раньше более поздних строк слота.
+    Доставка не менее одного раза, потребители должны быть идемпотентны.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        publisher: AioKafkaEventPublisher | InMemoryEventPublisher,
+        batch_size: int,
+        poll_interval_seconds: float,
+        retry_interval_seconds: float,
+        lock_slots: int = 16,
+    ):
+        """
+        Инициализация воркера.
+
+        :param db: Объект базы данных, из которого берутся сессии.
+        :param publisher: Издатель брокера (без outbox и локальных слушателей).
+        :param batch_size: Максимум событий в пачке.
+        :param poll_interval_seconds: Пауза между проверками пустого outbox.
+        :param retry_interval_seconds: Пауза после ошибки публикации.
+        :param lock_slots: Число слотов ключей; одинаково у всех экземпляров.
+        """
+        self._db = db
+        self._publisher = publisher
+        self._batch_size = batch_size
+        self._lock_slots = lock_slots
+        self._poll_interval_seconds = poll_interval_seconds
+        self._retry_interval_seconds = retry_interval_seconds
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self, event: Any = None, topic: Optional[str] = None) -> None:
+        """Начать проход, не дожидаясь паузы (слушатель событий этого процесса)."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """Запустить воркер."""
+        if self._task is not None:
+            return
+        async with self._db.engine.begin() as connection:
+            result = await connection.execute(_RESLOT, {"slots": self._lock_slots})
+        if result.rowcount:
+            logger.info(f"Outbox relay moved {result.rowcount} event(s) to new slots.")
+        self._task = asyncio.create_task(self._run())
+        logger.info("Outbox relay worker started.")
+
+    async def stop(self) -> None:
+        """Остановить воркер. Незавершенная пачка откатывается и будет отправлена позже."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def relay_once(self) -> int:
+        """Опубликовать одну пачку событий. :return: Количество опубликованных событий."""
+        # Блокировки уровня сессии держатся на одном соединении до явного снятия
+        async with self._db.engine.connect() as connection:
+            busy = list(await connection.scalars(_BUSY_SLOTS, {"slots": self._lock_slots}))
+            await connection.commit()
+            # Случайный порядок: экземпляры не толкаются за одни и те же слоты
+            random.shuffle(busy)
+            for slot in busy:
+                lock_params = {"lock_space": OUTBOX_LOCK_SPACE, "slot": slot}
+                locked = await connection.scalar(_TRY_LOCK_SLOT, lock_params)
+                if not locked:
+                    await connection.commit()
+                    continue
+                try:
+                    relayed = await self._relay_slot(connection, slot)
+                finally:
+                    # Соединение вернется в пул: блокировку снимаем явно и после ошибки
+                    await connection.rollback()
+                    await connection.scalar(_UNLOCK_SLOT, lock_params)
+                    await connection.commit()
+                if relayed:
+                    return relayed
+        return 0
+
+    async def _relay_slot(self, connection: AsyncConnection, slot: int) -> int:
+        """Опубликовать и удалить старейшие строки захваченного слота."""
+        rows = (
+            await connection.execute(
+                _CLAIM_BATCH, {"slot": slot, "batch_size": self._batch_size}
+            )
+        ).all()
+        if not rows:
+            return 0
+        await self._publisher.publish_batch(
+            [(row.payload, row.topic, row.partition_key) for row in rows]
+        )
+        await connection.execute(_DELETE_RELAYED, {"ids": [row.id for row in rows]})
+        await connection.commit()
+        outbox_relayed.inc(len(rows))
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            # Сбрасывается до прохода: событие, пришедшее во время прохода, не теряется
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                outbox_relay_failures.inc()
+                logger.error(f"Outbox relay failed: {e}")
+                await asyncio.sleep(self._retry_interval_seconds)
+                continue
+            if relayed == 0:
+                # Свободные слоты разобраны: ждем новое событие этого процесса или паузу
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+
+outbox_relay_worker = OutboxRelayWorker(
+    database,
+    broker_event_publisher,
+    batch_size=config.outbox_relay_batch_size,
+    poll_interval_seconds=config.outbox_relay_poll_interval_ms / 1000,
+    retry_interval_seconds=config.outbox_relay_retry_seconds,
+    lock_slots=config.outbox_relay_lock_slots,
+)
+# Событие, записанное в outbox этим процессом, публикуется сразу после фиксации
+event_publisher.add_listener(outbox_relay_worker.wake)
@@ -0,0 +1,234 @@
+import asyncio
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select
+
+from core.entites.core_entities import ProjectPurgeProgress, ProjectPurgeState
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from core.interfaceRepositories.project_purge_ischeduler import IProjectPurgeScheduler
+from core.services.project_purge_service import ProjectPurgeService
+from infrastructure.cache_singleton import project_cache, task_cache
+from infrastructure.event_publisher_singleton import event_publisher
+from infrastructure.postgres_db import Database, database
+from infrastructure.repositories.cached_project_repository import CachedProjectRepository
+from infrastructure.repositories.cached_task_repository import CachedTaskRepository
+from infrastructure.repositories.project_repository import ProjectRepository
+from infrastructure.repositories.task_repository import TaskRepository
+from logger import get_logger
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+
+# Пространство advisory-блокировок вычистки проектов ("purg")
+PURGE_LOCK_SPACE = 0x70757267
+
+_TRY_LOCK = select(
+    func.pg_try_advisory_lock(
+        bindparam("lock_space"), func.hashtext(bindparam("project_id"))
+    )
+)
+_UNLOCK = select(
+    func.pg_advisory_unlock(bindparam("lock_space"), func.hashtext(bindparam("project_id")))
+)
+
+
+class ProjectPurgeWorker(IProjectPurgeScheduler):
+    """
+    Фоновый воркер, вычищающий задачи удаленных проектов пачками.
+
+    Проекты обрабатываются по одному из очереди. При старте воркер подхватывает
+    проекты, помеченные удаленными, но не вычищенные до перезапуска.
+
+    На время вычистки проект захватывается advisory-блокировкой уровня сессии
+    на отдельном соединении, поэтому один проект вычищает только один
+    экземпляр сервиса. Проект, занятый другим экземпляром, и неудавшаяся
+    вычистка ставятся в очередь повторно с растущей паузой.
+    """
+
+    # Сколько завершенных записей прогресса держать в памяти
+    MAX_FINISHED_PROGRESS = 1000
+
+    def __init__(
+        self,
+        db: Database,
+        publisher: IEventPublisher,
+        batch_size: int,
+        pause_seconds: float = 0.0,
+        retry_seconds: float = 5.0,
+        retry_max_seconds: float = 300.0,
+    ):
+        """
+        Инициализация воркера.
+
+        :param db: Объект базы данных, из которого берутся сессии.
+        :param publisher: Издатель событий.
+        :param batch_size: Размер пачки удаляемых задач.
+        :param pause_seconds: Пауза между пачками.
+        :param retry_seconds: Пауза перед первым повтором; дальше удваивается.
+        :param retry_max_seconds: Максимальная пауза перед повтором.
+        """
+        self._db = db
+        self._publisher = publisher
+        self._batch_size = batch_size
+        self._pause_seconds = pause_seconds
+        self._retry_seconds = retry_seconds
+        self._retry_max_seconds = retry_max_seconds
+        self._queue: "asyncio.Queue[UUID]" = asyncio.Queue()
+        self._progress: Dict[UUID, ProjectPurgeProgress] = {}
+        self._attempts: Dict[UUID, int] = {}
+        self._retries: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить воркер и поставить в очередь незавершенные удаления."""
+        if self._task is not None:
+            return
+        async with self._db.session_factory() as session:
+            project_repo = ProjectRepository(session)
+            pending = await project_repo.list_deleted_project_ids()
+            for project_id in pending:
+                # Проект еще не удален, поэтому его участники на месте
+                members = await project_repo.list_members(project_id)
+                await self.schedule_purge(project_id, (m.user_id for m in members))
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Project purge worker started, {len(pending)} project(s) pending.")
+
+    async def stop(self) -> None:
+        """Остановить воркер. Незавершенные удаления будут продолжены при следующем старте."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        for retry in self._retries:
+            retry.cancel()
+        await asyncio.gather(self._task, *self._retries, return_exceptions=True)
+        self._retries.clear()
+        self._task = None
+
+    async def schedule_purge(
+        self, project_id: UUID, member_ids: Iterable[UUID] = ()
+    ) -> ProjectPurgeProgress:
+        member_ids = frozenset(member_ids)
+        progress = self._progress.get(project_id)
+        if progress and progress.state in (
+            ProjectPurgeState.PENDING,
+            ProjectPurgeState.RUNNING,
+        ):
+            progress.member_ids |= member_ids
+            return progress
+        progress = ProjectPurgeProgress(project_id=project_id, member_ids=member_ids)
+        self._progress[project_id] = progress
+        self._prune_finished()
+        await self._queue.put(project_id)
+        return progress
+
+    def get_progress(self, project_id: UUID) -> Optional[ProjectPurgeProgress]:
+        return self._progress.get(project_id)
+
+    async def _run(self) -> None:
+        while True:
+            project_id = await self._queue.get()
+            progress = self._progress[project_id]
+            try:
+                if await self._purge_claimed(progress):
+                    self._attempts.pop(project_id, None)
+                else:
+                    logger.info(f"Project {project_id} is being purged by another instance.")
+                    self._retry_later(project_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                progress.state = ProjectPurgeState.FAILED
+                progress.error = str(e)
+                logger.error(f"Project {project_id} purge failed: {e}")
+                self._retry_later(project_id)
+            finally:
+                self._queue.task_done()
+
+    async def _purge_claimed(self, progress: ProjectPurgeProgress) -> bool:
+        """
+        Вычистить проект под advisory-блокировкой.
+
+        Блокировка уровня сессии держится на отдельном соединении: сессия
+        репозиториев фиксирует каждую пачку и между ними возвращает свое
+        соединение в пул.
+
+        :return: False, если проект вычищает другой экземпляр.
+        """
+        lock_params = {"lock_space": PURGE_LOCK_SPACE, "project_id": str(progress.project_id)}
+        async with self._db.engine.connect() as lock_connection:
+            locked = await lock_connection.scalar(_TRY_LOCK, lock_params)
+            await lock_connection.commit()
+            if not locked:
+                return False
+            try:
+                async with self._db.session_factory() as session:
+                    # Через кэширующие репозитории вычистка сбрасывает и записи в Redis,
+                    # а не только локальные копии экземпляров по ProjectDeletedEvent
+                    service = ProjectPurgeService(
+                        CachedProjectRepository(
+                            ProjectRepository(session), project_cache, session=session
+                        ),
+                        CachedTaskRepository(TaskRepository(session), task_cache, session=session),
+                        self._publisher,
+                    )
+                    await service.purge_project(
+                        progress,
+                        batch_size=self._batch_size,
+                        pause_seconds=self._pause_seconds,
+                        on_progress=self._log_progress,
+                    )
+            finally:
+                # Соединение вернется в пул: блокировку уровня сессии снимаем явно
+                await lock_connection.scalar(_UNLOCK, lock_params)
+                await lock_connection.commit()
+        return True
+
+    def _retry_later(self, project_id: UUID) -> None:
+        attempt = self._attempts.get(project_id, 0) + 1
+        self._attempts[project_id] = attempt
+        delay = min(self._retry_seconds * 2 ** (attempt - 1), self._retry_max_seconds)
+        retry = asyncio.create_task(self._requeue(project_id, delay))
+        self._retries.add(retry)
+        retry.add_done_callback(self._retries.discard)
+
+    async def _requeue(self, project_id: UUID, delay: float) -> None:
+        await asyncio.sleep(delay)
+        progress = self._progress.get(project_id)
+        if progress is None:
+            # Запись прогресса вытеснена: создаем новую
+            await self.schedule_purge(project_id)
+            return
+        if progress.state == ProjectPurgeState.COMPLETED:
+            return
+        if progress.state != ProjectPurgeState.RUNNING:
+            progress.state = ProjectPurgeState.PENDING
+        await self._queue.put(project_id)
+
+    @staticmethod
+    def _log_progress(progress: ProjectPurgeProgress) -> None:
+        logger.info(
+            f"Project {progress.project_id} purge: {progress.state.value}, "
+            f"{progress.deleted_tasks} task(s) in {progress.batches} batch(es)."
+        )
+
+    def _prune_finished(self) -> None:
+        finished = [
+            project_id
+            for project_id, progress in self._progress.items()
+            if progress.state
+            in (ProjectPurgeState.COMPLETED, ProjectPurgeState.FAILED)
+        ]
+        for project_id in finished[: max(0, len(finished) - self.MAX_FINISHED_PROGRESS)]:
+            del self._progress[project_id]
+
+
+project_purge_worker = ProjectPurgeWorker(
+    database,
+    event_publisher,
+    batch_size=config.project_purge_batch_size,
+    pause_seconds=config.project_purge_batch_pause_ms / 1000,
+    retry_seconds=config.project_purge_retry_seconds,
+    retry_max_seconds=config.project_purge_retry_max_seconds,
+)
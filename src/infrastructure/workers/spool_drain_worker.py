@@ -0,0 +1,150 @@
+import asyncio
+from typing import Optional
+
+from aiokafka.errors import KafkaConnectionError, KafkaTimeoutError
+
+from infrastructure.event_publisher_singleton import broker_event_publisher, event_spool
+from infrastructure.repositories.event_publisher import AioKafkaEventPublisher
+from infrastructure.repositories.event_spool import EventSpool
+from infrastructure.repositories.in_memory_event_publisher import InMemoryEventPublisher
+from logger import get_logger
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+
+
+def is_transient(error: BaseException) -> bool:
+    """Ошибка доступности брокера, после которой событие стоит отправить повторно."""
+    if isinstance(
+        error,
+        (asyncio.TimeoutError, ConnectionError, KafkaConnectionError, KafkaTimeoutError),
+    ):
+        return True
+    # Остальные KafkaError помечают повторяемые ошибки (смена лидера и т.п.) флагом retriable
+    return bool(getattr(error, "retriable", False))
+
+
+class SpoolDrainWorker:
+    """
+    Фоновый воркер, отправляющий события из спула на диске в брокер.
+
+    События отправляются пачками по порядку записи, курсор спула сдвигается
+    только после подтверждения пачки брокером: доставка не менее одного раза.
+    Пока брокер недоступен, попытки повторяются с паузой. Если пачка
+    отвергнута не из-за доступности брокера, первое событие пачки
+    отправляется отдельно; событие, которое брокер отвергает max_attempts раз
+    подряд, переносится в dead letter и не блокирует остальные.
+    """
+
+    def __init__(
+        self,
+        spool: EventSpool,
+        publisher: AioKafkaEventPublisher | InMemoryEventPublisher,
+        batch_size: int,
+        max_attempts: int,
+        retry_interval_seconds: float,
+        poll_interval_seconds: float = 1.0,
+    ):
+        """
+        Инициализация воркера.
+
+        :param spool: Спул событий.
+        :param publisher: Издатель брокера (без спула и локальных слушателей).
+        :param batch_size: Максимум событий в пачке.
+        :param max_attempts: Попыток отправить отвергаемое событие до dead letter.
+        :param retry_interval_seconds: Пауза после ошибки отправки.
+        :param poll_interval_seconds: Пауза между проверками пустого спула.
+        """
+        self._spool = spool
+        self._publisher = publisher
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._retry_interval_seconds = retry_interval_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._head_failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить воркер."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Event spool drain worker started.")
+
+    async def stop(self) -> None:
+        """Остановить воркер. Неотправленные события остаются в спуле до следующего запуска."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def drain_once(self) -> int:
+        """
+        Отправить одну пачку событий из спула.
+
+        :return: Количество событий, покинувших спул.
+        :raises Exception: Ошибка брокера, после которой пачку нужно повторить.
+        """
+        events = self._spool.read_batch(self._batch_size)
+        if not events:
+            return 0
+        try:
+            await self._publisher.publish_batch(
+                [(event.payload, event.topic, event.key) for event in events]
+            )
+        except Exception as e:
+            if is_transient(e) or len(events) == 1:
+                raise
+            # Пачку отверг брокер: ищем испорченное событие, отправляя первое отдельно
+            events = events[:1]
+            head = events[0]
+            await self._publisher.publish_batch([(head.payload, head.topic, head.key)])
+        self._spool.commit(events)
+        self._head_failures = 0
+        return len(events)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                drained = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    self._head_failures += 1
+                    if self._head_failures >= self._max_attempts:
+                        self._dead_letter_head(e)
+                        continue
+                logger.warning(f"Event spool drain failed, {self._spool.pending} pending: {e}")
+                await asyncio.sleep(self._retry_interval_seconds)
+                continue
+            if drained == 0:
+                await self._spool.wait_for_events(self._poll_interval_seconds)
+
+    def _dead_letter_head(self, error: Exception) -> None:
+        events = self._spool.read_batch(1)
+        self._head_failures = 0
+        if not events:
+            return
+        event = events[0]
+        self._spool.dead_letter(event, reason="rejected")
+        logger.error(
+            f"Event for topic {event.topic} rejected {self._max_attempts} time(s), "
+            f"moved to dead letter: {error}"
+        )
+
+
+spool_drain_worker: Optional[SpoolDrainWorker] = None
+if event_spool is not None:
+    spool_drain_worker = SpoolDrainWorker(
+        event_spool,
+        broker_event_publisher,
+        batch_size=config.event_spool_drain_batch_size,
+        max_attempts=config.event_spool_max_attempts,
+        retry_interval_seconds=config.event_spool_retry_seconds,
+    )
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+
+from core.services.task_archive_service import TaskArchiveService
+from infrastructure.postgres_db import Database, database
+from infrastructure.repositories.task_repository import TaskRepository
+from logger import get_logger
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+
+
+class TaskArchiveWorker:
+    """
+    Фоновый воркер, периодически переносящий старые закрытые задачи в tasks_archive.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        older_than: timedelta,
+        batch_size: int,
+        interval_seconds: float,
+        pause_seconds: float = 0.0,
+    ):
+        """
+        Инициализация воркера.
+
+        :param db: Объект базы данных, из которого берутся сессии.
+        :param older_than: Минимальный возраст закрытой задачи для переноса.
+        :param batch_size: Размер пачки переносимых задач.
+        :param interval_seconds: Пауза между проходами.
+        :param pause_seconds: Пауза между пачками.
+        """
+        self._db = db
+        self._older_than = older_than
+        self._batch_size = batch_size
+        self._interval_seconds = interval_seconds
+        self._pause_seconds = pause_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить воркер."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Task archive worker started: closed tasks older than {self._older_than}."
+        )
+
+    async def stop(self) -> None:
+        """Остановить воркер. Прерванная пачка откатывается целиком."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> int:
+        """Выполнить один проход архивации."""
+        async with self._db.session_factory() as session:
+            service = TaskArchiveService(TaskRepository(session))
+            return await service.archive_closed_tasks(
+                self._older_than,
+                batch_size=self._batch_size,
+                pause_seconds=self._pause_seconds,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await self.run_once()
+                if archived:
+                    logger.info(f"Archived {archived} closed task(s).")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task archiving failed: {e}")
+            await asyncio.sleep(self._interval_seconds)
+
+
+task_archive_worker = TaskArchiveWorker(
+    database,
+    older_than=timedelta(days=config.task_archive_after_days),
+    batch_size=config.task_archive_batch_size,
+    interval_seconds=config.task_archive_interval_seconds,
+    pause_seconds=config.task_archive_batch_pause_ms / 1000,
+)
@@ -0,0 +1,97 @@
+"""
+Условные HTTP-запросы: ETag, Last-Modified, If-None-Match, If-Modified-Since, If-Match.
+
+Сильный ETag строится из id и updated_at сущности и не скрывает их:
+по If-Match можно восстановить updated_at и выполнить условный UPDATE
+без предварительного чтения.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request, Response
+
+from core.exceptions import PreconditionFailedError
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# Браузер хранит ответ, но перепроверяет его при каждом обращении
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(entity_id: UUID, updated_at: datetime) -> str:
+    return f'"{entity_id.hex}-{(updated_at - EPOCH) // MICROSECOND:x}"'
+
+
+def parse_etag(value: str) -> Optional[Tuple[UUID, datetime]]:
+    """(id, updated_at) из сильного ETag; None для слабых и чужих значений."""
+    value = value.strip()
+    if len(value) < 2 or not (value.startswith('"') and value.endswith('"')):
+        return None
+    entity_hex, _, micros_hex = value[1:-1].partition("-")
+    try:
+        return UUID(hex=entity_hex), EPOCH + int(micros_hex, 16) * MICROSECOND
+    except ValueError:
+        return None
+
+
+def http_date(updated_at: datetime) -> str:
+    return format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def has_conditions(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, entity_id: UUID, updated_at: datetime) -> bool:
+    """Проверить If-None-Match, а без него — If-Modified-Since (RFC 9110, 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = make_etag(entity_id, updated_at)
+        # Для If-None-Match применяется слабое сравнение: префикс W/ игнорируется
+        return any(
+            tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+        )
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        # HTTP-дата передается с точностью до секунды
+        return updated_at.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, entity_id: UUID, updated_at: datetime) -> None:
+    response.headers["ETag"] = make_etag(entity_id, updated_at)
+    response.headers["Last-Modified"] = http_date(updated_at)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(entity_id: UUID, updated_at: datetime) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, entity_id, updated_at)
+    return response
+
+
+def if_match_updated_at(request: Request, entity_id: UUID) -> Optional[datetime]:
+    """
+    updated_at из If-Match для условного обновления сущности.
+
+    :return: None, если заголовка нет или он равен "*".
+    :raises PreconditionFailedError: Если ни один ETag не относится к сущности.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    for tag in if_match.split(","):
+        parsed = parse_etag(tag)
+        if parsed is not None and parsed[0] == entity_id:
+            return parsed[1]
+    raise PreconditionFailedError("If-Match does not match the current representation.")
@@ -1,41 +1,191 @@
+from typing import List, Optional
 from core.services.project_service import ProjectService
+from core.services.project_access_service import ProjectAccessService
+from core.entites.auth_dtos import TokenPayload
+from core.exceptions import InvalidTokenError
 from infrastructure.postgres_db import database
-from fastapi import Depends
+from fastapi import Cookie, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.repositories.project_repository import ProjectRepository
-from infrastructure.event_publisher_singleton import event_publisher
+from infrastructure.event_publisher_singleton import (
+    event_codec,
+    event_publisher,
+    event_routing,
+)
+from infrastructure.repositories.outbox_event_publisher import OutboxEventPublisher
+from infrastructure.repositories.unit_of_work import SqlAlchemyUnitOfWork
+from core.interfaceRepositories.event_ipublisher import IEventPublisher
+from infrastructure.workers.project_purge_worker import project_purge_worker
 
 from infrastructure.repositories.task_repository import TaskRepository
 from core.services.task_service import TaskService
+from core.services.project_analytics_service import ProjectAnalyticsService
+from core.services.task_export_service import TaskExportService
+from infrastructure.repositories.task_export_reader import TaskExportReader
+from core.services.task_import_service import TaskImportService
+from infrastructure.repositories.task_bulk_loader import TaskBulkLoader
+from infrastructure.repositories.cached_project_repository import CachedProjectRepository
+from infrastructure.repositories.cached_task_repository import CachedTaskRepository
+from infrastructure.cache_singleton import (
+    project_cache,
+    project_reads,
+    single_flights,
+    task_cache,
+    task_list_cache,
+    task_list_reads,
+)
+from infrastructure.cache.response_cache import ProjectVersionedResponseCache
+from infrastructure.cache.single_flight import SingleFlight
+from settings import get_settings
+from infrastructure.loader_singleton import project_loader, task_loader, user_loader
+from infrastructure.analytics_singleton import analytics_executor, project_analytics_cache
 from infrastructure.repositories.auth_repository import (
     UserRepository,
     RefreshTokenRepository,
 )
 from core.services.auth_service import AuthService
 
+config = get_settings()
+
+
+def cached_project_repository(session: AsyncSession) -> CachedProjectRepository:
+    """Репозиторий проектов сессии запроса с общим кэшем проектов процесса."""
+    return CachedProjectRepository(
+        ProjectRepository(session), project_cache, project_reads, session
+    )
+
+
+def cached_task_repository(session: AsyncSession) -> CachedTaskRepository:
+    """Репозиторий задач сессии запроса с общим кэшем задач процесса."""
+    return CachedTaskRepository(TaskRepository(session), task_cache, task_list_reads, session)
+
+
+def request_event_publisher(session: AsyncSession) -> IEventPublisher:
+    """Издатель событий запроса: outbox в сессии запроса или сразу Kafka."""
+    if config.event_outbox_enabled:
+        return OutboxEventPublisher(
+            session,
+            event_publisher.notify,
+            event_routing,
+            event_codec,
+            slots=config.outbox_relay_lock_slots,
+        )
+    return event_publisher
+
+
+async def get_auth_service(
+    session: AsyncSession = Depends(database.get_db_session),
+) -> AuthService:
+    """Создает AuthService с репозиториями пользователя и refresh-токена"""
+    user_repo = UserRepository(session)
+    refresh_repo = RefreshTokenRepository(session)
+    return AuthService(user_repo, refresh_repo, user_loader)
+
+
+async def get_current_user(
+    authorization: Optional[str] = Header(None),
+    access_token: Optional[str] = Cookie(None),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> TokenPayload:
+    """Данные access-токена из заголовка Authorization: Bearer или cookie access_token."""
+    token = access_token
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[len("bearer "):].strip()
+    if not token:
+        raise InvalidTokenError("Access token missing.")
+    payload = await auth_service.verify_access_token(token)
+    if payload is None:
+        raise InvalidTokenError("Invalid or expired access token.")
+    return payload
+
+
+async def get_project_access(
+    session: AsyncSession = Depends(database.get_db_session),
+    current_user: TokenPayload = Depends(get_current_user),
+) -> ProjectAccessService:
+    """Проверка доступа к проектам; FastAPI создает один экземпляр на запрос,
+    поэтому роли пользователя читаются из БД не чаще одного раза за запрос."""
+    return ProjectAccessService(
+        ProjectRepository(session), current_user.sub, current_user.is_superuser
+    )
+
 
 async def get_project_service(
     session: AsyncSession = Depends(database.get_db_session),
+    access: ProjectAccessService = Depends(get_project_access),
 ) -> ProjectService:
     """Создание экземпляра сервиса проекта с зависимостями."""
 
-    project_repo = ProjectRepository(session)
-    return ProjectService(project_repo, event_publisher)
+    project_repo = cached_project_repository(session)
+    return ProjectService(
+        project_repo,
+        request_event_publisher(session),
+        project_purge_worker,
+        access,
+        project_loader,
+        uow=SqlAlchemyUnitOfWork(session),
+    )
 
 
 async def get_task_service(
     session: AsyncSession = Depends(database.get_db_session),
+    access: ProjectAccessService = Depends(get_project_access),
 ) -> TaskService:
     """Создание экземпляра сервиса задачи с зависимостями."""
-    task_repo = TaskRepository(session)
-    project_repo = ProjectRepository(session)
-    return TaskService(task_repo, project_repo, event_publisher)
+    task_repo = cached_task_repository(session)
+    project_repo = cached_project_repository(session)
+    return TaskService(
+        task_repo,
+        project_repo,
+        request_event_publisher(session),
+        access,
+        task_loader,
+        uow=SqlAlchemyUnitOfWork(session),
+    )
 
 
-async def get_auth_service(
+def get_task_list_cache() -> ProjectVersionedResponseCache:
+    """Кэш готовых ответов списка задач (общий для процесса)."""
+    return task_list_cache
+
+
+def get_single_flights() -> List[SingleFlight]:
+    """Слои объединения конкурентных чтений процесса."""
+    return single_flights
+
+
+async def get_project_analytics_service(
     session: AsyncSession = Depends(database.get_db_session),
-) -> AuthService:
-    """Создает AuthService с репозиториями пользователя и refresh-токена"""
-    user_repo = UserRepository(session)
-    refresh_repo = RefreshTokenRepository(session)
-    return AuthService(user_repo, refresh_repo)
+    access: ProjectAccessService = Depends(get_project_access),
+) -> ProjectAnalyticsService:
+    """Создание экземпляра сервиса аналитики проекта с зависимостями."""
+    return ProjectAnalyticsService(
+        TaskRepository(session), project_analytics_cache, analytics_executor, access
+    )
+
+
+async def get_task_export_service(
+    access: ProjectAccessService = Depends(get_project_access),
+) -> TaskExportService:
+    """Сервис выгрузки читает задачи через собственное соединение, а не сессию запроса:
+    ответ отправляется уже после закрытия зависимостей запроса."""
+    return TaskExportService(
+        TaskExportReader(database), access, config.task_export_chunk_size
+    )
+
+
+async def get_task_import_service(
+    session: AsyncSession = Depends(database.get_db_session),
+    access: ProjectAccessService = Depends(get_project_access),
+) -> TaskImportService:
+    """Создание экземпляра сервиса импорта задач с зависимостями."""
+    return TaskImportService(
+        TaskBulkLoader(database),
+        cached_project_repository(session),
+        event_publisher,
+        access,
+        batch_size=config.task_import_batch_size,
+        max_rows=config.task_import_max_rows,
+        max_reported_errors=config.task_import_max_reported_errors,
+        event_batch_size=config.task_import_event_batch_size,
+    )
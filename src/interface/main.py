@@ -14,9 +14,19 @@ from core.exceptions import (
     TokenExpiredError,
     InvalidTokenError,
     InvalidRequestError,
+    ConflictError,
+    PermissionDeniedError,
+    PreconditionFailedError,
 )
 from interface.routers import router
 from infrastructure.event_publisher_singleton import event_publisher
+from infrastructure.workers.project_purge_worker import project_purge_worker
+from infrastructure.workers.task_archive_worker import task_archive_worker
+from infrastructure.analytics_singleton import analytics_executor
+from infrastructure.cache_singleton import redis_tier
+from infrastructure.workers.cache_invalidation_worker import cache_invalidation_worker
+from infrastructure.workers.outbox_relay_worker import outbox_relay_worker
+from infrastructure.workers.spool_drain_worker import spool_drain_worker
 
 
 config = get_settings()
@@ -28,8 +38,25 @@ async def lifespan(app: FastAPI):
     """Инициализация настроек до запуска сервиса"""
     logger.info(app)
     await event_publisher.start()
+    await outbox_relay_worker.start()
+    if spool_drain_worker is not None:
+        await spool_drain_worker.start()
+    if config.event_publisher_backend == "kafka":
+        await cache_invalidation_worker.start()
+    await project_purge_worker.start()
+    await task_archive_worker.start()
     yield
+    await task_archive_worker.stop()
+    await project_purge_worker.stop()
+    await cache_invalidation_worker.stop()
+    await outbox_relay_worker.stop()
+    if spool_drain_worker is not None:
+        await spool_drain_worker.stop()
+    # stop() сначала отправляет накопленные пачки и ждет подтверждений (flush)
     await event_publisher.stop()
+    if redis_tier is not None:
+        await redis_tier.close()
+    analytics_executor.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -55,6 +82,8 @@ async def custom_exception_middleware(request: Request, call_next):
         return JSONResponse(status_code=409, content={"detail": str(e)})
     except AlreadyExistsError as e:
         return JSONResponse(status_code=409, content={"detail": str(e)})
+    except ConflictError as e:
+        return JSONResponse(status_code=409, content={"detail": str(e)})
     except InvalidCredentialsError as e:
         return JSONResponse(status_code=401, content={"detail": str(e)})
     except TokenExpiredError as e:
@@ -63,6 +92,10 @@ async def custom_exception_middleware(request: Request, call_next):
         return JSONResponse(status_code=401, content={"detail": str(e)})
     except InvalidRequestError as e:
         return JSONResponse(status_code=400, content={"detail": str(e)})
+    except PermissionDeniedError as e:
+        return JSONResponse(status_code=403, content={"detail": str(e)})
+    except PreconditionFailedError as e:
+        return JSONResponse(status_code=412, content={"detail": str(e)})
     except Exception as e:
         logger.error(f"Unhandled error: {e}")
         return JSONResponse(
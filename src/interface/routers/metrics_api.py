@@ -0,0 +1,37 @@
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from core.entites.auth_dtos import TokenPayload
+from core.exceptions import PermissionDeniedError
+from infrastructure.cache.single_flight import SingleFlight
+from interface.dependencies import get_current_user, get_single_flights
+from metrics import get_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics_text() -> PlainTextResponse:
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(
+        get_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@router.get("/metrics/coalescing")
+async def get_coalescing_stats(
+    limit: int = Query(20, ge=1, le=1000),
+    flights: List[SingleFlight] = Depends(get_single_flights),
+    current_user: TokenPayload = Depends(get_current_user),
+) -> Dict[str, Dict[str, int]]:
+    """Ключи с наибольшим числом объединенных одинаковых чтений по слоям.
+    Ключи содержат ID проектов, поэтому доступно только суперпользователю.
+    """
+    if not current_user.is_superuser:
+        raise PermissionDeniedError("Coalescing stats are available to superusers only.")
+    return {
+        flight.name: {str(key): count for key, count in flight.coalesced_by_key(limit)}
+        for flight in flights
+    }
@@ -1,9 +1,28 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status, HTTPException
-from interface.schemas.project_schema import ProjectCreate, ProjectRead, ProjectUpdate
-from interface.dependencies import get_project_service
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from interface.schemas.project_schema import (
+    ProjectAnalyticsRead,
+    ProjectCreate,
+    ProjectMemberCreate,
+    ProjectMemberRead,
+    ProjectPurgeProgressRead,
+    ProjectRead,
+    ProjectSuggestionRead,
+    ProjectTaskStatsRead,
+    ProjectUpdate,
+)
+from interface.dependencies import get_project_analytics_service, get_project_service
 from core.entites.core_entities import Project
+from interface.conditional_requests import (
+    has_conditions,
+    if_match_updated_at,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
 from core.services.project_service import ProjectService
+from core.services.project_analytics_service import ProjectAnalyticsService
 
 
 router = APIRouter(
@@ -21,32 +40,93 @@ async def create_project(
     project: ProjectCreate,
     project_service: ProjectService = Depends(get_project_service),
 ) -> ProjectRead:
-    """Создание нового проекта."""
+    """Создание нового проекта; текущий пользователь становится владельцем."""
     created_project = await project_service.create_project(
         name=project.name, description=project.description
     )
     return created_project
 
 
+@router.get(
+    "/typeahead",
+    response_model=list[ProjectSuggestionRead],
+    status_code=status.HTTP_200_OK,
+)
+async def typeahead_projects(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    project_service: ProjectService = Depends(get_project_service),
+) -> list[ProjectSuggestionRead]:
+    """Автодополнение названий проектов."""
+    # Подсказки запрашиваются на каждое нажатие клавиши: даем браузеру переиспользовать ответ
+    response.headers["Cache-Control"] = "private, max-age=15"
+    return await project_service.search_projects(q, limit)
+
+
 @router.get("/{project_id}", response_model=ProjectRead, status_code=status.HTTP_200_OK)
 async def get_project(
     project_id: UUID,
+    request: Request,
+    response: Response,
     project_service: ProjectService = Depends(get_project_service),
 ) -> ProjectRead:
-    """Получение проекта по ID."""
+    """Получение проекта по ID.
+    С If-None-Match/If-Modified-Since неизмененный проект отдается ответом 304.
+    """
+    if has_conditions(request):
+        updated_at = await project_service.get_project_last_modified(project_id)
+        if is_not_modified(request, project_id, updated_at):
+            return not_modified(project_id, updated_at)
     project = await project_service.get_project(project_id)
+    set_validators(response, project.id, project.updated_at)
     return project
 
 
 @router.get("/", response_model=list[ProjectRead], status_code=status.HTTP_200_OK)
 async def get_all_projects(
+    include_stats: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    after: Optional[UUID] = None,
+    offset: Optional[int] = Query(None, ge=0),
     project_service: ProjectService = Depends(get_project_service),
 ) -> list[ProjectRead]:
-    """Получение всех проектов."""
-    projects = await project_service.list_projects()
+    """Проекты текущего пользователя.
+    Следующая страница: after = ID последнего проекта текущей страницы.
+    """
+    projects = await project_service.list_projects(
+        limit=limit, offset=offset, include_stats=include_stats, after=after
+    )
     return projects
 
 
+@router.get(
+    "/{project_id}/stats",
+    response_model=ProjectTaskStatsRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_stats(
+    project_id: UUID,
+    project_service: ProjectService = Depends(get_project_service),
+) -> ProjectTaskStatsRead:
+    """Количество задач проекта по статусам."""
+    return await project_service.get_project_stats(project_id)
+
+
+@router.get(
+    "/{project_id}/analytics",
+    response_model=ProjectAnalyticsRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_analytics(
+    project_id: UUID,
+    weeks: int = Query(12, ge=1, le=52),
+    analytics_service: ProjectAnalyticsService = Depends(get_project_analytics_service),
+) -> ProjectAnalyticsRead:
+    """Время выполнения и цикла задач, недельная пропускная способность и WIP проекта."""
+    return await analytics_service.get_analytics(project_id, weeks)
+
+
 @router.put(
     "/{project_id}",
     response_model=ProjectRead,
@@ -55,22 +135,81 @@ async def get_all_projects(
 async def update_project(
     project_id: UUID,
     project_update: ProjectUpdate,
+    request: Request,
+    response: Response,
     project_service: ProjectService = Depends(get_project_service),
 ) -> ProjectRead:
-    """Обновление проекта по ID."""
+    """Обновление проекта по ID; с If-Match — только если проект не изменился (иначе 412)."""
     updated_project = await project_service.update_project(
-        project_id=project_id, update_data=project_update.model_dump(exclude_unset=True)
+        project_id=project_id,
+        update_data=project_update.model_dump(exclude_unset=True),
+        expected_updated_at=if_match_updated_at(request, project_id),
     )
+    set_validators(response, updated_project.id, updated_project.updated_at)
     return updated_project
 
 
 @router.delete(
     "/{project_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=ProjectPurgeProgressRead,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def delete_project(
     project_id: UUID,
     project_service: ProjectService = Depends(get_project_service),
-) -> None:
-    """Удаление проекта по ID."""
+) -> ProjectPurgeProgressRead:
+    """Удаление проекта по ID. Задачи проекта удаляются в фоне."""
     return await project_service.delete_project(project_id)
+
+
+@router.get(
+    "/{project_id}/deletion",
+    response_model=ProjectPurgeProgressRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_deletion_progress(
+    project_id: UUID,
+    project_service: ProjectService = Depends(get_project_service),
+) -> ProjectPurgeProgressRead:
+    """Прогресс фонового удаления проекта."""
+    return await project_service.get_deletion_progress(project_id)
+
+
+@router.get(
+    "/{project_id}/members",
+    response_model=list[ProjectMemberRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_project_members(
+    project_id: UUID,
+    project_service: ProjectService = Depends(get_project_service),
+) -> list[ProjectMemberRead]:
+    """Участники проекта."""
+    return await project_service.list_members(project_id)
+
+
+@router.post(
+    "/{project_id}/members",
+    response_model=ProjectMemberRead,
+    status_code=status.HTTP_200_OK,
+)
+async def add_project_member(
+    project_id: UUID,
+    member: ProjectMemberCreate,
+    project_service: ProjectService = Depends(get_project_service),
+) -> ProjectMemberRead:
+    """Добавление участника или смена его роли (только для владельцев)."""
+    return await project_service.add_member(project_id, member.user_id, member.role)
+
+
+@router.delete(
+    "/{project_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def remove_project_member(
+    project_id: UUID,
+    user_id: UUID,
+    project_service: ProjectService = Depends(get_project_service),
+) -> None:
+    """Исключение участника из проекта (только для владельцев)."""
+    await project_service.remove_member(project_id, user_id)
@@ -1,10 +1,43 @@
+from datetime import datetime
 from uuid import UUID
 from typing import List, Optional
-from fastapi import APIRouter, Depends, status, HTTPException
-from interface.schemas.task_schema import TaskCreate, TaskRead, TaskUpdate
-from interface.dependencies import get_task_service, get_project_service
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from fastapi.responses import StreamingResponse
+import orjson
+from interface.schemas.task_schema import (
+    TaskCreate,
+    TaskImportResultRead,
+    TaskRead,
+    TaskSearchPageRead,
+    TaskStatusChange,
+    TaskStatusTransitionRead,
+    TaskUpdate,
+)
+from interface.dependencies import (
+    get_project_access,
+    get_project_service,
+    get_task_export_service,
+    get_task_import_service,
+    get_task_list_cache,
+    get_task_service,
+)
+from interface.conditional_requests import (
+    has_conditions,
+    if_match_updated_at,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
+from core.services.project_access_service import ProjectAccessService
 from core.services.task_service import TaskService
-from core.entites.core_entities import TaskStatus
+from core.services.task_export_service import CONTENT_TYPES, TaskExportService
+from core.services.task_import_service import TaskImportService
+from core.entites.core_entities import TaskExportFormat, TaskImportFormat, TaskStatus
+from core.exceptions import InvalidRequestError
+from infrastructure.cache.response_cache import ProjectVersionedResponseCache
+from settings import get_settings
+
+config = get_settings()
 
 router = APIRouter(
     prefix="/tasks",
@@ -12,6 +45,21 @@ router = APIRouter(
 )
 
 
+def parse_task_ids(values: List[str]) -> List[UUID]:
+    """ID задач из ids=a,b&ids=c."""
+    raw = [part.strip() for value in values for part in value.split(",") if part.strip()]
+    if not raw:
+        raise InvalidRequestError("ids must not be empty.")
+    if len(raw) > config.task_multi_get_max_ids:
+        raise InvalidRequestError(
+            f"At most {config.task_multi_get_max_ids} ids can be requested at once."
+        )
+    try:
+        return [UUID(value) for value in raw]
+    except ValueError:
+        raise InvalidRequestError("ids must be UUIDs.")
+
+
 @router.post(
     "/",
     response_model=TaskRead,
@@ -35,6 +83,82 @@ async def create_task(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/import",
+    response_model=TaskImportResultRead,
+    status_code=status.HTTP_200_OK,
+)
+async def import_tasks(
+    request: Request,
+    project_id: UUID,
+    format: TaskImportFormat = TaskImportFormat.CSV,
+    import_service: TaskImportService = Depends(get_task_import_service),
+) -> TaskImportResultRead:
+    """Массовый импорт задач в проект из CSV (с заголовком) или NDJSON в теле запроса.
+    Тело читается потоком; некорректные строки пропускаются и перечисляются в ответе.
+    """
+    return await import_service.import_tasks(project_id, request.stream(), format)
+
+
+@router.get(
+    "/search",
+    response_model=TaskSearchPageRead,
+    status_code=status.HTTP_200_OK,
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256),
+    project_id: Optional[UUID] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    task_service: TaskService = Depends(get_task_service),
+) -> TaskSearchPageRead:
+    """Полнотекстовый поиск задач по заголовку и описанию."""
+    return await task_service.search_tasks(
+        query=q, project_id=project_id, limit=limit, cursor=cursor
+    )
+
+
+@router.get(
+    "/status-history",
+    response_model=List[TaskStatusTransitionRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_status_history(
+    project_id: UUID,
+    since: datetime,
+    until: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100_000),
+    task_service: TaskService = Depends(get_task_service),
+) -> List[TaskStatusTransitionRead]:
+    """Смены статусов задач проекта за период [since, until), время в UTC."""
+    return await task_service.list_status_history(
+        project_id=project_id, since=since, until=until, limit=limit
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_tasks(
+    project_id: UUID,
+    format: TaskExportFormat = TaskExportFormat.CSV,
+    export_service: TaskExportService = Depends(get_task_export_service),
+) -> StreamingResponse:
+    """Выгрузка всех задач проекта, включая архивные, в CSV или Parquet.
+    Задачи читаются из одного снимка БД и отдаются по мере чтения.
+    """
+    chunks = await export_service.export_tasks(project_id, format)
+    return StreamingResponse(
+        chunks,
+        media_type=CONTENT_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks-{project_id}.{format.value}"'
+        },
+    )
+
+
 @router.get(
     "/{task_id}",
     response_model=TaskRead,
@@ -42,12 +166,23 @@ async def create_task(
 )
 async def get_task(
     task_id: UUID,
+    request: Request,
+    response: Response,
+    project_id: Optional[UUID] = None,
     task_service: TaskService = Depends(get_task_service),
 ) -> TaskRead:
-    """Получение задачи по ID."""
-    found = await task_service.get_task(task_id)
+    """Получение задачи по ID. project_id ускоряет поиск, читая одну секцию.
+    С If-None-Match/If-Modified-Since неизмененная задача отдается ответом 304:
+    читается только время изменения, тело не сериализуется.
+    """
+    if has_conditions(request):
+        updated_at = await task_service.get_task_last_modified(task_id, project_id)
+        if is_not_modified(request, task_id, updated_at):
+            return not_modified(task_id, updated_at)
+    found = await task_service.get_task(task_id, project_id)
     if not found:
         raise HTTPException(status_code=404, detail="Task not found")
+    set_validators(response, found.id, found.updated_at)
     return found
 
 
@@ -57,21 +192,54 @@ async def get_task(
     status_code=status.HTTP_200_OK,
 )
 async def list_tasks(
-    project_id: UUID,
+    project_id: Optional[UUID] = None,
+    ids: Optional[List[str]] = Query(
+        None, description="ID задач через запятую или повтором параметра (мульти-GET)."
+    ),
     status: Optional[TaskStatus] = None,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
     order_by: Optional[str] = None,
     task_service: TaskService = Depends(get_task_service),
-) -> List[TaskRead]:
-    """Список задач с фильтрацией и пагинацией."""
-    return await task_service.list_tasks_by_project(
-        project_id=project_id,
-        status=status,
+    access: ProjectAccessService = Depends(get_project_access),
+    cache: ProjectVersionedResponseCache = Depends(get_task_list_cache),
+) -> Response:
+    """Список задач с фильтрацией и пагинацией.
+    Без status и при status=closed в выборку входят и архивные задачи.
+    Готовый JSON кэшируется до следующего изменения задач проекта; доступ
+    проверяется и при попадании в кэш.
+
+    С ids возвращаются задачи с этими ID (в порядке ids, без ненайденных
+    и недоступных) — одним запросом к БД вместо запроса на каждую задачу.
+    """
+    if ids is not None:
+        tasks = await task_service.get_tasks(parse_task_ids(ids))
+        body = orjson.dumps([TaskRead.model_validate(task).model_dump() for task in tasks])
+        return Response(content=body, media_type="application/json")
+    if project_id is None:
+        raise InvalidRequestError("Either project_id or ids is required.")
+    await access.ensure_member(project_id)
+    # Версия читается до запроса в БД: ответ, собранный во время записи, устареет сразу
+    key = cache.key(
+        project_id,
+        cache.version(project_id),
+        status=status.value if status is not None else None,
         limit=limit,
         offset=offset,
         order_by=order_by,
     )
+    body = cache.get(key)
+    if body is None:
+        tasks = await task_service.list_tasks_by_project(
+            project_id=project_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
+        )
+        body = orjson.dumps([TaskRead.model_validate(task).model_dump() for task in tasks])
+        cache.put(key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.put(
@@ -82,25 +250,57 @@ async def list_tasks(
 async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
+    request: Request,
+    response: Response,
+    project_id: Optional[UUID] = None,
     task_service: TaskService = Depends(get_task_service),
 ) -> TaskRead:
-    """Обновление задачи по ID."""
+    """Обновление задачи по ID. expected_version или заголовок If-Match
+    включают оптимистичную блокировку; несовпадение If-Match — ответ 412.
+    """
+    update_data = task_update.model_dump(exclude_unset=True)
+    expected_version = update_data.pop("expected_version", None)
     updated = await task_service.update_task(
         task_id=task_id,
-        update_data=task_update.model_dump(exclude_unset=True),
+        update_data=update_data,
+        project_id=project_id,
+        expected_version=expected_version,
+        expected_updated_at=if_match_updated_at(request, task_id),
     )
     if not updated:
         raise HTTPException(status_code=404, detail="Task not found")
+    set_validators(response, updated.id, updated.updated_at)
     return updated
 
 
+@router.patch(
+    "/{task_id}/status",
+    response_model=TaskRead,
+    status_code=status.HTTP_200_OK,
+)
+async def change_task_status(
+    task_id: UUID,
+    status_change: TaskStatusChange,
+    project_id: Optional[UUID] = None,
+    task_service: TaskService = Depends(get_task_service),
+) -> TaskRead:
+    """Смена статуса задачи; с expected_status — только из ожидаемого статуса."""
+    return await task_service.change_task_status(
+        task_id=task_id,
+        new_status=status_change.status,
+        expected_status=status_change.expected_status,
+        project_id=project_id,
+    )
+
+
 @router.delete(
     "/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_task(
     task_id: UUID,
+    project_id: Optional[UUID] = None,
     task_service: TaskService = Depends(get_task_service),
 ) -> None:
     """Удаление задачи по ID."""
-    await task_service.delete_task(task_id)
+    await task_service.delete_task(task_id, project_id)
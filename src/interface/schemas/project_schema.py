@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
+from core.entites.core_entities import ProjectPurgeState, ProjectRole, TaskStatus
 
 
 class ProjectBase(BaseModel):
@@ -18,10 +19,100 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = Field(None, example="Новое описание")
 
 
+class ProjectTaskStatsRead(BaseModel):
+    project_id: UUID
+    counts: Dict[TaskStatus, int]
+    total: int
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectRead(ProjectBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
+    task_stats: Optional[ProjectTaskStatsRead] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectSuggestionRead(BaseModel):
+    id: UUID
+    name: str
+    score: float
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectPurgeProgressRead(BaseModel):
+    project_id: UUID
+    state: ProjectPurgeState
+    deleted_tasks: int
+    batches: int
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectMemberCreate(BaseModel):
+    user_id: UUID
+    role: ProjectRole = Field(ProjectRole.MEMBER)
+
+
+class ProjectMemberRead(BaseModel):
+    project_id: UUID
+    user_id: UUID
+    role: ProjectRole
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DurationStatsRead(BaseModel):
+    count: int
+    mean_hours: Optional[float] = None
+    p50_hours: Optional[float] = None
+    p85_hours: Optional[float] = None
+    p95_hours: Optional[float] = None
+    max_hours: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class HistogramBucketRead(BaseModel):
+    lower_hours: float
+    upper_hours: Optional[float] = None
+    count: int
+
+    class Config:
+        from_attributes = True
+
+
+class ThroughputBucketRead(BaseModel):
+    week_start: datetime
+    completed: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectAnalyticsRead(BaseModel):
+    project_id: UUID
+    generated_at: datetime
+    task_count: int
+    wip: Dict[TaskStatus, int]
+    lead_time: DurationStatsRead
+    cycle_time: DurationStatsRead
+    cycle_time_histogram: List[HistogramBucketRead]
+    weekly_throughput: List[ThroughputBucketRead]
 
     class Config:
         from_attributes = True
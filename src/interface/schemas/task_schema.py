@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from core.entites.core_entities import TaskStatus
@@ -24,6 +24,14 @@ class TaskUpdate(BaseModel):
     description: Optional[str] = Field(None, example="Обновленное описание")
     status: Optional[TaskStatus] = Field(None)
     assignee_id: Optional[UUID] = Field(None)
+    # Версия, которую видел клиент; при несовпадении обновление отклоняется с 409
+    expected_version: Optional[int] = Field(None, example=3)
+
+
+class TaskStatusChange(BaseModel):
+    status: TaskStatus
+    # Сменить статус, только если текущий совпадает; иначе 409
+    expected_status: Optional[TaskStatus] = Field(None)
 
 
 class TaskRead(TaskBase):
@@ -32,6 +40,55 @@ class TaskRead(TaskBase):
     assignee_id: Optional[UUID]
     created_at: datetime
     updated_at: datetime
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class TaskSearchHitRead(BaseModel):
+    task: TaskRead
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+
+class TaskSearchPageRead(BaseModel):
+    items: List[TaskSearchHitRead]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskStatusTransitionRead(BaseModel):
+    task_id: UUID
+    project_id: UUID
+    old_status: Optional[TaskStatus] = None
+    new_status: TaskStatus
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskImportRowErrorRead(BaseModel):
+    line: int
+    message: str
+
+    class Config:
+        from_attributes = True
+
+
+class TaskImportResultRead(BaseModel):
+    project_id: UUID
+    received: int
+    imported: int
+    duplicates: int
+    error_count: int
+    errors: List[TaskImportRowErrorRead]
+    events_failed: int
 
     class Config:
         from_attributes = True
@@ -0,0 +1,154 @@
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Type, TypeVar
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+class Metric:
+    """Метрика с набором значений по меткам."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, lock: threading.Lock):
+        self.name = name
+        self.description = description
+        self._lock = lock
+        self._values: Dict[LabelKey, float] = {}
+
+    def value(self, **labels: Any) -> float:
+        """Текущее значение для набора меток (0, если значения еще нет)."""
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Counter(Metric):
+    """Монотонно растущий счетчик."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Текущее значение; может задаваться функцией, вычисляемой при чтении."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, lock: threading.Lock):
+        super().__init__(name, description, lock)
+        self._functions: Dict[LabelKey, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: Any) -> None:
+        """Вычислять значение вызовом function при каждом чтении метрики."""
+        with self._lock:
+            self._functions[_label_key(labels)] = function
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            values = list(self._values.items())
+            functions = list(self._functions.items())
+        # Функции вызываются без блокировки: они могут читать другие метрики
+        return values + [(key, float(function())) for key, function in functions]
+
+
+MetricType = TypeVar("MetricType", bound=Metric)
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса.
+
+    Метрики создаются по имени при первом обращении и затем переиспользуются,
+    поэтому модули могут объявлять их независимо друг от друга.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get_or_create(
+        self, metric_type: Type[MetricType], name: str, description: str
+    ) -> MetricType:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_type(name, description, self._lock)
+                self._metrics[name] = metric
+        if not isinstance(metric, metric_type):
+            raise ValueError(f"Metric {name} is already registered as {metric.kind}.")
+        return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Значения всех метрик: {имя: {метки в формате Prometheus: значение}}."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {_format_labels(key): value for key, value in metric.samples()}
+            for metric in metrics
+        }
+
+    def render_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in sorted(metric.samples()):
+                lines.append(f"{metric.name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Возвращает глобальный реестр метрик
+    """
+    global metrics
+
+    if not metrics:
+        metrics = MetricsRegistry()
+    return metrics
@@ -1,3 +1,11 @@
 from infrastructure.models.auth_models import UserModel, RefreshTokenModel
-from infrastructure.models.project_task_model import Task, Project
+from infrastructure.models.event_outbox_model import EventOutbox
+from infrastructure.models.project_task_model import (
+    Task,
+    TaskArchive,
+    Project,
+    ProjectMember,
+    ProjectTaskStats,
+    TaskStatusHistory,
+)
 from infrastructure.postgres_db import Base
@@ -0,0 +1,125 @@
+"""tasks partitioned shadow
+
+Первый шаг перехода tasks на секционирование по HASH(project_id) без простоя.
+
+Создается секционированная таблица tasks_partitioned и триггер, зеркалирующий
+в нее все изменения tasks. Существующие строки переносятся инструментом
+`python -m tools.backfill_partitioned_tasks` пачками, пока сервис работает.
+Переключение таблиц выполняет следующая ревизия (6924cc0c08c2).
+
+Revision ID: 08990d6987ad
+Revises: 115a6d495d99
+Create Date: 2026-10-19 13:40:12.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08990d6987ad'
+down_revision: Union[str, None] = '115a6d495d99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = 16
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Ключ секционирования обязан входить в первичный ключ, поэтому PK = (project_id, id)
+    op.execute(
+        f"""
+        CREATE TABLE tasks_partitioned (
+            id uuid NOT NULL,
+            project_id uuid NOT NULL,
+            title varchar NOT NULL,
+            description varchar,
+            status task_status_enum NOT NULL,
+            assignee_id uuid,
+            created_at timestamp without time zone NOT NULL,
+            updated_at timestamp without time zone NOT NULL,
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED,
+            CONSTRAINT tasks_partitioned_pkey PRIMARY KEY (project_id, id),
+            CONSTRAINT tasks_partitioned_project_id_fkey
+                FOREIGN KEY (project_id) REFERENCES projects (id)
+        ) PARTITION BY HASH (project_id)
+        """
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE tasks_p{remainder:02d} PARTITION OF tasks_partitioned "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    # Поиск задачи без project_id проверяет индекс id в каждой секции
+    op.execute("CREATE INDEX ix_tasks_partitioned_id ON tasks_partitioned (id)")
+    op.execute(
+        "CREATE INDEX ix_tasks_partitioned_search_vector "
+        "ON tasks_partitioned USING gin (search_vector)"
+    )
+
+    op.execute(
+        """
+        CREATE TABLE tasks_partition_backfill (
+            id smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            last_id uuid,
+            copied bigint NOT NULL DEFAULT 0,
+            finished_at timestamp without time zone
+        )
+        """
+    )
+    op.execute("INSERT INTO tasks_partition_backfill (id) VALUES (1)")
+
+    # Upsert, а не INSERT: строка может быть уже скопирована backfill-ом
+    op.execute(
+        """
+        CREATE FUNCTION tasks_mirror_to_partitioned() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE'
+               OR (TG_OP = 'UPDATE' AND OLD.project_id <> NEW.project_id) THEN
+                DELETE FROM tasks_partitioned
+                WHERE project_id = OLD.project_id AND id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO tasks_partitioned (
+                    id, project_id, title, description, status, assignee_id,
+                    created_at, updated_at
+                )
+                VALUES (
+                    NEW.id, NEW.project_id, NEW.title, NEW.description, NEW.status,
+                    NEW.assignee_id, NEW.created_at, NEW.updated_at
+                )
+                ON CONFLICT (project_id, id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    description = EXCLUDED.description,
+                    status = EXCLUDED.status,
+                    assignee_id = EXCLUDED.assignee_id,
+                    created_at = EXCLUDED.created_at,
+                    updated_at = EXCLUDED.updated_at;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_mirror_to_partitioned
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_partitioned()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_mirror_to_partitioned ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_mirror_to_partitioned()")
+    op.execute("DROP TABLE IF EXISTS tasks_partition_backfill")
+    op.execute("DROP TABLE IF EXISTS tasks_partitioned")
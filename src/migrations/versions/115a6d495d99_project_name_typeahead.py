@@ -0,0 +1,46 @@
+"""project name typeahead
+
+Revision ID: 115a6d495d99
+Revises: 9b12bd772530
+Create Date: 2026-10-19 12:31:52.671190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '115a6d495d99'
+down_revision: Union[str, None] = '9b12bd772530'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_name_prefix',
+            'projects',
+            [sa.text('(lower(name) COLLATE "C")')],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_projects_name_trgm',
+            'projects',
+            ['name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_name_trgm', table_name='projects')
+    op.drop_index('ix_projects_name_prefix', table_name='projects')
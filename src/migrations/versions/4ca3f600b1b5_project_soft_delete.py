@@ -0,0 +1,37 @@
+"""project soft delete
+
+Revision ID: 4ca3f600b1b5
+Revises: 15a880447176
+Create Date: 2026-10-19 10:20:41.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ca3f600b1b5'
+down_revision: Union[str, None] = '15a880447176'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_projects_pending_purge',
+        'projects',
+        ['deleted_at'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+    # Пачечное удаление задач проекта выбирает строки по project_id
+    op.create_index('ix_tasks_project_id', 'tasks', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_project_id', table_name='tasks')
+    op.drop_index('ix_projects_pending_purge', table_name='projects')
+    op.drop_column('projects', 'deleted_at')
@@ -0,0 +1,29 @@
+"""task version
+
+Revision ID: 5e0b7d2c9a14
+Revises: a3e5c1f7b942
+Create Date: 2026-10-19 16:05:44.218730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7d2c9a14'
+down_revision: Union[str, None] = 'a3e5c1f7b942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Константный DEFAULT не переписывает таблицу: колонка добавляется мгновенно
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('tasks_archive', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks_archive', 'version')
+    op.drop_column('tasks', 'version')
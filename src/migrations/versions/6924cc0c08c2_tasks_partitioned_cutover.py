@@ -0,0 +1,182 @@
+"""tasks partitioned cutover
+
+Второй шаг перехода tasks на секционирование: дозаполнение и переключение.
+
+Под блокировкой EXCLUSIVE (чтение разрешено, запись ждет) копируются строки,
+которые backfill еще не перенес, затем таблицы меняются местами. Если backfill
+был выполнен заранее, блокировка держится доли секунды; без него (небольшие
+базы, `alembic upgrade head` с нуля) копируется вся таблица.
+
+Старая таблица остается как tasks_legacy для отката и удаляется вручную
+после проверки.
+
+Revision ID: 6924cc0c08c2
+Revises: 08990d6987ad
+Create Date: 2026-10-19 13:58:47.103526
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6924cc0c08c2'
+down_revision: Union[str, None] = '08990d6987ad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASK_COLUMNS = (
+    "id, project_id, title, description, status, assignee_id, created_at, updated_at"
+)
+
+STATS_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_stats_on_insert AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_insert()
+    """,
+    """
+    CREATE TRIGGER tasks_stats_on_delete AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_delete()
+    """,
+    """
+    CREATE TRIGGER tasks_stats_on_update AFTER UPDATE ON tasks
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_update()
+    """,
+]
+
+
+def _drop_stats_triggers() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_update ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_delete ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_insert ON tasks")
+
+
+def upgrade() -> None:
+    op.execute("LOCK TABLE tasks IN EXCLUSIVE MODE")
+    op.execute(
+        f"""
+        INSERT INTO tasks_partitioned ({TASK_COLUMNS})
+        SELECT {TASK_COLUMNS} FROM tasks
+        WHERE id > coalesce(
+            (SELECT last_id FROM tasks_partition_backfill),
+            '00000000-0000-0000-0000-000000000000'
+        )
+        ON CONFLICT (project_id, id) DO NOTHING
+        """
+    )
+
+    op.execute("DROP TRIGGER tasks_mirror_to_partitioned ON tasks")
+    op.execute("DROP FUNCTION tasks_mirror_to_partitioned()")
+    _drop_stats_triggers()
+
+    op.execute("ALTER TABLE tasks RENAME TO tasks_legacy")
+    op.execute("ALTER TABLE tasks_legacy RENAME CONSTRAINT tasks_pkey TO tasks_legacy_pkey")
+    op.execute(
+        "ALTER TABLE tasks_legacy "
+        "RENAME CONSTRAINT tasks_project_id_fkey TO tasks_legacy_project_id_fkey"
+    )
+    op.execute("ALTER INDEX ix_tasks_project_id RENAME TO ix_tasks_legacy_project_id")
+    op.execute("ALTER INDEX ix_tasks_search_vector RENAME TO ix_tasks_legacy_search_vector")
+
+    op.execute("ALTER TABLE tasks_partitioned RENAME TO tasks")
+    op.execute("ALTER TABLE tasks RENAME CONSTRAINT tasks_partitioned_pkey TO tasks_pkey")
+    op.execute(
+        "ALTER TABLE tasks "
+        "RENAME CONSTRAINT tasks_partitioned_project_id_fkey TO tasks_project_id_fkey"
+    )
+    op.execute("ALTER INDEX ix_tasks_partitioned_id RENAME TO ix_tasks_id")
+    op.execute("ALTER INDEX ix_tasks_partitioned_search_vector RENAME TO ix_tasks_search_vector")
+
+    for statement in STATS_TRIGGERS:
+        op.execute(statement)
+    op.execute("DROP TABLE tasks_partition_backfill")
+    op.execute("ANALYZE tasks")
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE tasks IN EXCLUSIVE MODE")
+    _drop_stats_triggers()
+
+    # Пока сервис работал на секционированной таблице, tasks_legacy не обновлялась
+    op.execute("DELETE FROM tasks_legacy")
+    op.execute(f"INSERT INTO tasks_legacy ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks")
+
+    op.execute("ALTER INDEX ix_tasks_search_vector RENAME TO ix_tasks_partitioned_search_vector")
+    op.execute("ALTER INDEX ix_tasks_id RENAME TO ix_tasks_partitioned_id")
+    op.execute(
+        "ALTER TABLE tasks "
+        "RENAME CONSTRAINT tasks_project_id_fkey TO tasks_partitioned_project_id_fkey"
+    )
+    op.execute("ALTER TABLE tasks RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey")
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+
+    op.execute("ALTER INDEX ix_tasks_legacy_search_vector RENAME TO ix_tasks_search_vector")
+    op.execute("ALTER INDEX ix_tasks_legacy_project_id RENAME TO ix_tasks_project_id")
+    op.execute(
+        "ALTER TABLE tasks_legacy "
+        "RENAME CONSTRAINT tasks_legacy_project_id_fkey TO tasks_project_id_fkey"
+    )
+    op.execute("ALTER TABLE tasks_legacy RENAME CONSTRAINT tasks_legacy_pkey TO tasks_pkey")
+    op.execute("ALTER TABLE tasks_legacy RENAME TO tasks")
+
+    for statement in STATS_TRIGGERS:
+        op.execute(statement)
+
+    op.execute(
+        """
+        CREATE TABLE tasks_partition_backfill (
+            id smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            last_id uuid,
+            copied bigint NOT NULL DEFAULT 0,
+            finished_at timestamp without time zone
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO tasks_partition_backfill (id, last_id, copied, finished_at) "
+        "SELECT 1, (SELECT id FROM tasks ORDER BY id DESC LIMIT 1), count(*), now() FROM tasks"
+    )
+    op.execute(
+        """
+        CREATE FUNCTION tasks_mirror_to_partitioned() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE'
+               OR (TG_OP = 'UPDATE' AND OLD.project_id <> NEW.project_id) THEN
+                DELETE FROM tasks_partitioned
+                WHERE project_id = OLD.project_id AND id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO tasks_partitioned (
+                    id, project_id, title, description, status, assignee_id,
+                    created_at, updated_at
+                )
+                VALUES (
+                    NEW.id, NEW.project_id, NEW.title, NEW.description, NEW.status,
+                    NEW.assignee_id, NEW.created_at, NEW.updated_at
+                )
+                ON CONFLICT (project_id, id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    description = EXCLUDED.description,
+                    status = EXCLUDED.status,
+                    assignee_id = EXCLUDED.assignee_id,
+                    created_at = EXCLUDED.created_at,
+                    updated_at = EXCLUDED.updated_at;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_mirror_to_partitioned
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_partitioned()
+        """
+    )
@@ -0,0 +1,46 @@
+"""project members
+
+Существующие проекты остаются без участников: владельцев назначают
+суперпользователи через /projects/{id}/members.
+
+Revision ID: 7c41e9a0d3b6
+Revises: 5e0b7d2c9a14
+Create Date: 2026-10-19 16:48:09.573302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41e9a0d3b6'
+down_revision: Union[str, None] = '5e0b7d2c9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('project_members',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('role', sa.Enum('OWNER', 'MEMBER', name='project_role_enum'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'user_id')
+    )
+    op.create_index(
+        'ix_project_members_user_project',
+        'project_members',
+        ['user_id', 'project_id'],
+        unique=False,
+        postgresql_include=['role'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_members_user_project', table_name='project_members')
+    op.drop_table('project_members')
+    sa.Enum(name='project_role_enum').drop(op.get_bind(), checkfirst=True)
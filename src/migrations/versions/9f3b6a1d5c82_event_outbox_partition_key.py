@@ -0,0 +1,29 @@
+"""event outbox partition key
+
+Ключ партиции вычисляется при записи события и хранится вместе с ним:
+relay публикует строку с тем же ключом, не разбирая payload.
+
+Revision ID: 9f3b6a1d5c82
+Revises: e4a7c2d91f30
+Create Date: 2026-10-19 19:40:13.502716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3b6a1d5c82'
+down_revision: Union[str, None] = 'e4a7c2d91f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('event_outbox', sa.Column('partition_key', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('event_outbox', 'partition_key')
@@ -0,0 +1,112 @@
+"""tasks archive
+
+Архив закрытых задач и частичные индексы горячей таблицы tasks.
+
+tasks секционирована, а CREATE INDEX CONCURRENTLY на секционированной таблице
+не поддерживается. Поэтому индекс создается на самой таблице (ON ONLY, без
+построения), затем строится CONCURRENTLY на каждой секции и подключается
+через ATTACH PARTITION — запись в tasks при этом не блокируется.
+
+Revision ID: a3e5c1f7b942
+Revises: 6924cc0c08c2
+Create Date: 2026-10-19 15:12:36.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e5c1f7b942'
+down_revision: Union[str, None] = '6924cc0c08c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, суффикс для секций, колонки, условие)
+PARTIAL_INDEXES = [
+    ("ix_tasks_open_project_created_at", "open_project_created_at", "project_id, created_at", "status <> 'CLOSED'"),
+    ("ix_tasks_open_project_status", "open_project_status", "project_id, status", "status <> 'CLOSED'"),
+    ("ix_tasks_closed_updated_at", "closed_updated_at", "updated_at", "status = 'CLOSED'"),
+]
+
+# Счетчики project_task_stats учитывают и архив: перенос задачи уменьшает
+# счетчик в tasks и увеличивает его здесь, итог по проекту не меняется
+ARCHIVE_STATS_TRIGGERS = [
+    """
+CREATE TRIGGER tasks_archive_stats_on_insert AFTER INSERT ON tasks_archive
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_insert()
+""",
+    """
+CREATE TRIGGER tasks_archive_stats_on_delete AFTER DELETE ON tasks_archive
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_delete()
+""",
+]
+
+
+def _task_partitions() -> list:
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits AS i "
+            "JOIN pg_class AS c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'tasks'::regclass ORDER BY c.relname"
+        )
+    )
+    return [row[0] for row in rows]
+
+
+def upgrade() -> None:
+    op.create_table('tasks_archive',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', 'CLOSED', name='task_status_enum', create_type=False), nullable=False),
+    sa.Column('assignee_id', sa.UUID(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'id', name='tasks_archive_pkey')
+    )
+    for statement in ARCHIVE_STATS_TRIGGERS:
+        op.execute(statement)
+
+    partitions = _task_partitions()
+    with op.get_context().autocommit_block():
+        for name, suffix, columns, predicate in PARTIAL_INDEXES:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY tasks ({columns}) WHERE {predicate}")
+            for partition in partitions:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_{suffix} "
+                    f"ON {partition} ({columns}) WHERE {predicate}"
+                )
+                op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition}_{suffix}")
+
+
+def downgrade() -> None:
+    # Удаление индекса секционированной таблицы удаляет и индексы секций
+    for name, _, _, _ in reversed(PARTIAL_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # Возвращаем архивные задачи в горячую таблицу, чтобы не потерять их
+    op.execute(
+        """
+        INSERT INTO tasks (
+            id, project_id, title, description, status, assignee_id, created_at, updated_at
+        )
+        SELECT id, project_id, title, description, status, assignee_id, created_at, updated_at
+        FROM tasks_archive
+        ON CONFLICT (project_id, id) DO NOTHING
+        """
+    )
+    # Удаление идет через триггер: вычитает из счетчиков то, что вставка в tasks добавила
+    op.execute("DELETE FROM tasks_archive")
+    op.execute("DROP TRIGGER IF EXISTS tasks_archive_stats_on_delete ON tasks_archive")
+    op.execute("DROP TRIGGER IF EXISTS tasks_archive_stats_on_insert ON tasks_archive")
+    op.drop_table('tasks_archive')
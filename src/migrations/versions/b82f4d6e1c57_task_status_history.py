@@ -0,0 +1,91 @@
+"""task status history
+
+Журнал переходов статусов пишется триггерами уровня оператора с transition
+tables: все строки одного оператора попадают в журнал одним INSERT ... SELECT
+в той же транзакции. Вставка задачи записывается как переход из NULL.
+
+Существующие задачи в журнал не переносятся: история начинается с этой ревизии.
+
+Revision ID: b82f4d6e1c57
+Revises: 7c41e9a0d3b6
+Create Date: 2026-10-19 17:31:20.664815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b82f4d6e1c57'
+down_revision: Union[str, None] = '7c41e9a0d3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+HISTORY_FUNCTIONS = [
+    """
+CREATE FUNCTION task_status_history_on_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_status_history (task_id, project_id, old_status, new_status, changed_at)
+    SELECT id, project_id, NULL, status, timezone('UTC', now())
+    FROM new_rows;
+    RETURN NULL;
+END;
+$$
+""",
+    """
+CREATE FUNCTION task_status_history_on_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_status_history (task_id, project_id, old_status, new_status, changed_at)
+    SELECT n.id, n.project_id, o.status, n.status, timezone('UTC', now())
+    FROM old_rows AS o JOIN new_rows AS n ON n.id = o.id
+    WHERE o.status IS DISTINCT FROM n.status;
+    RETURN NULL;
+END;
+$$
+""",
+]
+
+HISTORY_TRIGGERS = [
+    """
+CREATE TRIGGER tasks_status_history_on_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_status_history_on_insert()
+""",
+    """
+CREATE TRIGGER tasks_status_history_on_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_status_history_on_update()
+""",
+]
+
+
+def upgrade() -> None:
+    op.create_table('task_status_history',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('old_status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', 'CLOSED', name='task_status_enum', create_type=False), nullable=True),
+    sa.Column('new_status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', 'CLOSED', name='task_status_enum', create_type=False), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_status_history_changed_at', 'task_status_history', ['changed_at'], unique=False, postgresql_using='brin')
+    op.create_index('ix_task_status_history_project_changed_at', 'task_status_history', ['project_id', 'changed_at'], unique=False)
+    for statement in HISTORY_FUNCTIONS + HISTORY_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_status_history_on_update ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_status_history_on_insert ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS task_status_history_on_update()")
+    op.execute("DROP FUNCTION IF EXISTS task_status_history_on_insert()")
+    op.drop_index('ix_task_status_history_project_changed_at', table_name='task_status_history')
+    op.drop_index('ix_task_status_history_changed_at', table_name='task_status_history')
+    op.drop_table('task_status_history')
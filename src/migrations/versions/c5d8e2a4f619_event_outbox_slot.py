@@ -0,0 +1,44 @@
+"""event outbox slot
+
+Слот relay хранится в строке outbox и вычисляется при записи события:
+relay выбирает строки слота по индексу (slot, id), а не вычисляет хэш ключа
+для каждой строки таблицы. Существующие строки получают слот по текущему
+OUTBOX_RELAY_LOCK_SLOTS.
+
+Revision ID: c5d8e2a4f619
+Revises: 9f3b6a1d5c82
+Create Date: 2026-10-19 21:05:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from settings import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2a4f619'
+down_revision: Union[str, None] = '9f3b6a1d5c82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'event_outbox', sa.Column('slot', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.execute(
+        sa.text(
+            "UPDATE event_outbox "
+            "SET slot = (hashtext(coalesce(partition_key, '')) & 2147483647) % :slots"
+        ).bindparams(slots=get_settings().outbox_relay_lock_slots)
+    )
+    op.alter_column('event_outbox', 'slot', server_default=None)
+    op.create_index('ix_event_outbox_slot_id', 'event_outbox', ['slot', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_outbox_slot_id', table_name='event_outbox')
+    op.drop_column('event_outbox', 'slot')
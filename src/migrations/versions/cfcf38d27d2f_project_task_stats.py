@@ -0,0 +1,130 @@
+"""project task stats
+
+Revision ID: cfcf38d27d2f
+Revises: 4ca3f600b1b5
+Create Date: 2026-10-19 11:02:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cfcf38d27d2f'
+down_revision: Union[str, None] = '4ca3f600b1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Триггеры уровня оператора с transition tables: пачечные вставки/удаления
+# меняют каждый счетчик одним UPDATE, а не построчно.
+# Строки счетчиков обновляются в порядке (project_id, status), чтобы
+# конкурирующие транзакции не ловили взаимоблокировки.
+STATS_FUNCTIONS = [
+    """
+CREATE FUNCTION project_task_stats_on_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO project_task_stats (project_id, status, task_count)
+    SELECT project_id, status, count(*)
+    FROM new_rows
+    GROUP BY project_id, status
+    ORDER BY project_id, status
+    ON CONFLICT (project_id, status)
+    DO UPDATE SET task_count = project_task_stats.task_count + EXCLUDED.task_count;
+    RETURN NULL;
+END;
+$$
+""",
+    """
+CREATE FUNCTION project_task_stats_on_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE project_task_stats AS s
+    SET task_count = s.task_count - d.task_count
+    FROM (
+        SELECT project_id, status, count(*) AS task_count
+        FROM old_rows
+        GROUP BY project_id, status
+        ORDER BY project_id, status
+    ) AS d
+    WHERE s.project_id = d.project_id AND s.status = d.status;
+    RETURN NULL;
+END;
+$$
+""",
+    """
+CREATE FUNCTION project_task_stats_on_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO project_task_stats (project_id, status, task_count)
+    SELECT project_id, status, sum(delta)
+    FROM (
+        SELECT o.project_id, o.status, -1 AS delta
+        FROM old_rows AS o JOIN new_rows AS n ON n.id = o.id
+        WHERE (o.project_id, o.status) IS DISTINCT FROM (n.project_id, n.status)
+        UNION ALL
+        SELECT n.project_id, n.status, 1 AS delta
+        FROM old_rows AS o JOIN new_rows AS n ON n.id = o.id
+        WHERE (o.project_id, o.status) IS DISTINCT FROM (n.project_id, n.status)
+    ) AS changes
+    GROUP BY project_id, status
+    ORDER BY project_id, status
+    ON CONFLICT (project_id, status)
+    DO UPDATE SET task_count = project_task_stats.task_count + EXCLUDED.task_count;
+    RETURN NULL;
+END;
+$$
+""",
+]
+
+STATS_TRIGGERS = [
+    """
+CREATE TRIGGER tasks_stats_on_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_insert()
+""",
+    """
+CREATE TRIGGER tasks_stats_on_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_delete()
+""",
+    """
+CREATE TRIGGER tasks_stats_on_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_on_update()
+""",
+]
+
+
+def upgrade() -> None:
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', 'CLOSED', name='task_status_enum', create_type=False), nullable=False),
+    sa.Column('task_count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'status')
+    )
+    # Блокируем запись в tasks на время заполнения, чтобы счетчики не разошлись с данными
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute(
+        """
+        INSERT INTO project_task_stats (project_id, status, task_count)
+        SELECT project_id, status, count(*) FROM tasks GROUP BY project_id, status
+        """
+    )
+    for statement in STATS_FUNCTIONS + STATS_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_update ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_delete ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_on_insert ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS project_task_stats_on_update()")
+    op.execute("DROP FUNCTION IF EXISTS project_task_stats_on_delete()")
+    op.execute("DROP FUNCTION IF EXISTS project_task_stats_on_insert()")
+    op.drop_table('project_task_stats')
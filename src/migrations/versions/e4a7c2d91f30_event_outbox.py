@@ -0,0 +1,37 @@
+"""event outbox
+
+События пишутся в event_outbox в транзакции изменения и публикуются
+relay-воркером. Таблица короткоживущая: строки удаляются после публикации,
+поэтому индекс нужен только первичный — relay читает их по id.
+
+Revision ID: e4a7c2d91f30
+Revises: b82f4d6e1c57
+Create Date: 2026-10-19 19:02:47.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d91f30'
+down_revision: Union[str, None] = 'b82f4d6e1c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_outbox',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('topic', sa.String(length=255), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_outbox')
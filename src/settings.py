@@ -1,6 +1,6 @@
 import os
 import sys
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import Field, PostgresDsn
 from pydantic_settings import BaseSettings
@@ -22,7 +22,96 @@ class Settings(BaseSettings):
     project_version: str = Field(os.environ.get("PROJECT_VERSION"))
     is_debug_mode: bool = Field(os.environ.get("DEBUG_MODE"))
 
+    # Размер кэша подготовленных выражений asyncpg на соединение
+    postgres_prepared_statement_cache_size: int = Field(
+        int(os.environ.get("POSTGRES_PREPARED_STATEMENT_CACHE_SIZE", 500))
+    )
+    # Размер кэша скомпилированных SQLAlchemy-выражений на движок
+    sqlalchemy_query_cache_size: int = Field(
+        int(os.environ.get("SQLALCHEMY_QUERY_CACHE_SIZE", 1200))
+    )
+
+    # kafka или memory: очереди в памяти процесса вместо брокера (локальный режим без Kafka)
+    event_publisher_backend: str = Field(os.environ.get("EVENT_PUBLISHER_BACKEND", "kafka"))
+    # Очередь подписчика издателя в памяти; при заполнении публикация ждет или событие отбрасывается
+    in_memory_event_queue_size: int = Field(
+        int(os.environ.get("IN_MEMORY_EVENT_QUEUE_SIZE", 10000))
+    )
+    in_memory_event_queue_block: bool = Field(
+        os.environ.get("IN_MEMORY_EVENT_QUEUE_BLOCK", "true").lower() in ("1", "true")
+    )
+
     kafka_servers: str = Field(os.environ.get("KAFKA_SERVERS"))
+    # Публикация событий пачками без ожидания брокера; подтверждения отслеживаются в фоне
+    kafka_publish_wait_for_delivery: bool = Field(
+        os.environ.get("KAFKA_PUBLISH_WAIT_FOR_DELIVERY", "false").lower() in ("1", "true")
+    )
+    kafka_linger_ms: int = Field(int(os.environ.get("KAFKA_LINGER_MS", 5)))
+    kafka_max_batch_size: int = Field(int(os.environ.get("KAFKA_MAX_BATCH_SIZE", 65536)))
+    # gzip, snappy, lz4, zstd; пустое значение — без сжатия
+    kafka_compression_type: Optional[str] = Field(
+        os.environ.get("KAFKA_COMPRESSION_TYPE", "lz4") or None
+    )
+    kafka_acks: str = Field(os.environ.get("KAFKA_ACKS", "all"))
+    kafka_flush_timeout_seconds: int = Field(
+        int(os.environ.get("KAFKA_FLUSH_TIMEOUT_SECONDS", 10))
+    )
+    # Ключ партиции событий — поле события (по умолчанию project_id: порядок внутри
+    # проекта сохраняется); переопределения: "TaskDeletedEvent=task_id,ProjectCreatedEvent=none"
+    event_partition_key_field: str = Field(
+        os.environ.get("EVENT_PARTITION_KEY_FIELD", "project_id")
+    )
+    event_partition_key_overrides: str = Field(
+        os.environ.get("EVENT_PARTITION_KEY_OVERRIDES", "")
+    )
+    # project_events и task_events вместо общего task_events
+    event_topic_per_aggregate: bool = Field(
+        os.environ.get("EVENT_TOPIC_PER_AGGREGATE", "false").lower() in ("1", "true")
+    )
+    # Кодировка событий в брокере: json или msgpack (компактная, по схемам из event_schema_dir)
+    event_encoding: str = Field(os.environ.get("EVENT_ENCODING", "json"))
+    # Каталог схем событий; по умолчанию src/event_schemas
+    event_schema_dir: str = Field(os.environ.get("EVENT_SCHEMA_DIR", ""))
+    # Потребители событий: сообщений за один опрос и пачек в очереди партиции до ее паузы
+    event_consumer_max_batch_size: int = Field(
+        int(os.environ.get("EVENT_CONSUMER_MAX_BATCH_SIZE", 500))
+    )
+    event_consumer_max_pending_batches: int = Field(
+        int(os.environ.get("EVENT_CONSUMER_MAX_PENDING_BATCHES", 4))
+    )
+    # Спул на диске для событий, которые брокер не принял при публикации без outbox
+    event_spool_enabled: bool = Field(
+        os.environ.get("EVENT_SPOOL_ENABLED", "false").lower() in ("1", "true")
+    )
+    event_spool_dir: str = Field(os.environ.get("EVENT_SPOOL_DIR", "event_spool"))
+    event_spool_segment_max_mb: int = Field(int(os.environ.get("EVENT_SPOOL_SEGMENT_MAX_MB", 16)))
+    event_spool_max_mb: int = Field(int(os.environ.get("EVENT_SPOOL_MAX_MB", 1024)))
+    event_spool_fsync_interval_ms: int = Field(
+        int(os.environ.get("EVENT_SPOOL_FSYNC_INTERVAL_MS", 5))
+    )
+    event_spool_drain_batch_size: int = Field(
+        int(os.environ.get("EVENT_SPOOL_DRAIN_BATCH_SIZE", 500))
+    )
+    # Попыток отправить событие, которое брокер отвергает, до переноса в dead letter
+    event_spool_max_attempts: int = Field(int(os.environ.get("EVENT_SPOOL_MAX_ATTEMPTS", 5)))
+    event_spool_retry_seconds: int = Field(int(os.environ.get("EVENT_SPOOL_RETRY_SECONDS", 5)))
+    # События пишутся в event_outbox в транзакции изменения и публикуются relay-воркером
+    event_outbox_enabled: bool = Field(
+        os.environ.get("EVENT_OUTBOX_ENABLED", "true").lower() in ("1", "true")
+    )
+    outbox_relay_batch_size: int = Field(int(os.environ.get("OUTBOX_RELAY_BATCH_SIZE", 500)))
+    outbox_relay_poll_interval_ms: int = Field(
+        int(os.environ.get("OUTBOX_RELAY_POLL_INTERVAL_MS", 500))
+    )
+    outbox_relay_retry_seconds: int = Field(
+        int(os.environ.get("OUTBOX_RELAY_RETRY_SECONDS", 5))
+    )
+    # Ключи партиций делятся на слоты; слот разбирает один relay за раз.
+    # Значение должно совпадать у всех экземпляров сервиса; строки outbox,
+    # записанные при другом значении, relay переносит в новые слоты при старте
+    outbox_relay_lock_slots: int = Field(
+        int(os.environ.get("OUTBOX_RELAY_LOCK_SLOTS", 16))
+    )
 
     algorithm: str = Field(os.environ.get("ALGORITHM"))
     secret_key: str = Field(os.environ.get("SECRET_KEY"))
@@ -31,11 +120,86 @@ class Settings(BaseSettings):
     )
     refresh_token_expire_days: int = Field(int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", 30)))
 
+    project_purge_batch_size: int = Field(
+        int(os.environ.get("PROJECT_PURGE_BATCH_SIZE", 1000))
+    )
+    project_purge_batch_pause_ms: int = Field(
+        int(os.environ.get("PROJECT_PURGE_BATCH_PAUSE_MS", 50))
+    )
+    # Неудавшаяся или занятая другим экземпляром вычистка повторяется с растущей паузой
+    project_purge_retry_seconds: int = Field(
+        int(os.environ.get("PROJECT_PURGE_RETRY_SECONDS", 5))
+    )
+    project_purge_retry_max_seconds: int = Field(
+        int(os.environ.get("PROJECT_PURGE_RETRY_MAX_SECONDS", 300))
+    )
+
+    # Закрытые задачи старше task_archive_after_days переносятся в tasks_archive
+    task_archive_after_days: int = Field(int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", 30)))
+    task_archive_batch_size: int = Field(int(os.environ.get("TASK_ARCHIVE_BATCH_SIZE", 500)))
+    task_archive_batch_pause_ms: int = Field(
+        int(os.environ.get("TASK_ARCHIVE_BATCH_PAUSE_MS", 50))
+    )
+    task_archive_interval_seconds: int = Field(
+        int(os.environ.get("TASK_ARCHIVE_INTERVAL_SECONDS", 600))
+    )
+
+    # Аналитика проектов считается в отдельном пуле потоков и кэшируется до события по проекту
+    analytics_workers: int = Field(int(os.environ.get("ANALYTICS_WORKERS", 4)))
+    analytics_cache_max_projects: int = Field(
+        int(os.environ.get("ANALYTICS_CACHE_MAX_PROJECTS", 1024))
+    )
+    analytics_cache_ttl_seconds: int = Field(
+        int(os.environ.get("ANALYTICS_CACHE_TTL_SECONDS", 300))
+    )
+
+    # Строк в одной пачке потоковой выгрузки задач
+    task_export_chunk_size: int = Field(int(os.environ.get("TASK_EXPORT_CHUNK_SIZE", 10000)))
+
+    # Импорт задач: строк в пачке COPY, лимит строк файла, ошибок в отчете, событий за раз
+    task_import_batch_size: int = Field(int(os.environ.get("TASK_IMPORT_BATCH_SIZE", 5000)))
+    task_import_max_rows: int = Field(int(os.environ.get("TASK_IMPORT_MAX_ROWS", 1000000)))
+    task_import_max_reported_errors: int = Field(
+        int(os.environ.get("TASK_IMPORT_MAX_REPORTED_ERRORS", 1000))
+    )
+    task_import_event_batch_size: int = Field(
+        int(os.environ.get("TASK_IMPORT_EVENT_BATCH_SIZE", 500))
+    )
+
+    # Кэш сущностей: локальный LRU в каждом процессе и общий уровень в Redis, если задан REDIS_URL
+    cache_local_max_entries: int = Field(int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", 10000)))
+    cache_local_ttl_seconds: int = Field(int(os.environ.get("CACHE_LOCAL_TTL_SECONDS", 30)))
+    redis_url: Optional[str] = Field(os.environ.get("REDIS_URL"))
+    cache_redis_ttl_seconds: int = Field(int(os.environ.get("CACHE_REDIS_TTL_SECONDS", 300)))
+
+    # Кэш готовых ответов списка задач по версии проекта
+    task_list_cache_max_entries: int = Field(
+        int(os.environ.get("TASK_LIST_CACHE_MAX_ENTRIES", 5000))
+    )
+    task_list_cache_ttl_seconds: int = Field(
+        int(os.environ.get("TASK_LIST_CACHE_TTL_SECONDS", 60))
+    )
+    task_list_cache_max_projects: int = Field(
+        int(os.environ.get("TASK_LIST_CACHE_MAX_PROJECTS", 100000))
+    )
+
+    # Пакетная загрузка сущностей по ID (= ANY(:ids)) и мульти-GET задач
+    batch_loader_max_batch_size: int = Field(
+        int(os.environ.get("BATCH_LOADER_MAX_BATCH_SIZE", 500))
+    )
+    task_multi_get_max_ids: int = Field(int(os.environ.get("TASK_MULTI_GET_MAX_IDS", 100)))
+
+    @property
+    def kafka_producer_acks(self) -> Union[int, str]:
+        """acks для продюсера: "all" или число 0/1."""
+        return self.kafka_acks if self.kafka_acks == "all" else int(self.kafka_acks)
+
     @property
     def database_url(self) -> Optional[PostgresDsn]:
         return (
             f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@"
             f"{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+            f"?prepared_statement_cache_size={self.postgres_prepared_statement_cache_size}"
         )
 
 
@@ -0,0 +1,94 @@
+"""
+Перенос существующих задач в секционированную таблицу tasks_partitioned.
+
+Запускается между ревизиями 08990d6987ad (теневая таблица и зеркалирующий
+триггер) и 6924cc0c08c2 (переключение), пока сервис продолжает работать:
+
+    cd src
+    alembic upgrade 08990d6987ad
+    python -m tools.backfill_partitioned_tasks --batch-size 5000
+    alembic upgrade head
+
+Строки копируются пачками по возрастанию id, каждая пачка — отдельная
+короткая транзакция. Позиция сохраняется в tasks_partition_backfill, поэтому
+прерванный перенос продолжается с места остановки. Исходные строки пачки
+блокируются FOR KEY SHARE: параллельное удаление дождется копирования и
+удалит строку и из теневой таблицы через триггер.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from infrastructure.postgres_db import database
+from logger import get_logger
+
+logger = get_logger()
+
+TASK_COLUMNS = (
+    "id, project_id, title, description, status, assignee_id, created_at, updated_at"
+)
+
+COPY_BATCH_SQL = text(
+    f"""
+    WITH state AS (
+        SELECT coalesce(last_id, '00000000-0000-0000-0000-000000000000') AS last_id
+        FROM tasks_partition_backfill
+        WHERE id = 1
+        FOR UPDATE
+    ),
+    batch AS (
+        SELECT {TASK_COLUMNS} FROM tasks
+        WHERE id > (SELECT last_id FROM state)
+        ORDER BY id
+        LIMIT :batch_size
+        FOR KEY SHARE
+    ),
+    inserted AS (
+        INSERT INTO tasks_partitioned ({TASK_COLUMNS})
+        SELECT {TASK_COLUMNS} FROM batch
+        ON CONFLICT (project_id, id) DO NOTHING
+    )
+    UPDATE tasks_partition_backfill
+    SET last_id = coalesce((SELECT id FROM batch ORDER BY id DESC LIMIT 1), last_id),
+        copied = copied + (SELECT count(*) FROM batch),
+        finished_at = CASE
+            WHEN (SELECT count(*) FROM batch) < :batch_size THEN now()::timestamp
+        END
+    WHERE id = 1
+    RETURNING (SELECT count(*) FROM batch) AS batch_rows, copied, finished_at
+    """
+)
+
+
+async def backfill(batch_size: int, pause_seconds: float) -> None:
+    started = time.perf_counter()
+    async with database.session_factory() as session:
+        while True:
+            result = await session.execute(COPY_BATCH_SQL, {"batch_size": batch_size})
+            batch_rows, copied, finished_at = result.one()
+            await session.commit()
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Backfill: {copied} task(s) copied, {copied / max(elapsed, 1e-9):.0f} rows/s."
+            )
+            if finished_at is not None:
+                break
+            await asyncio.sleep(pause_seconds)
+    logger.info("Backfill finished; run `alembic upgrade head` to switch tables.")
+    await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--pause-ms", type=int, default=20, help="пауза между пачками, мс"
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.pause_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Импорт задач в проект из файла CSV или NDJSON.
+
+Делает то же, что POST /tasks/import, но без HTTP и без проверки прав —
+для переноса данных из других трекеров администратором:
+
+    cd src
+    python -m tools.import_tasks --project-id <uuid> tasks.csv
+    python -m tools.import_tasks --project-id <uuid> --format ndjson tasks.ndjson
+
+CSV должен содержать заголовок с колонкой title; необязательные колонки:
+id, description, status, assignee_id, created_at, updated_at. Файл читается
+фрагментами, строки загружаются через COPY пачками по --batch-size.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID
+
+from core.entites.core_entities import TaskImportFormat
+from core.services.task_import_service import TaskImportService
+from infrastructure.event_publisher_singleton import event_publisher
+from infrastructure.postgres_db import database
+from infrastructure.repositories.project_repository import ProjectRepository
+from infrastructure.repositories.task_bulk_loader import TaskBulkLoader
+from logger import get_logger
+from settings import get_settings
+
+config = get_settings()
+logger = get_logger()
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while True:
+            chunk = await asyncio.to_thread(file.read, READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def run(args: argparse.Namespace) -> None:
+    await event_publisher.start()
+    try:
+        async with database.session_factory() as session:
+            service = TaskImportService(
+                TaskBulkLoader(database),
+                ProjectRepository(session),
+                event_publisher,
+                batch_size=args.batch_size,
+                max_rows=args.max_rows,
+                max_reported_errors=args.max_errors,
+                event_batch_size=config.task_import_event_batch_size,
+            )
+            result = await service.import_tasks(
+                args.project_id, read_file(args.path), TaskImportFormat(args.format)
+            )
+        for error in result.errors:
+            logger.warning(f"line {error.line}: {error.message}")
+        logger.info(
+            f"Imported {result.imported} of {result.received} row(s): "
+            f"{result.duplicates} duplicate(s), {result.error_count} error(s), "
+            f"{result.events_failed} event(s) not published."
+        )
+    finally:
+        await event_publisher.stop()
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--project-id", type=UUID, required=True)
+    parser.add_argument(
+        "--format", choices=[f.value for f in TaskImportFormat], default=TaskImportFormat.CSV.value
+    )
+    parser.add_argument("--batch-size", type=int, default=config.task_import_batch_size)
+    parser.add_argument("--max-rows", type=int, default=10_000_000)
+    parser.add_argument("--max-errors", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()